@@ -0,0 +1,21 @@
+# @version 0.2.11
+"""
+@notice Minimal mock of the Synthetix `Exchanger` waiting period
+"""
+
+# account -> currency key -> timestamp the waiting period ends at
+waiting_period_end: public(HashMap[address, HashMap[bytes32, uint256]])
+
+
+@external
+def set_waiting_period(_account: address, _currency_key: bytes32, _duration: uint256):
+    self.waiting_period_end[_account][_currency_key] = block.timestamp + _duration
+
+
+@view
+@external
+def maxSecsLeftInWaitingPeriod(_account: address, _currency_key: bytes32) -> uint256:
+    end: uint256 = self.waiting_period_end[_account][_currency_key]
+    if end <= block.timestamp:
+        return 0
+    return end - block.timestamp
@@ -0,0 +1,67 @@
+# @version 0.2.11
+"""
+@notice Minimal mock of the Polygon `RootChain` checkpoint storage
+"""
+
+event NewHeaderBlock:
+    proposer: indexed(address)
+    headerBlockId: indexed(uint256)
+    reward: indexed(uint256)
+    start: uint256
+    end: uint256
+    root: bytes32
+
+struct HeaderBlock:
+    root: bytes32
+    start: uint256
+    end: uint256
+    createdAt: uint256
+    proposer: address
+
+CHECKPOINT_ID_INTERVAL: constant(uint256) = 10000
+
+header_blocks: HashMap[uint256, HeaderBlock]
+next_header_block: uint256
+
+
+@external
+def __init__():
+    self.next_header_block = CHECKPOINT_ID_INTERVAL
+
+
+@external
+def submit_checkpoint(_root: bytes32, _start: uint256, _end: uint256):
+    """
+    @notice Add a checkpoint covering child blocks `_start` to `_end`, inclusive
+    """
+    header_block_id: uint256 = self.next_header_block
+    self.header_blocks[header_block_id] = HeaderBlock({
+        root: _root, start: _start, end: _end, createdAt: block.timestamp, proposer: msg.sender
+    })
+    self.next_header_block = header_block_id + CHECKPOINT_ID_INTERVAL
+    log NewHeaderBlock(msg.sender, header_block_id, 0, _start, _end, _root)
+
+
+@view
+@external
+def currentHeaderBlock() -> uint256:
+    return self.next_header_block - CHECKPOINT_ID_INTERVAL
+
+
+@view
+@external
+def getLastChildBlock() -> uint256:
+    return self.header_blocks[self.next_header_block - CHECKPOINT_ID_INTERVAL].end
+
+
+@view
+@external
+def headerBlocks(_header_block_id: uint256) -> (bytes32, uint256, uint256, uint256, address):
+    header_block: HeaderBlock = self.header_blocks[_header_block_id]
+    return (
+        header_block.root,
+        header_block.start,
+        header_block.end,
+        header_block.createdAt,
+        header_block.proposer,
+    )
@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from brownie import web3
+from hexbytes import HexBytes
+from tqdm import tqdm
+from web3 import Web3
+
+from scripts.burners.rpc import BATCH_SIZE, MAX_WORKERS, batch_request, supports_batching, to_int
+from scripts.cache import load_bytes, save_bytes
+
+# headers are cached in fixed size files, each covering this many blocks
+CHUNK_SIZE = 10000
+
+# size of one cached header - timestamp (8 bytes), transactionsRoot and receiptsRoot
+RECORD_SIZE = 72
+
+Header = Dict[str, object]
+
+
+class HeaderCache:
+    """On-disk cache of the block header fields used to build block proofs.
+
+    Headers are stored as fixed size records in binary files of `CHUNK_SIZE`
+    blocks each, so a header is located directly from its block number. A
+    record with a zero timestamp has not been fetched yet.
+    """
+
+    def __init__(self, chain_id: int) -> None:
+        self.chain_id = chain_id
+        self._chunks: Dict[int, bytearray] = {}
+        self._dirty = set()
+
+    def _chunk(self, index: int) -> bytearray:
+        if index not in self._chunks:
+            data = load_bytes(f"headers-{self.chain_id}-{index}.bin")
+            self._chunks[index] = bytearray(data or bytes(CHUNK_SIZE * RECORD_SIZE))
+        return self._chunks[index]
+
+    def get(self, number: int) -> Header:
+        """Get the cached header for a block, or `None` if it is not cached."""
+        chunk = self._chunk(number // CHUNK_SIZE)
+        offset = number % CHUNK_SIZE * RECORD_SIZE
+        timestamp = int.from_bytes(chunk[offset : offset + 8], "big")
+        if timestamp == 0:
+            return None
+        return {
+            "number": number,
+            "timestamp": timestamp,
+            "transactionsRoot": HexBytes(chunk[offset + 8 : offset + 40]),
+            "receiptsRoot": HexBytes(chunk[offset + 40 : offset + 72]),
+        }
+
+    def set(self, header: Header) -> None:
+        number = header["number"]
+        chunk = self._chunk(number // CHUNK_SIZE)
+        offset = number % CHUNK_SIZE * RECORD_SIZE
+        chunk[offset : offset + RECORD_SIZE] = (
+            header["timestamp"].to_bytes(8, "big")
+            + HexBytes(header["transactionsRoot"])
+            + HexBytes(header["receiptsRoot"])
+        )
+        self._dirty.add(number // CHUNK_SIZE)
+
+    def save(self) -> None:
+        for index in sorted(self._dirty):
+            save_bytes(f"headers-{self.chain_id}-{index}.bin", bytes(self._chunks[index]))
+        self._dirty.clear()
+
+
+def _to_header(block: dict) -> Header:
+    return {
+        "number": to_int(block["number"]),
+        "timestamp": to_int(block["timestamp"]),
+        "transactionsRoot": HexBytes(block["transactionsRoot"]),
+        "receiptsRoot": HexBytes(block["receiptsRoot"]),
+    }
+
+
+def _fetch_batch(numbers: List[int], w3: Web3) -> List[Header]:
+    if not supports_batching(w3):
+        return [_to_header(w3.eth.get_block(i)) for i in numbers]
+    blocks = batch_request("eth_getBlockByNumber", [(hex(i), False) for i in numbers], w3)
+    return [_to_header(i) for i in blocks]
+
+
+def get_headers(start: int, end: int, w3: Web3 = web3, cache: HeaderCache = None) -> List[Header]:
+    """Get the headers of every block from `start` to `end`, inclusive.
+
+    Cached headers are read from disk. Missing headers are fetched in batches
+    of `BATCH_SIZE` blocks, with up to `MAX_WORKERS` batches in flight, and
+    added to the cache.
+
+    Args:
+        start: First block number
+        end: Last block number
+        w3: Connection to the chain to fetch from, defaults to the active network
+        cache: Header cache to use. If not given, the cache for the chain of `w3` is used.
+
+    Returns:
+        List of dicts with the number, timestamp, transactionsRoot and
+        receiptsRoot of each block
+    """
+    if cache is None:
+        cache = HeaderCache(w3.eth.chain_id)
+
+    headers = {i: cache.get(i) for i in range(start, end + 1)}
+    missing = [i for i, header in headers.items() if header is None]
+    if missing:
+        batches = [missing[i : i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+        progress = tqdm(total=len(missing), desc="Fetching blocks", unit="block")
+        with ThreadPoolExecutor(MAX_WORKERS) as executor:
+            for batch in executor.map(lambda k: _fetch_batch(k, w3), batches):
+                for header in batch:
+                    cache.set(header)
+                    headers[header["number"]] = header
+                progress.update(len(batch))
+        progress.close()
+        cache.save()
+
+    return [headers[i] for i in range(start, end + 1)]
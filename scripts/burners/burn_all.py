@@ -0,0 +1,106 @@
+"""Run the weekly fee burn on every chain at once.
+
+Each chain is burned in a separate process with its own network connection,
+so a slow chain (e.g. waiting on the Synthetix settlement period on mainnet)
+does not hold up the others. Nothing is shared between chains: registry
+snapshots, token decimals, prices and burner gas models are cached on disk
+per chain id, so each worker only reuses what earlier runs on its own chain
+have already fetched.
+
+Usage: brownie run burners/burn_all --network mainnet
+"""
+import importlib
+import multiprocessing
+import queue
+import time
+from typing import Dict, Tuple
+
+from brownie import accounts, network
+
+# {chain: (burn script, brownie network id)}
+CHAINS: Dict[str, Tuple[str, str]] = {
+    "mainnet": ("scripts.burners.claim_and_burn_fees", "mainnet"),
+    "polygon": ("scripts.burners.burn_polygon", "polygon-main"),
+    "fantom": ("scripts.burners.burn_fantom", "ftm-main"),
+}
+
+# seconds between checks that workers without a result are still alive
+POLL_INTERVAL = 5
+
+
+def _burn(chain_name, acct, results):
+    module, network_id = CHAINS[chain_name]
+    start = time.time()
+    try:
+        # the connection inherited from the parent process is dropped and
+        # replaced, this does not affect the parent or the other workers
+        if network.is_connected():
+            network.disconnect(kill_rpc=False)
+        network.connect(network_id)
+        result = importlib.import_module(module).main(acct)
+    except Exception as exc:
+        result = {"error": f"{type(exc).__name__}: {exc}"}
+    result["elapsed"] = time.time() - start
+    results.put((chain_name, result))
+
+
+def run_all(acct, chains=tuple(CHAINS)) -> Dict[str, dict]:
+    """Burn fees on several chains concurrently.
+
+    Workers are forked rather than spawned so they inherit the loaded project
+    and the unlocked account, and only need to open their own connection.
+
+    Args:
+        acct: Account used to send every transaction
+        chains: Names of the chains to burn on, from `CHAINS`
+
+    Returns:
+        Dict of {chain: summary}. Each summary is the value returned by the
+        burn script, or contains an `error` if the script failed or the
+        worker died without reporting a result.
+    """
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = {i: context.Process(target=_burn, args=(i, acct, results)) for i in chains}
+    start = time.time()
+    for worker in workers.values():
+        worker.start()
+
+    summary = {}
+    while len(summary) < len(workers):
+        # checked before waiting, so any result a dead worker sent is already queued
+        dead = [i for i, worker in workers.items() if i not in summary and not worker.is_alive()]
+        try:
+            chain_name, result = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            for chain_name in dead:
+                summary[chain_name] = {
+                    "error": f"Worker exited with code {workers[chain_name].exitcode}",
+                    "elapsed": time.time() - start,
+                }
+            continue
+        summary[chain_name] = result
+    for worker in workers.values():
+        worker.join()
+
+    return {i: summary[i] for i in chains}
+
+
+def main(chains=tuple(CHAINS)):
+    acct = accounts.load("curve-deploy")
+
+    start = time.time()
+    summary = run_all(acct, chains)
+
+    print(f"\n{'Chain':<10}{'Action':<11}{'Amount':>16}  {'Time (s)':>9}  Tx")
+    for chain_name, result in summary.items():
+        if "error" in result:
+            print(f"{chain_name:<10}{'failed':<11}{'':>16}  {result['elapsed']:>9.1f}  ", end="")
+            print(result["error"])
+            continue
+        amount = f"{result['amount']:,.2f} {result['token']}"
+        print(
+            f"{chain_name:<10}{result['action']:<11}{amount:>16}  {result['elapsed']:>9.1f}  "
+            f"{result.get('txid', '')}"
+        )
+    print(f"\nTotal time: {time.time() - start:.1f}s")
@@ -1,31 +1,26 @@
-import sys
-
 from brownie import ZERO_ADDRESS, Contract, PoolProxySidechain, accounts
 
+from scripts.burners.planner import GasModel, execute_plan, get_burners, plan_batches
+from scripts.burners.registry import sync_registry
+from scripts.burners.valuation import get_balances
 
-def _get_pool_list():
-    sys.stdout.write("Getting list of pools and coins from registry...")
-    sys.stdout.flush()
+# maximum expected gas for a single `burn_many` call
+BURN_GAS_LIMIT = 4000000
 
-    provider = Contract("0x0000000022D53366457F9d5E68Ec105046FC4383")
-    registry = Contract(provider.get_registry())
 
-    pool_count = registry.pool_count()
-    pool_list = []
+def _get_pool_list():
+    pool_list = sync_registry()["pools"]
+
     coin_list = set()
-    for i in range(pool_count):
-        sys.stdout.write(f"\rGetting list of pools and coins from registry ({i+1}/{pool_count})...")
-        sys.stdout.flush()
-        swap = Contract(registry.pool_list(i))
-        pool_list.append(swap)
-        coin_list.update([i for i in registry.get_coins(swap) if i != ZERO_ADDRESS])
+    for coins in pool_list.values():
+        coin_list.update(coins)
 
-    print()
-    return pool_list, coin_list
+    return list(pool_list), coin_list
 
 
-def main():
-    acct = accounts.load("curve-deploy")
+def main(acct=None):
+    if acct is None:
+        acct = accounts.load("curve-deploy")
 
     proxy = PoolProxySidechain.at("0xd6930b7f661257DA36F93160149b031735237594")
     usdc = Contract("0x2791bca1f2de4661ed88a30c99a7a9449aa84174")
@@ -43,16 +38,17 @@ def main():
     coin_list.add("0xdAD97F7713Ae9437fa9249920eC8507e5FbB23d3")  # tricrypto3
     coin_list = list(coin_list)
 
-    to_burn = []
-    while coin_list:
-        coin = Contract(coin_list.pop())
-        if coin.balanceOf(proxy) == 0:
-            continue
-        to_burn.append(coin)
-        to_burn_padded = to_burn + [ZERO_ADDRESS] * (20 - len(to_burn))
-        if not coin_list or proxy.burn_many.estimate_gas(to_burn_padded, {"from": acct}) >= 4000000:
-            proxy.burn_many(to_burn_padded, {"from": acct, "gas_price": "30 gwei"})
-            to_burn.clear()
+    balances = get_balances(proxy, coin_list)
+    to_burn = [coin for coin in coin_list if balances[coin] > 0]
+    burners = get_burners(proxy, to_burn)
+
+    model = GasModel()
+    if not model.costs:
+        model.seed(proxy)
+    batches = plan_batches(to_burn, burners, model, BURN_GAS_LIMIT)
+    execute_plan(
+        proxy, batches, burners, model, BURN_GAS_LIMIT, {"from": acct, "gas_price": "30 gwei"}
+    )
 
     amount = usdc.balanceOf(proxy)
     tx = proxy.bridge(usdc, {"from": acct, "gas_price": "30 gwei"})
@@ -61,3 +57,5 @@ def main():
         "\nUse `brownie run burners/exit_polygon --network mainnet` to claim on ETH"
         " once the checkpoint is added."
     )
+
+    return {"action": "bridged", "amount": amount / 1e6, "token": "USDC", "txid": tx.txid}
@@ -0,0 +1,126 @@
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+from brownie import Contract, chain
+
+from scripts.burners.multicall import batch_call
+from scripts.cache import load_json, save_json
+
+# header block ids on the Polygon `RootChain` are multiples of this value
+CHECKPOINT_ID_INTERVAL = 10000
+
+Checkpoint = Tuple[int, int, int]
+
+
+class CheckpointIndex:
+    """Local index of the Polygon child block range covered by each checkpoint.
+
+    Checkpoints are immutable once submitted, so the index is persisted to
+    disk and only extended with checkpoints submitted since the last sync.
+    Finding the checkpoint that includes a block is then a local bisection.
+
+    Args:
+        root_chain: Polygon `RootChain` contract
+    """
+
+    def __init__(self, root_chain: Contract) -> None:
+        self.root_chain = root_chain
+        self.cache_name = f"checkpoints-{chain.id}-{root_chain.address}.json"
+        data = load_json(self.cache_name, {"starts": [], "ends": []})
+        # the checkpoint at position `i` has the header block id `(i + 1) * CHECKPOINT_ID_INTERVAL`
+        self.starts: List[int] = data["starts"]
+        self.ends: List[int] = data["ends"]
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    @property
+    def last_block(self) -> int:
+        """Get the last child block covered by an indexed checkpoint."""
+        return self.ends[-1] if self.ends else -1
+
+    def _fetch(self, header_ids: List[int]) -> List[Tuple[int, int]]:
+        calls = [(self.root_chain.headerBlocks, (i,)) for i in header_ids]
+        # `headerBlocks` returns (root, start, end, createdAt, proposer)
+        return [(i[1], i[2]) for i in batch_call(calls)]
+
+    def sync(self) -> int:
+        """Add every checkpoint submitted since the last sync.
+
+        Returns:
+            Number of new checkpoints
+        """
+        latest = self.root_chain.currentHeaderBlock() // CHECKPOINT_ID_INTERVAL
+        header_ids = [i * CHECKPOINT_ID_INTERVAL for i in range(len(self) + 1, latest + 1)]
+        if not header_ids:
+            return 0
+
+        for start, end in self._fetch(header_ids):
+            self.starts.append(start)
+            self.ends.append(end)
+        save_json(self.cache_name, {"starts": self.starts, "ends": self.ends})
+        return len(header_ids)
+
+    def find(self, child_block_number: int) -> Checkpoint:
+        """Find the checkpoint that includes a child block.
+
+        The index is synced first if the block is more recent than every
+        indexed checkpoint.
+
+        Returns:
+            `(start, end, header_block_id)` of the checkpoint, or `None` if the
+            block has not been checkpointed yet
+        """
+        if child_block_number > self.last_block:
+            self.sync()
+
+        idx = bisect_left(self.ends, child_block_number)
+        if idx == len(self) or self.starts[idx] > child_block_number:
+            return None
+        return self.starts[idx], self.ends[idx], (idx + 1) * CHECKPOINT_ID_INTERVAL
+
+
+class CheckpointWatcher:
+    """Wait for pending Polygon burns to be checkpointed.
+
+    The child block of each burn is given up front, so each poll is a single
+    `getLastChildBlock` read on the root chain, regardless of how many burns
+    are pending.
+
+    Args:
+        root_chain: Polygon `RootChain` contract
+        pending: Dict of {burn tx id: child block number}
+        on_checkpointed: Called with the list of burn tx ids each time one
+            or more burns are checkpointed
+    """
+
+    def __init__(
+        self,
+        root_chain: Contract,
+        pending: Dict[str, int],
+        on_checkpointed: Callable[[List[str]], None],
+    ) -> None:
+        self.root_chain = root_chain
+        self.pending = dict(pending)
+        self.on_checkpointed = on_checkpointed
+
+    def poll(self) -> List[str]:
+        """Check the root chain once, firing `on_checkpointed` for any newly covered burns.
+
+        Returns:
+            Burn tx ids that were checkpointed since the last poll
+        """
+        last_child_block = self.root_chain.getLastChildBlock()
+        ready = [k for k, v in self.pending.items() if v <= last_child_block]
+        for burn_tx_id in ready:
+            del self.pending[burn_tx_id]
+        if ready:
+            self.on_checkpointed(ready)
+        return ready
+
+    def run(self) -> None:
+        """Poll on every new block until no burns are pending."""
+        for _ in chain.new_blocks(1):
+            self.poll()
+            if not self.pending:
+                return
@@ -1,11 +1,16 @@
 import sys
-import time
 import warnings
 
-import requests
-from brownie import ETH_ADDRESS, ZERO_ADDRESS, Contract, accounts
+from brownie import ZERO_ADDRESS, Contract, accounts
 from brownie.network.gas.strategies import GasNowScalingStrategy
 
+from scripts.burners.pipeline import Pipeline
+from scripts.burners.planner import GasModel, execute_plan, get_burners, plan_batches
+from scripts.burners.prices import CoinGeckoProvider, OnChainProvider, PriceCache, StubProvider
+from scripts.burners.registry import sync_registry
+from scripts.burners.settlement import get_exchanger, wait_for_settlement
+from scripts.burners.valuation import get_admin_balances, get_balances
+
 warnings.filterwarnings("ignore")
 
 # This script is used to claim fees from all pool contracts
@@ -89,89 +94,97 @@ SYNTH_BURNERS = [
     "0x3a16b6001201577CC67bDD8aAE5A105bbB035882",  # EuroBurner
 ]
 
+UNDERLYING_BURNER = "0x874210cF3dC563B98c137927e7C951491A2e9AF3"
+
+POOL_PROXY = "0xeCb456EA5365865EbAb8a2661B0c503410e9B347"
+FEE_DISTRIBUTOR = "0xA464e6DCda8AC41e03616F95f4BC98a13b8922Dc"
+LP_TRIPOOL = "0x6c3F90f043a72FA612cbac8115EE7e52BDe6E490"
+
+# maximum expected gas for a single `burn_many` call
+BURN_GAS_LIMIT = 2000000
+
+# source of USD prices used to value pending fees: "coingecko" (with an
+# on-chain fallback for coins CoinGecko cannot price), "onchain" or "stub"
+PRICE_SOURCE = "coingecko"
+
+# maximum seconds to wait on the first fetch of coins without a cached price
+PRICE_TIMEOUT = 60
 
-_rate_cache = {}
+_price_cache = None
 gas_strategy = GasNowScalingStrategy(initial_speed="slow", max_speed="fast")
 
 
 def _get_pool_list():
-    sys.stdout.write("Getting list of pools from registry...")
-    sys.stdout.flush()
+    pool_list = sync_registry()["pools"]
+
+    return {pool: [coin.lower() for coin in coins] for pool, coins in pool_list.items()}
 
-    provider = Contract("0x0000000022D53366457F9d5E68Ec105046FC4383")
-    registry = Contract(provider.get_registry())
 
-    pool_count = registry.pool_count()
-    pool_list = {}
-    for i in range(pool_count):
-        sys.stdout.write(f"\rGetting list of pools from registry ({i+1}/{pool_count})...")
-        sys.stdout.flush()
-        swap = Contract(registry.pool_list(i))
-        pool_list[swap] = [i.lower() for i in registry.get_coins(swap) if i != ZERO_ADDRESS]
+def _get_price_cache(pool_list):
+    global _price_cache
+    if _price_cache is None:
+        if PRICE_SOURCE == "stub":
+            providers = [StubProvider()]
+        elif PRICE_SOURCE == "onchain":
+            providers = [OnChainProvider(pool_list)]
+        else:
+            providers = [CoinGeckoProvider(), OnChainProvider(pool_list)]
+        _price_cache = PriceCache(providers)
+
+    return _price_cache
 
-    print()
-    return pool_list
+
+def _wait_for_prices(coin_list):
+    # claim decisions need real prices - stale prices are fine, no price at all is not
+    missing = _price_cache.missing(coin_list)
+    if not missing:
+        return
+    if not _price_cache.wait(PRICE_TIMEOUT):
+        raise TimeoutError(f"Timed out fetching the price of {len(missing)} coins")
+    missing = _price_cache.missing(coin_list)
+    if missing:
+        print(f"\nWARNING: No price for {', '.join(missing)}, using the pool average")
 
 
 def _fetch_rates(coin_list):
     # fetch the current USD rates for a list of coins
-    if not _rate_cache:
-        _rate_cache[ETH_ADDRESS.lower()] = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price",
-            params={"ids": "ethereum", "vs_currencies": "usd"},
-        ).json()["ethereum"]["usd"]
-        response = requests.get(
-            "https://api.coingecko.com/api/v3/simple/token_price/ethereum",
-            params={"contract_addresses": ",".join(COINS), "vs_currencies": "usd"},
-        ).json()
-        for addr in response:
-            _rate_cache[addr.lower()] = response[addr]["usd"]
-
-    rates = {}
-    for coin in [i for i in coin_list if i in _rate_cache]:
-        rates[coin] = _rate_cache[coin]
+    rates = _price_cache.get_prices(coin_list)
 
     if len(rates) < len(coin_list):
         # for coins where a rate is unavailable, we assume it to be the average
         # rate of the other coins within the pool. when no rates are available,
         # everything is assumed to be worth $1
         avg_rate = sum(rates.values()) / len(rates.values()) if rates else 1
-        for coin in [i for i in coin_list if i not in _rate_cache]:
+        for coin in [i for i in coin_list if i not in rates]:
             rates[coin] = avg_rate
 
     return rates
 
 
-def _get_admin_balances(pool, coin_list):
-    admin_balances = []
-
-    rates = _fetch_rates(coin_list)
-
-    for i, coin in enumerate(coin_list):
-        if hasattr(pool, "admin_balances"):
-            balance = pool.admin_balances(i)
-        else:
-            balance = Contract(coin).balanceOf(pool) - pool.balances(i)
-
-        if coin != ETH_ADDRESS.lower():
-            decimals = Contract(coin).decimals()
-        else:
-            decimals = 18
-        balance = balance / 10 ** decimals * rates[coin]
-        admin_balances.append(balance)
+def _get_admin_balances(pool_list):
+    # get the USD value of the admin fees for every coin in every pool
+    sys.stdout.write("Querying pending fee amounts...")
+    sys.stdout.flush()
 
+    # prices are fetched in the background while balances are queried
+    pool_coins = [i for v in pool_list.values() for i in v]
+    _get_price_cache(pool_list).refresh(COINS + pool_coins)
+    admin_balances = get_admin_balances(pool_list)
+    _wait_for_prices(pool_coins)
+    for pool, coin_list in pool_list.items():
+        rates = _fetch_rates(coin_list)
+        admin_balances[pool] = [
+            balance * rates[coin] for balance, coin in zip(admin_balances[pool], coin_list)
+        ]
+
+    print(" done")
     return admin_balances
 
 
 def get_pending():
     pool_list = _get_pool_list()
-    pending = {}
-    for i, (pool, coin_list) in enumerate(pool_list.items(), start=1):
-        sys.stdout.write(f"\rQuerying pending fee amounts ({i}/{len(pool_list)})...")
-        sys.stdout.flush()
-        pending[pool] = sum(_get_admin_balances(pool, coin_list))
+    pending = {pool: sum(value) for pool, value in _get_admin_balances(pool_list).items()}
 
-    print()
     for addr, value in sorted(pending.items(), key=lambda k: k[1], reverse=True):
         print(f"{addr}: ${value:,.2f}")
 
@@ -180,67 +193,78 @@ def get_pending():
     return pending
 
 
+def withdraw_fees(proxy, pool_list, acct, claim_threshold, gas_price=gas_strategy):
+    # withdraw pool fees to pool proxy
+    admin_balances = _get_admin_balances(pool_list)
+    to_claim = [pool for pool in pool_list if sum(admin_balances[pool]) >= claim_threshold]
+    # withdrawals are independent of each other, so several are kept in flight.
+    # burning depends on the withdrawn fees, so wait for all of them to confirm.
+    pipeline = Pipeline(acct, gas_price)
+    for i in range(0, len(to_claim), 20):
+        pools = to_claim[i : i + 20]
+        pools += [ZERO_ADDRESS] * (20 - len(pools))
+        pipeline.submit(proxy.withdraw_many, pools)
+    pipeline.wait()
+
+
+def burn_fees(proxy, acct, gas_price=gas_strategy, gas_limit=BURN_GAS_LIMIT, model=None):
+    # call burners to convert fee tokens to 3CRV
+    # no point in burning if we have a zero balance
+    balances = get_balances(proxy, COINS)
+    to_burn = [coin for coin in COINS if balances[coin] > 0]
+    burners = get_burners(proxy, COINS)
+
+    # plan batches from the learned gas cost of each burner - some of the burners
+    # are gas guzzlers. the LP burner forwards into other burners so it must go
+    # first, and the underlying burner receives from the others so it goes last.
+    if model is None:
+        model = GasModel()
+    if not model.costs:
+        model.seed(proxy)
+    batches = plan_batches(
+        to_burn,
+        burners,
+        model,
+        gas_limit,
+        first=[burners[COINS[0]]],
+        last=[UNDERLYING_BURNER],
+    )
+    execute_plan(proxy, batches, burners, model, gas_limit, {"from": acct, "gas_price": gas_price})
+
+
+def execute_underlying(acct, gas_price=gas_strategy):
+    # call `execute` on the underlying burner
+    # deposits DAI/USDC/USDT into 3pool and transfers the 3CRV to the fee distributor
+    underlying_burner = Contract(UNDERLYING_BURNER)
+    underlying_burner.execute({"from": acct, "gas_price": gas_price})
+
+
+def forward_3crv(proxy, acct, gas_price=gas_strategy):
+    # finally, call to burn 3CRV - this also triggers a token checkpoint
+    proxy.burn(LP_TRIPOOL, {"from": acct, "gas_price": gas_price})
+
+
 def main(acct=CALLER, claim_threshold=CLAIM_THRESHOLD):
-    lp_tripool = Contract("0x6c3F90f043a72FA612cbac8115EE7e52BDe6E490")
-    distributor = Contract("0xA464e6DCda8AC41e03616F95f4BC98a13b8922Dc")
-    proxy = Contract("0xeCb456EA5365865EbAb8a2661B0c503410e9B347")
+    lp_tripool = Contract(LP_TRIPOOL)
+    distributor = Contract(FEE_DISTRIBUTOR)
+    proxy = Contract(POOL_PROXY)
 
     initial_balance = lp_tripool.balanceOf(distributor)
 
     # get list of active pools
     pool_list = _get_pool_list()
 
-    # withdraw pool fees to pool proxy
-    to_claim = []
-    for i in range(len(pool_list)):
+    withdraw_fees(proxy, pool_list, acct, claim_threshold)
+    burn_fees(proxy, acct)
 
-        # check claimable amount
-        sys.stdout.write(f"\rQuerying pending fee amounts ({i}/{len(pool_list)})...")
-        sys.stdout.flush()
-        claimable = _get_admin_balances(pool_list[i])
-        if sum(claimable) >= claim_threshold:
-            to_claim.append(pool_list[i])
+    # wait on synths to finalize. synth burners forward to the underlying burner,
+    # which performs the exchange to sUSD - so that is where the waiting period applies
+    wait_for_settlement(get_exchanger(), SYNTH_BURNERS + [UNDERLYING_BURNER])
 
-        if i == len(pool_list) - 1 or len(to_claim) == 20:
-            to_claim += [ZERO_ADDRESS] * (20 - len(to_claim))
-            proxy.withdraw_many(to_claim, {"from": acct, "gas_price": gas_strategy})
-            to_claim = []
-
-    # call burners to convert fee tokens to 3CRV
-    burn_start = 0
-    to_burn = []
-    for i in range(len(COINS)):
-        # no point in burning if we have a zero balance
-        if COINS[i] == ETH_ADDRESS:
-            if proxy.balance() > 0:
-                to_burn.append(COINS[i])
-        elif Contract(COINS[i]).balanceOf(proxy) > 0:
-            to_burn.append(COINS[i])
-
-        to_burn_padded = to_burn + [ZERO_ADDRESS] * (20 - len(to_burn))
-
-        # estimate gas to decide when to burn - some of the burners are gas guzzlers
-        if (
-            i == len(COINS) - 1
-            or proxy.burn_many.estimate_gas(to_burn_padded, {"from": acct}) > 2000000
-        ):
-            tx = proxy.burn_many(to_burn_padded, {"from": acct, "gas_price": gas_strategy})
-            to_burn = []
-            if not burn_start:
-                # record the timestamp of the first tx - need to
-                # know how long to wait to finalize synth swaps
-                burn_start = tx.timestamp
-
-    # wait on synths to finalize
-    time.sleep(max(burn_start + 180 - time.time(), 0))
-
-    # call `execute` on the underlying burner
-    # deposits DAI/USDC/USDT into 3pool and transfers the 3CRV to the fee distributor
-    underlying_burner = Contract("0x874210cF3dC563B98c137927e7C951491A2e9AF3")
-    underlying_burner.execute({"from": acct, "gas_price": gas_strategy})
-
-    # finally, call to burn 3CRV - this also triggers a token checkpoint
-    proxy.burn(lp_tripool, {"from": acct, "gas_price": gas_strategy})
+    execute_underlying(acct)
+    forward_3crv(proxy, acct)
 
     final = lp_tripool.balanceOf(distributor)
     print(f"Success! Total 3CRV fowarded to distributor: {(final-initial_balance)/1e18:.4f}")
+
+    return {"action": "forwarded", "amount": (final - initial_balance) / 1e18, "token": "3CRV"}
@@ -0,0 +1,54 @@
+import os
+
+from brownie import network, web3
+from brownie._config import CONFIG
+from web3 import HTTPProvider, Web3
+
+try:
+    from web3.middleware import geth_poa_middleware
+except ImportError:
+    # renamed in web3 v7
+    from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware
+
+# Polygon network paired with each Ethereum network, as named in `brownie networks list`
+POLYGON_NETWORKS = {
+    "mainnet": "polygon-main",
+    "mainnet-fork": "polygon-main",
+    "goerli": "polygon-testnet",
+}
+
+
+def connect(network_id: str) -> Web3:
+    """Open a web3 connection to a brownie network, without changing the active network.
+
+    Only HTTP hosts are supported, so that requests can be batched. The POA
+    middleware is always added, as Polygon block headers include extra data
+    that would otherwise fail validation.
+    """
+    host = os.path.expandvars(CONFIG.networks[network_id]["host"])
+    w3 = Web3(HTTPProvider(host))
+    w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+    return w3
+
+
+class ExitConnections:
+    """Ethereum and Polygon connections, kept open side by side.
+
+    Ethereum is brownie's active network, so contracts and accounts work as
+    usual. Polygon is only read from, through a separate web3 instance - so
+    moving between the chains never requires reconnecting.
+
+    Args:
+        polygon_network_id: Polygon network to connect to. Defaults to the
+            network paired with the active Ethereum network.
+    """
+
+    def __init__(self, polygon_network_id: str = None) -> None:
+        if polygon_network_id is None:
+            active = network.show_active()
+            if active not in POLYGON_NETWORKS:
+                raise ValueError(f"No Polygon network is paired with '{active}'")
+            polygon_network_id = POLYGON_NETWORKS[active]
+
+        self.ethereum = web3
+        self.polygon = connect(polygon_network_id)
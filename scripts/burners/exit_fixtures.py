@@ -0,0 +1,291 @@
+"""Offline verification of Polygon exit proofs.
+
+Exits are recorded once, with live Ethereum and Polygon connections, into a
+fixture containing every block header in the checkpoint and every receipt in
+the burn block. Proofs can then be rebuilt and checked from the fixture alone,
+so the proof builder can be tested and benchmarked without a node.
+
+Record the historical exits used by `exit_polygon.tester` under
+`tests/fixtures/exits`, where the unit tests check each one that is present:
+    brownie run burners/exit_fixtures record_tester_fixtures --network mainnet
+
+Benchmark proof construction:
+    brownie run burners/exit_fixtures benchmark
+"""
+import gzip
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+import rlp
+from eth_utils import to_hex
+from hexbytes import HexBytes
+
+from scripts.burners.block_headers import get_headers
+from scripts.burners.exit_polygon import (
+    TEST_TXS,
+    MerkleTree,
+    build_receipts_trie_from,
+    encode_payload,
+    fetch_block_inclusion_data,
+    fetch_burn_tx_data,
+    find_log_index,
+    get_connections,
+    get_root_chain,
+    get_root_chain_manager,
+    get_state_sync_tx_hash,
+    keccak256,
+    serialize_block,
+)
+from scripts.burners.receipts import get_block_receipts
+
+FIXTURE_PATH = Path(__file__).resolve().parents[2].joinpath("tests/fixtures/exits")
+
+# checkpoint sizes, in blocks, used when benchmarking proof construction
+BENCHMARK_SIZES = (256, 4096, 65536)
+
+# receipt fields used when serializing a receipt
+RECEIPT_FIELDS = ("transactionHash", "transactionIndex", "status", "root", "cumulativeGasUsed")
+
+
+def _receipt_to_json(receipt: dict) -> dict:
+    data = {k: receipt[k] for k in RECEIPT_FIELDS if k in receipt}
+    data["transactionHash"] = to_hex(HexBytes(data["transactionHash"]))
+    if "root" in data:
+        data["root"] = to_hex(HexBytes(data["root"]))
+    data["type"] = receipt.get("type", 0)
+    data["logsBloom"] = to_hex(HexBytes(receipt["logsBloom"]))
+    data["logs"] = [
+        {
+            "address": log["address"],
+            "topics": [to_hex(HexBytes(i)) for i in log["topics"]],
+            "data": to_hex(HexBytes(log["data"])),
+        }
+        for log in receipt["logs"]
+    ]
+    return data
+
+
+def get_fixture_path(burn_tx_id: str, path: Path = FIXTURE_PATH) -> Path:
+    """Get the path of the recorded fixture for a burn tx."""
+    return path.joinpath(f"{burn_tx_id}.json.gz")
+
+
+def record_exit_fixture(burn_tx_id: str, exit_tx_id: str = None, path: Path = FIXTURE_PATH) -> Path:
+    """Record everything required to rebuild the exit proof of a burn tx.
+
+    Args:
+        burn_tx_id: Burn tx hash on Polygon
+        exit_tx_id: Hash of the `RootChainManager.exit` call on Ethereum. If
+            given, the calldata it used is recorded so the rebuilt calldata
+            can be compared against it.
+        path: Directory to save the fixture in
+
+    Returns:
+        Path of the saved fixture
+    """
+    polygon = get_connections().polygon
+    _, burn_tx_receipt, block = fetch_burn_tx_data(polygon, burn_tx_id)
+    start, end, header_block_id = fetch_block_inclusion_data(block["number"])
+    receipts = get_block_receipts(block, [get_state_sync_tx_hash(block)], polygon)
+
+    fixture = {
+        "burn_tx_id": burn_tx_id,
+        "header_block_id": header_block_id,
+        "checkpoint_root": to_hex(HexBytes(get_root_chain().headerBlocks(header_block_id)[0])),
+        "start": start,
+        "headers": [
+            [
+                i["timestamp"],
+                to_hex(HexBytes(i["transactionsRoot"])),
+                to_hex(HexBytes(i["receiptsRoot"])),
+            ]
+            for i in get_headers(start, end, polygon)
+        ],
+        "block": {
+            "number": block["number"],
+            "hash": to_hex(HexBytes(block["hash"])),
+            "timestamp": block["timestamp"],
+            "transactionsRoot": to_hex(HexBytes(block["transactionsRoot"])),
+            "receiptsRoot": to_hex(HexBytes(block["receiptsRoot"])),
+        },
+        "burn_tx_index": burn_tx_receipt["transactionIndex"],
+        "receipts": [_receipt_to_json(i) for i in receipts],
+        "exit_calldata": None,
+    }
+    if exit_tx_id is not None:
+        exit_input = get_connections().ethereum.eth.get_transaction(exit_tx_id)["input"]
+        fixture["exit_calldata"] = to_hex(get_root_chain_manager().decode_input(exit_input)[1][0])
+
+    path.mkdir(parents=True, exist_ok=True)
+    fixture_path = get_fixture_path(burn_tx_id, path)
+    with gzip.open(fixture_path, "wt") as fp:
+        json.dump(fixture, fp)
+    return fixture_path
+
+
+def record_tester_fixtures() -> None:
+    """Record the historical exits checked by `exit_polygon.tester`."""
+    for burn_tx_id, exit_tx_id in TEST_TXS:
+        print(f"Recorded {record_exit_fixture(burn_tx_id, exit_tx_id)}")
+
+
+def load_exit_fixture(fixture_path: Path) -> dict:
+    with gzip.open(fixture_path, "rt") as fp:
+        return json.load(fp)
+
+
+def verify_exit_fixture(fixture: dict) -> bytes:
+    """Rebuild the exit calldata for a recorded burn, without any network access.
+
+    Raises:
+        AssertionError: if the rebuilt block tree or receipts trie do not match
+            the recorded roots, or the calldata differs from the recorded exit
+
+    Returns:
+        Exit calldata
+    """
+    start = fixture["start"]
+    headers = [
+        {
+            "number": start + i,
+            "timestamp": timestamp,
+            "transactionsRoot": HexBytes(transactions_root),
+            "receiptsRoot": HexBytes(receipts_root),
+        }
+        for i, (timestamp, transactions_root, receipts_root) in enumerate(fixture["headers"])
+    ]
+    merkle_tree = MerkleTree([serialize_block(i) for i in headers])
+    assert merkle_tree.root == HexBytes(fixture["checkpoint_root"]), "Block tree root is incorrect"
+
+    block = fixture["block"]
+    receipts_trie = build_receipts_trie_from(fixture["receipts"])
+    assert receipts_trie.root_hash == HexBytes(block["receiptsRoot"]), "Receipts trie is incorrect"
+
+    burn_tx_receipt = next(
+        i for i in fixture["receipts"] if i["transactionIndex"] == fixture["burn_tx_index"]
+    )
+    path = rlp.encode(fixture["burn_tx_index"])
+    calldata = encode_payload(
+        fixture["header_block_id"],
+        merkle_tree.get_proof(block["number"] - start),
+        block["number"],
+        block["timestamp"],
+        HexBytes(block["transactionsRoot"]),
+        HexBytes(block["receiptsRoot"]),
+        burn_tx_receipt,
+        receipts_trie.get_proof(path),
+        path,
+        find_log_index(burn_tx_receipt),
+    )
+    if fixture["exit_calldata"] is not None:
+        assert calldata == HexBytes(fixture["exit_calldata"]), "Calldata does not match the exit"
+
+    return calldata
+
+
+def _random_bytes(rng: random.Random, length: int) -> bytes:
+    return rng.getrandbits(8 * length).to_bytes(length, "big")
+
+
+def make_synthetic_fixture(block_count: int, tx_count: int = 20, seed: int = 0) -> dict:
+    """Generate a self-consistent fixture from random data.
+
+    The burn tx is placed part way through the checkpoint, within a block
+    that mixes legacy and typed (EIP-2718) receipts.
+    """
+    rng = random.Random(seed)
+    start = 1000
+    burn_block_number = start + block_count // 3
+    burn_tx_index = tx_count // 2
+
+    receipts = []
+    for i in range(tx_count):
+        topics = [_random_bytes(rng, 32)]
+        if i == burn_tx_index:
+            # ERC20 transfer to the zero address
+            topics = [
+                keccak256(b"Transfer(address,address,uint256)"),
+                _random_bytes(rng, 32),
+                HexBytes(0) * 32,
+            ]
+        receipts.append(
+            {
+                "transactionHash": to_hex(_random_bytes(rng, 32)),
+                "transactionIndex": i,
+                "status": 1,
+                "cumulativeGasUsed": 50000 * (i + 1),
+                "type": i % 3,
+                "logsBloom": to_hex(bytes(256)),
+                "logs": [
+                    {
+                        "address": to_hex(_random_bytes(rng, 20)),
+                        "topics": [to_hex(i) for i in topics],
+                        "data": to_hex(_random_bytes(rng, 32)),
+                    }
+                ],
+            }
+        )
+    receipts_root = build_receipts_trie_from(receipts).root_hash
+
+    headers = []
+    for number in range(start, start + block_count):
+        root = receipts_root if number == burn_block_number else _random_bytes(rng, 32)
+        headers.append([1600000000 + 2 * number, to_hex(_random_bytes(rng, 32)), to_hex(root)])
+
+    block = headers[burn_block_number - start]
+    serialized_blocks = [
+        serialize_block(
+            {
+                "number": start + i,
+                "timestamp": timestamp,
+                "transactionsRoot": HexBytes(transactions_root),
+                "receiptsRoot": HexBytes(root),
+            }
+        )
+        for i, (timestamp, transactions_root, root) in enumerate(headers)
+    ]
+
+    return {
+        "burn_tx_id": receipts[burn_tx_index]["transactionHash"],
+        "header_block_id": 10000 * (seed + 1),
+        "checkpoint_root": to_hex(MerkleTree(serialized_blocks).root),
+        "start": start,
+        "headers": headers,
+        "block": {
+            "number": burn_block_number,
+            "hash": to_hex(_random_bytes(rng, 32)),
+            "timestamp": block[0],
+            "transactionsRoot": block[1],
+            "receiptsRoot": block[2],
+        },
+        "burn_tx_index": burn_tx_index,
+        "receipts": receipts,
+        "exit_calldata": None,
+    }
+
+
+def measure_proof(fixture: dict) -> Dict[str, float]:
+    """Measure the time and peak memory used to rebuild the proof for a fixture."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    verify_exit_fixture(fixture)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"blocks": len(fixture["headers"]), "time": elapsed, "memory": peak}
+
+
+def benchmark(sizes: List[int] = BENCHMARK_SIZES) -> List[Dict[str, float]]:
+    results = []
+    print(f"{'Blocks':>8}{'Time (s)':>12}{'Peak (MiB)':>12}")
+    for size in sizes:
+        result = measure_proof(make_synthetic_fixture(size))
+        results.append(result)
+        print(f"{size:>8}{result['time']:>12.3f}{result['memory'] / 2 ** 20:>12.2f}")
+
+    return results
@@ -23,20 +23,26 @@ Steps for successful withdrawl:
 
 To test run: brownie run exit tester --network mainnet
 """
-import math
+import json
 from datetime import datetime
-from functools import wraps
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import rlp
 from brownie import Contract, RootForwarder, accounts, chain, network, web3
 from brownie.project import get_loaded_projects
 from eth_utils import keccak
 from hexbytes import HexBytes
-from tqdm import tqdm, trange
+from tqdm import tqdm
 from trie import HexaryTrie
+from web3 import Web3
 from web3.types import BlockData, TxReceipt
 
+from scripts.burners.block_headers import get_headers
+from scripts.burners.checkpoints import CheckpointIndex, CheckpointWatcher
+from scripts.burners.connections import ExitConnections
+from scripts.burners.pipeline import Pipeline
+from scripts.burners.receipts import get_block_receipts
+
 # Hard coded values for permanent proxy addresses
 ADDRS = {
     "mainnet": {
@@ -63,12 +69,49 @@ BURN_AMOUNT = 0
 # BURN TX HASH
 MATIC_BURN_TX_ID = ""
 
+# historical (burn tx, exit tx) pairs used to check the calldata builder
+TEST_TXS = [
+    (
+        "0x4486e398e0f2ca4d00bec85edbb9aff94e7085fa2b5ef18319989d9d8e37152f",
+        "0x6fe5d2638e7bdbf598c215c6d20b6bf2cad58479460091c0f2330506c14762bf",
+    ),
+    (
+        "0xbcaafea9bed5c31dc2472a015afca6463a5de14730a3a6ab4501475c0594cfc4",
+        "0x1afcfe324fcfa0fbf54182524e74fc57ff8ddff58367529af519adbaccc13f7a",
+    ),
+    (
+        "0x7d17b4cfbab16739bf00cead6ffec306f7420ec5c91de4ac1d485b7de9efaf49",
+        "0xfed6fc9558d45b0672fe9ff23d341d028d99f71a318feabf925f0d1b67eea503",
+    ),
+]
+
+# receipts tries, keyed by block hash
+_receipts_tries = {}
+
+_connections = None
+_checkpoint_index = None
+
 
 def keccak256(value):
     """Thin wrapper around keccak function."""
     return HexBytes(keccak(value))
 
 
+def get_root_chain() -> Contract:
+    """Get the Polygon `RootChain` contract on the active network."""
+    root_chain_proxy_addr = ADDRS[network.show_active()]["RootChainProxy"]
+    abi = get_loaded_projects()[0].interface.RootChain.abi
+    return Contract.from_abi("RootChain", root_chain_proxy_addr, abi)
+
+
+def get_connections() -> ExitConnections:
+    """Get the Ethereum and Polygon connections, opening them on the first call."""
+    global _connections
+    if _connections is None:
+        _connections = ExitConnections()
+    return _connections
+
+
 def burn_asset_on_matic(asset=MATIC_ERC20_ASSET_ADDR, amount=BURN_AMOUNT, sender=MSG_SENDER):
     """Burn an ERC20 asset on Matic Network"""
     abi = get_loaded_projects()[0].interface.ChildERC20.abi
@@ -79,56 +122,21 @@ def burn_asset_on_matic(asset=MATIC_ERC20_ASSET_ADDR, amount=BURN_AMOUNT, sender
     print(f"Visit https://explorer-mainnet.maticvigil.com/tx/{tx.txid} for confirmation")
 
 
-def hot_swap_network(environment_name):
-    """Decorator for hot swapping the network connection.
-
-    There is probably a nicer way to do this but I'm lazy and this works.
-    This basically hot swaps to the network we want and then back to the
-    original network, useful for helper functions.
-
-    Since we are swapping between Ethereum and Matic in this script
-    it's neccessary to terminate the RPC and reconnect since Matic
-    uses POA ... that sounds about right I really don't know but it works :)
-
-    Args:
-        environment_name: A valid environment name found in `brownie networks list`
-            e.g. 'ethereum', 'polygon'
+class MerkleTree:
+    """Binary keccak256 Merkle tree over 32 byte leaves.
+
+    Each level is stored as one contiguous `bytes` object of 32 byte nodes.
+    Leaves are implicitly padded with zero nodes up to the next power of two,
+    but the padded part of each level is never stored or hashed - any subtree
+    containing only padding has a constant hash, which is computed once per
+    level. A checkpoint of `n` blocks therefore costs `~2n` hashes and `~64n`
+    bytes, regardless of how far `n` is from a power of two.
     """
 
-    def inner(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            initial_network_id = network.show_active()
-            is_mainnet = "main" in initial_network_id
-
-            if environment_name == "ethereum":
-                swap_network_id = "mainnet" if is_mainnet else "goerli"
-            elif environment_name == "polygon":
-                swap_network_id = "polygon-main" if is_mainnet else "polygon-testnet"
-
-            if initial_network_id == swap_network_id:
-                return func(*args, **kwargs)
+    NODE_SIZE = 32
 
-            network.disconnect()
-            network.connect(swap_network_id)
-
-            result = func(*args, **kwargs)
-
-            network.disconnect()
-            network.connect(initial_network_id)
-
-            return result
-
-        return wrapper
-
-    return inner
-
-
-class MerkleTree:
-    """This is my poor but successful lvl 2 copy paste of a merkle tree."""
-
-    def __init__(self, leaves: bytes):
-        """Initialize and recursively build the Merkle tree.
+    def __init__(self, leaves: List[bytes]):
+        """Build the tree level by level.
 
         This is only used for building the block proof.
 
@@ -136,70 +144,90 @@ class MerkleTree:
             leaves: Serialized blocks
         """
         assert len(leaves) >= 1, "Atleast 1 leaf is needed"
-        tree_depth = math.ceil(math.log(len(leaves), 2))
-        assert tree_depth <= 20, "Depth must be 20 layers or less"
-
-        self.leaves = leaves + [HexBytes(0) * 32] * (2 ** tree_depth - len(leaves))
-        self.layers = [self.leaves]
-        self.create_hashes(self.leaves)
+        self.depth = (len(leaves) - 1).bit_length()
+        assert self.depth <= 20, "Depth must be 20 layers or less"
+
+        self.leaf_count = len(leaves)
+        self._leaf_index = None
+
+        # hash of a subtree containing only padding, for each level
+        self.zero_hashes = [bytes(self.NODE_SIZE)]
+        for _ in range(self.depth):
+            self.zero_hashes.append(keccak(self.zero_hashes[-1] * 2))
+
+        self.layers = [b"".join(leaves)]
+        assert len(self.layers[0]) == self.leaf_count * self.NODE_SIZE, "Leaves must be 32 bytes"
+        for level in range(self.depth):
+            self.layers.append(self._hash_level(self.layers[-1], level))
+
+    def _hash_level(self, nodes: bytes, level: int) -> bytes:
+        # an odd node is paired with the padding at this level
+        if len(nodes) // self.NODE_SIZE % 2:
+            nodes += self.zero_hashes[level]
+        view = memoryview(nodes)
+        pair = 2 * self.NODE_SIZE
+        return b"".join(keccak(view[i : i + pair]) for i in range(0, len(nodes), pair))
+
+    def _node(self, level: int, index: int) -> bytes:
+        nodes = self.layers[level]
+        offset = index * self.NODE_SIZE
+        if offset >= len(nodes):
+            return self.zero_hashes[level]
+        return nodes[offset : offset + self.NODE_SIZE]
 
     @property
     def root(self) -> bytes:
         """Get the tree root."""
-        return self.layers[-1][0]
-
-    def create_hashes(self, nodes: List[bytes]) -> None:
-        """Recursively build the layers of the tree."""
-        if len(nodes) == 1:
-            return
+        return HexBytes(self._node(self.depth, 0))
 
-        tree_level = []
-        for i in range(0, len(nodes), 2):
-            left, right = nodes[i : i + 2]
-            new_node = keccak256(left + right)
-            tree_level.append(new_node)
+    def index(self, leaf: bytes) -> int:
+        """Get the index of a leaf.
 
-        if len(nodes) % 2 == 1:
-            tree_level.append(nodes[-1])
-
-        self.layers.append(tree_level)
-        self.create_hashes(tree_level)
-
-    def get_proof(self, leaf: bytes) -> List[bytes]:
-        """Generate a proof for a leaf."""
-        index = self.leaves.index(leaf)
+        The lookup table is built on the first call, subsequent lookups are O(1).
+        """
+        if self._leaf_index is None:
+            leaves = self.layers[0]
+            self._leaf_index = {}
+            for i in range(self.leaf_count - 1, -1, -1):
+                # iterate in reverse so duplicate leaves resolve to the first index
+                self._leaf_index[leaves[i * self.NODE_SIZE : (i + 1) * self.NODE_SIZE]] = i
+        return self._leaf_index[bytes(leaf)]
+
+    def get_proof(self, index: int) -> List[bytes]:
+        """Generate a proof for the leaf at `index`.
+
+        Returns:
+            Sibling nodes from the leaf up to (but not including) the root
+        """
+        assert 0 <= index < self.leaf_count, "Leaf index out of range"
 
         proof = []
-        sibling_index = None
-        for i in trange(len(self.layers) - 1, desc="Building merkle proof"):
-            if index % 2 == 0:
-                sibling_index = index + 1
-            else:
-                sibling_index = index - 1
-            index = index // 2
-            sibling_node = self.layers[i][sibling_index]
-            proof.append(sibling_node)
+        for level in range(self.depth):
+            proof.append(HexBytes(self._node(level, index ^ 1)))
+            index //= 2
 
         return proof
 
 
-@hot_swap_network("polygon")
-def fetch_burn_tx_data(burn_tx_id: str = MATIC_BURN_TX_ID):
+def fetch_burn_tx_data(polygon: Web3, burn_tx_id: str = MATIC_BURN_TX_ID):
     """Fetch burn tx data."""
-    tx = web3.eth.get_transaction(burn_tx_id)
-    tx_receipt = web3.eth.get_transaction_receipt(burn_tx_id)
-    tx_block = chain[tx["blockNumber"]]
+    tx = polygon.eth.get_transaction(burn_tx_id)
+    tx_receipt = polygon.eth.get_transaction_receipt(burn_tx_id)
+    tx_block = polygon.eth.get_block(tx["blockNumber"])
 
     return tx, tx_receipt, tx_block
 
 
-@hot_swap_network("ethereum")
-def is_burn_checkpointed(burn_tx_id: str = MATIC_BURN_TX_ID, silent: bool = False) -> bool:
+def is_burn_checkpointed(
+    burn_tx_id: str = MATIC_BURN_TX_ID,
+    silent: bool = False,
+    connections: ExitConnections = None,
+) -> bool:
     """Check a burn tx has been checkpointed on Ethereum mainnet."""
-    _, _, burn_tx_block = fetch_burn_tx_data(burn_tx_id)
-    root_chain_proxy_addr = ADDRS[network.show_active()]["RootChainProxy"]
-    abi = get_loaded_projects()[0].interface.RootChain.abi
-    root_chain = Contract.from_abi("RootChain", root_chain_proxy_addr, abi)
+    if connections is None:
+        connections = get_connections()
+    _, _, burn_tx_block = fetch_burn_tx_data(connections.polygon, burn_tx_id)
+    root_chain = get_root_chain()
 
     is_checkpointed = root_chain.getLastChildBlock() >= burn_tx_block["number"]
     if not silent:
@@ -207,44 +235,24 @@ def is_burn_checkpointed(burn_tx_id: str = MATIC_BURN_TX_ID, silent: bool = Fals
     return is_checkpointed
 
 
-@hot_swap_network("ethereum")
 def fetch_block_inclusion_data(child_block_number: int) -> dict:
     """Fetch burn tx checkpoint block inclusion data.
 
+    Checkpoints are looked up in a local index, which is synced with the
+    root chain only when the block is newer than every indexed checkpoint.
+
     Args:
         child_block_number: The block number of the burn tx was included in on
             the matic network
     """
-    CHECKPOINT_ID_INTERVAL = 10000
-
-    root_chain_proxy_addr = ADDRS[network.show_active()]["RootChainProxy"]
-    abi = get_loaded_projects()[0].interface.RootChain.abi
-    root_chain = Contract.from_abi("RootChain", root_chain_proxy_addr, abi)
-
-    start = 1
-    end = root_chain.currentHeaderBlock() // CHECKPOINT_ID_INTERVAL
+    global _checkpoint_index
+    if _checkpoint_index is None:
+        _checkpoint_index = CheckpointIndex(get_root_chain())
 
-    header_block_number = None
-    while start <= end:
-        if start == end:
-            header_block_number = start
-
-        middle = (start + end) // 2
-        header_block = root_chain.headerBlocks(middle * CHECKPOINT_ID_INTERVAL)
-        header_start = header_block["start"]
-        header_end = header_block["end"]
-
-        if header_start <= child_block_number <= header_end:
-            header_block_number = middle
-            break
-        elif header_start > child_block_number:
-            # child block was checkpointed after
-            end = middle - 1
-        elif header_end < child_block_number:
-            # child block was checkpointed before
-            start = middle + 1
-
-    return header_start, header_end, header_block_number * CHECKPOINT_ID_INTERVAL
+    checkpoint = _checkpoint_index.find(child_block_number)
+    if checkpoint is None:
+        raise ValueError(f"Block {child_block_number} has not been checkpointed")
+    return checkpoint
 
 
 def prepare_receipt(receipt: TxReceipt) -> PreparedReceipt:
@@ -275,7 +283,8 @@ def prepare_receipt(receipt: TxReceipt) -> PreparedReceipt:
 def serialize_receipt(receipt: TxReceipt) -> bytes:
     """Serialize a receipt.
 
-    This also handles EIP-2718 typed transactions.
+    This also handles EIP-2718 typed transactions, which are serialized as
+    `type || rlp(receipt)` - the value stored in the receipts trie.
     """
     prepared_receipt = prepare_receipt(receipt)
     encoded_receipt = rlp.encode(prepared_receipt)
@@ -284,8 +293,7 @@ def serialize_receipt(receipt: TxReceipt) -> bytes:
     if receipt_type == HexBytes(0):
         return encoded_receipt
 
-    buffer = HexBytes(receipt_type) + encoded_receipt
-    return rlp.encode(buffer)
+    return receipt_type + encoded_receipt
 
 
 def serialize_block(block: dict) -> bytes:
@@ -297,48 +305,69 @@ def serialize_block(block: dict) -> bytes:
     return keccak256(block_number + timestamp + txs_root + receipts_root)
 
 
-@hot_swap_network("polygon")
-def build_block_proof(block_start: int, block_end: int, burn_tx_block_number: int) -> List[bytes]:
-    """Build a merkle proof for the burn tx block."""
-
-    checkpoint_blocks = (
-        chain[block_number]
-        for block_number in trange(
-            block_start, block_end + 1, desc="Serializing blocks", unit="block"
-        )
-    )
+def build_block_tree(polygon: Web3, block_start: int, block_end: int) -> MerkleTree:
+    """Build the merkle tree of the blocks in a checkpoint."""
+    checkpoint_blocks = get_headers(block_start, block_end, polygon)
     serialized_blocks = list(map(serialize_block, checkpoint_blocks))
 
-    burn_tx_serialized_block = serialized_blocks[burn_tx_block_number - block_start]
-    merkle_tree = MerkleTree(serialized_blocks)
+    return MerkleTree(serialized_blocks)
 
-    return merkle_tree.get_proof(burn_tx_serialized_block)
 
+def build_block_proof(
+    polygon: Web3, block_start: int, block_end: int, burn_tx_block_number: int
+) -> List[bytes]:
+    """Build a merkle proof for the burn tx block."""
+    merkle_tree = build_block_tree(polygon, block_start, block_end)
 
-@hot_swap_network("polygon")
-def build_receipt_proof(burn_tx_receipt: TxReceipt, burn_tx_block: BlockData) -> List[bytes]:
-    """Build the burn_tx_receipt proof."""
-    state_sync_tx_hash = keccak256(
-        b"matic-bor-receipt-" + burn_tx_block["number"].to_bytes(8, "big") + burn_tx_block["hash"]
+    return merkle_tree.get_proof(burn_tx_block_number - block_start)
+
+
+def get_state_sync_tx_hash(block: BlockData) -> bytes:
+    """Get the hash of the Bor state sync transaction within a block."""
+    return keccak256(
+        b"matic-bor-receipt-" + block["number"].to_bytes(8, "big") + HexBytes(block["hash"])
     )
+
+
+def build_receipts_trie_from(receipts: List[TxReceipt]) -> HexaryTrie:
+    """Build a receipts trie from the receipts of every transaction in a block."""
     receipts_trie = HexaryTrie({})
-    receipts = (
-        web3.eth.get_transaction_receipt(tx)
-        for tx in tqdm(burn_tx_block["transactions"], desc="Building receipts trie", unit="receipt")
-        if tx != state_sync_tx_hash
-    )
-    for tx_receipt in receipts:
+    for tx_receipt in tqdm(receipts, desc="Building receipts trie", unit="receipt"):
         path = rlp.encode(tx_receipt["transactionIndex"])
         receipts_trie[path] = serialize_receipt(tx_receipt)
 
+    return receipts_trie
+
+
+def build_receipts_trie(polygon: Web3, block: BlockData) -> HexaryTrie:
+    """Build the receipts trie of a block.
+
+    Tries are cached per block hash, so exits from the same block only fetch
+    the receipts and build the trie once.
+    """
+    block_hash = HexBytes(block["hash"])
+    if block_hash in _receipts_tries:
+        return _receipts_tries[block_hash]
+
+    receipts = get_block_receipts(block, [get_state_sync_tx_hash(block)], polygon)
+    receipts_trie = build_receipts_trie_from(receipts)
+
+    assert receipts_trie.root_hash == block["receiptsRoot"], "Receipts trie root is incorrect"
+
+    _receipts_tries[block_hash] = receipts_trie
+    return receipts_trie
+
+
+def build_receipt_proof(
+    polygon: Web3, burn_tx_receipt: TxReceipt, burn_tx_block: BlockData
+) -> List[bytes]:
+    """Build the burn_tx_receipt proof."""
+    receipts_trie = build_receipts_trie(polygon, burn_tx_block)
+
     key = rlp.encode(burn_tx_receipt["transactionIndex"])
     print("Building merkle proof")
     proof = receipts_trie.get_proof(key)
 
-    assert (
-        receipts_trie.root_hash == burn_tx_block["receiptsRoot"]
-    ), "Receipts trie root is incorrect"
-
     return key, proof
 
 
@@ -347,7 +376,10 @@ def find_log_index(burn_tx_receipt: TxReceipt) -> int:
     ERC20_TRANSFER_EVENT_SIG = keccak256(b"Transfer(address,address,uint256)")
     for idx, log in enumerate(burn_tx_receipt["logs"]):
         topics = log["topics"]
-        if topics[0] == ERC20_TRANSFER_EVENT_SIG and topics[2] == HexBytes(0) * 32:
+        if (
+            HexBytes(topics[0]) == ERC20_TRANSFER_EVENT_SIG
+            and HexBytes(topics[2]) == HexBytes(0) * 32
+        ):
             return idx
 
     # this should not be reached
@@ -382,29 +414,75 @@ def encode_payload(
     return rlp.encode(payload)
 
 
-def build_calldata(burn_tx_id: str = MATIC_BURN_TX_ID) -> bytes:
+def build_calldata(
+    burn_tx_id: str = MATIC_BURN_TX_ID, connections: ExitConnections = None
+) -> bytes:
     """Generate the calldata required for withdrawing ERC20 asset on Ethereum."""
-    assert is_burn_checkpointed(burn_tx_id)
+    assert is_burn_checkpointed(burn_tx_id, connections=connections)
 
-    burn_tx, burn_tx_receipt, burn_tx_block = fetch_burn_tx_data(burn_tx_id)
-    log_index = find_log_index(burn_tx_receipt)
-    start, end, header_block_number = fetch_block_inclusion_data(burn_tx_block["number"])
-    block_proof = build_block_proof(start, end, burn_tx_block["number"])
-    path, receipt_proof = build_receipt_proof(burn_tx_receipt, burn_tx_block)
+    return build_calldata_many([burn_tx_id], connections)[burn_tx_id]
 
-    calldata = encode_payload(
-        header_block_number,
-        block_proof,
-        burn_tx_block["number"],
-        burn_tx_block["timestamp"],
-        burn_tx_block["transactionsRoot"],
-        burn_tx_block["receiptsRoot"],
-        burn_tx_receipt,
-        receipt_proof,
-        path,
-        log_index,
-    )
-    return calldata
+
+def build_calldata_many(
+    burn_tx_ids: List[str], connections: ExitConnections = None
+) -> Dict[str, bytes]:
+    """Generate the exit calldata for several burn txs at once.
+
+    Burn txs are grouped by checkpoint, so the merkle tree of each checkpoint
+    is only built once. The receipts trie of each block is also only built
+    once, as they are cached per block.
+
+    Returns:
+        Dict of {burn tx id: calldata}, in the same order as `burn_tx_ids`
+    """
+    if connections is None:
+        connections = get_connections()
+    polygon = connections.polygon
+
+    burns = {}
+    checkpoints = {}
+    for burn_tx_id in tqdm(burn_tx_ids, desc="Fetching burn txs", unit="tx"):
+        _, burn_tx_receipt, burn_tx_block = fetch_burn_tx_data(polygon, burn_tx_id)
+        checkpoint = fetch_block_inclusion_data(burn_tx_block["number"])
+        burns[burn_tx_id] = (burn_tx_receipt, burn_tx_block)
+        checkpoints.setdefault(checkpoint, []).append(burn_tx_id)
+
+    calldata = {}
+    for (start, end, header_block_number), checkpoint_tx_ids in checkpoints.items():
+        merkle_tree = build_block_tree(polygon, start, end)
+        for burn_tx_id in checkpoint_tx_ids:
+            burn_tx_receipt, burn_tx_block = burns[burn_tx_id]
+            block_proof = merkle_tree.get_proof(burn_tx_block["number"] - start)
+            path, receipt_proof = build_receipt_proof(polygon, burn_tx_receipt, burn_tx_block)
+
+            calldata[burn_tx_id] = encode_payload(
+                header_block_number,
+                block_proof,
+                burn_tx_block["number"],
+                burn_tx_block["timestamp"],
+                burn_tx_block["transactionsRoot"],
+                burn_tx_block["receiptsRoot"],
+                burn_tx_receipt,
+                receipt_proof,
+                path,
+                find_log_index(burn_tx_receipt),
+            )
+
+    return {i: calldata[i] for i in burn_tx_ids}
+
+
+def get_root_chain_manager() -> Contract:
+    """Get the Polygon `RootChainManager` contract on the active network."""
+    root_chain_mgr_proxy_addr = ADDRS[network.show_active()]["RootChainManagerProxy"]
+    abi = get_loaded_projects()[0].interface.RootChainManager.abi
+    return Contract.from_abi("RootChainManager", root_chain_mgr_proxy_addr, abi)
+
+
+def transfer_from_root_receiver(sender):
+    # transfer USDC out of the root receiver
+    usdc = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+    root_receiver = RootForwarder.at("0x28542E4AF3De534ca36dAF342febdA541c937C5a")
+    root_receiver.transfer(usdc, {"from": sender, "priority_fee": "2 gwei"})
 
 
 def withdraw_asset_on_ethereum(burn_tx_id: str = MATIC_BURN_TX_ID, sender=MSG_SENDER):
@@ -414,17 +492,65 @@ def withdraw_asset_on_ethereum(burn_tx_id: str = MATIC_BURN_TX_ID, sender=MSG_SE
     with open(fp, "w") as f:
         f.write(calldata.hex())
 
-    root_chain_mgr_proxy_addr = ADDRS[network.show_active()]["RootChainManagerProxy"]
-    abi = get_loaded_projects()[0].interface.RootChainManager.abi
-    root_chain_mgr = Contract.from_abi("RootChainManager", root_chain_mgr_proxy_addr, abi)
+    root_chain_mgr = get_root_chain_manager()
 
     print("Calling Exit Function on Root Chain Manager")
     root_chain_mgr.exit(calldata, {"from": sender, "priority_fee": "2 gwei"})
 
-    # transfer USDC out of the root receiver
-    usdc = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
-    root_receiver = RootForwarder.at("0x28542E4AF3De534ca36dAF342febdA541c937C5a")
-    root_receiver.transfer(usdc, {"from": sender, "priority_fee": "2 gwei"})
+    transfer_from_root_receiver(sender)
+
+
+def withdraw_assets_on_ethereum(burn_tx_ids: List[str], sender=MSG_SENDER, submit: bool = True):
+    """Exit several burn txs at once.
+
+    The calldata for every exit is written to a single file. When `submit` is
+    set, the exits are sent without waiting on each confirmation, and funds
+    are moved out of the root receiver once all of them have confirmed.
+    """
+    print("Building Calldata")
+    calldata = build_calldata_many(burn_tx_ids)
+    fp = f"withdraw-calldata-{datetime.now().isoformat()}.json"
+    with open(fp, "w") as f:
+        json.dump({k: v.hex() for k, v in calldata.items()}, f, indent=2)
+    print(f"Calldata for {len(calldata)} exits written to {fp}")
+
+    if not submit:
+        return
+
+    root_chain_mgr = get_root_chain_manager()
+
+    print("Calling Exit Function on Root Chain Manager")
+    pipeline = Pipeline(sender, None, priority_fee="2 gwei")
+    for data in calldata.values():
+        pipeline.submit(root_chain_mgr.exit, data)
+    pipeline.wait()
+
+    transfer_from_root_receiver(sender)
+
+
+def watch_checkpoints(burn_tx_ids: List[str], sender=None, connections: ExitConnections = None):
+    """Wait for burn txs to be checkpointed, optionally exiting each as soon as it is.
+
+    The block of each burn tx is fetched from Polygon once, after which only
+    `getLastChildBlock` is read on Ethereum for each new block.
+
+    Args:
+        burn_tx_ids: Burn tx hashes to watch
+        sender: If given, exits are submitted from this account once checkpointed
+    """
+    if connections is None:
+        connections = get_connections()
+    pending = {i: connections.polygon.eth.get_transaction(i)["blockNumber"] for i in burn_tx_ids}
+
+    def on_checkpointed(ready):
+        print(f"Checkpointed in block {chain.height}: {', '.join(ready)}")
+        if sender is not None:
+            withdraw_assets_on_ethereum(ready, sender)
+
+    watcher = CheckpointWatcher(get_root_chain(), pending, on_checkpointed)
+    watcher.poll()
+    if watcher.pending:
+        watcher.run()
 
 
 def main():
@@ -435,6 +561,7 @@ Choose an option:
 (1) Burn an asset on Matic
 (2) Withdraw an asset on Ethereum
 (3) Check burn tx checkpoint
+(4) Withdraw several assets on Ethereum
 Choice: """
     )
     try:
@@ -460,20 +587,32 @@ Choice: """
         )
         withdraw_asset_on_ethereum(burn_tx_hash, sender)
     elif route == 3:
-        burn_tx_hash = input("Enter burn tx hash: ")
-        bar_fmt = "Blocks Mined: {n} blocks - Time Elapsed: {elapsed}"
-        for block in tqdm(chain.new_blocks(1), bar_format=bar_fmt):
-            if is_burn_checkpointed(burn_tx_hash, True):
-                print(f"Tx {burn_tx_hash} has been checkpointed in block {block['number']}")
-                break
+        burn_tx_hashes = input("Enter burn tx hashes, separated by commas: ")
+        burn_tx_hashes = [i.strip() for i in burn_tx_hashes.split(",") if i.strip()]
+        sender = None
+        if input("Exit automatically once checkpointed? [y/N] ") == "y":
+            sender = (
+                accounts.load(input("Account name: "))
+                if input("Do you want to load an account? [y/N] ") == "y"
+                else MSG_SENDER
+            )
+        watch_checkpoints(burn_tx_hashes, sender)
+    elif route == 4:
+        burn_tx_hashes = input("Input matic burn tx hashes, separated by commas: ")
+        burn_tx_hashes = [i.strip() for i in burn_tx_hashes.split(",") if i.strip()]
+        sender = (
+            accounts.load(input("Account name: "))
+            if input("Do you want to load an account? [y/N] ") == "y"
+            else MSG_SENDER
+        )
+        submit = input("Submit the exit transactions? [y/N] ") == "y"
+        withdraw_assets_on_ethereum(burn_tx_hashes, sender, submit)
 
 
 def test_calldata(burn_tx: str, exit_tx: str):
     print(f"Testing Burn TX: {burn_tx}")
 
-    root_chain_mgr_proxy_addr = ADDRS[network.show_active()]["RootChainManagerProxy"]
-    abi = get_loaded_projects()[0].interface.RootChainManager.abi
-    root_chain_mgr = Contract.from_abi("RootChainManager", root_chain_mgr_proxy_addr, abi)
+    root_chain_mgr = get_root_chain_manager()
 
     calldata = HexBytes(root_chain_mgr.exit.encode_input(build_calldata(burn_tx)))
     input_data = HexBytes(web3.eth.get_transaction(exit_tx)["input"])
@@ -483,21 +622,6 @@ def test_calldata(burn_tx: str, exit_tx: str):
 
 
 def tester():
-    # (burn_tx, exit_tx)
-    test_txs = [
-        (
-            "0x4486e398e0f2ca4d00bec85edbb9aff94e7085fa2b5ef18319989d9d8e37152f",
-            "0x6fe5d2638e7bdbf598c215c6d20b6bf2cad58479460091c0f2330506c14762bf",
-        ),
-        (
-            "0xbcaafea9bed5c31dc2472a015afca6463a5de14730a3a6ab4501475c0594cfc4",
-            "0x1afcfe324fcfa0fbf54182524e74fc57ff8ddff58367529af519adbaccc13f7a",
-        ),
-        (
-            "0x7d17b4cfbab16739bf00cead6ffec306f7420ec5c91de4ac1d485b7de9efaf49",
-            "0xfed6fc9558d45b0672fe9ff23d341d028d99f71a318feabf925f0d1b67eea503",
-        ),
-    ]
-    for burn_tx, exit_tx in test_txs:
+    for burn_tx, exit_tx in TEST_TXS:
         test_calldata(burn_tx, exit_tx)
     print("All works as expected.")
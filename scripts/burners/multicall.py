@@ -0,0 +1,111 @@
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from brownie import ZERO_ADDRESS, Contract
+from brownie.network.contract import ContractCall
+
+# Multicall3 is deployed to the same address on every chain we burn fees on
+MULTICALL_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL_ABI = [
+    {
+        "name": "tryAggregate",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [
+            {"name": "requireSuccess", "type": "bool"},
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            },
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    },
+    {
+        "name": "getEthBalance",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "addr", "type": "address"}],
+        "outputs": [{"name": "balance", "type": "uint256"}],
+    },
+]
+
+# maximum number of calls aggregated into a single `eth_call`
+BATCH_SIZE = 500
+
+# `(contract_method, args)`, or `(contract_method, args, target)` to call the
+# method on a different address than the one the method object is bound to
+Call = Union[Tuple[ContractCall, Sequence[Any]], Tuple[ContractCall, Sequence[Any], str]]
+
+_templates: Dict[str, Contract] = {}
+
+
+def get_multicall(address: str = MULTICALL_ADDRESS) -> Contract:
+    """Get the multicall contract used to aggregate view calls."""
+    return Contract.from_abi("Multicall", address, MULTICALL_ABI, persist=False)
+
+
+def batch_call(
+    calls: List[Call], batch_size: int = BATCH_SIZE, require_success: bool = True
+) -> List[Any]:
+    """Perform many contract view calls using as few RPC requests as possible.
+
+    Args:
+        calls: List of `(contract_method, args)` pairs, e.g. `(registry.pool_list, (0,))`.
+            An optional third item overrides the address that is called.
+        batch_size: Maximum number of calls aggregated within each request
+        require_success: If `False`, failed calls return `None` instead of raising
+
+    Returns:
+        Decoded return values, in the same order as `calls`
+    """
+    multicall = get_multicall()
+    results = []
+    for i in range(0, len(calls), batch_size):
+        batch = calls[i : i + batch_size]
+        payload = []
+        for fn, args, *target in batch:
+            payload.append((target[0] if target else fn._address, fn.encode_input(*args)))
+        response = multicall.tryAggregate(require_success, payload)
+        for (fn, *_), (success, data) in zip(batch, response):
+            # a call to an address without code also "succeeds", but returns no data
+            if success and len(data) > 0:
+                results.append(fn.decode_output(data))
+            else:
+                results.append(None)
+
+    return results
+
+
+def view_abi(name: str, inputs: Sequence[str] = (), output: str = "uint256") -> dict:
+    """Build the ABI for a view method with a single return value."""
+    return {
+        "name": name,
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": f"arg{i}", "type": kind} for i, kind in enumerate(inputs)],
+        "outputs": [{"name": "", "type": output}],
+    }
+
+
+def get_template(name: str, abi: List[dict]) -> Contract:
+    """Get a contract object for encoding calls to any contract sharing an interface.
+
+    Calls are made against a specific contract by including the target address
+    in the call passed to `batch_call`. Templates are created on first use, as
+    this requires an active network connection.
+    """
+    if name not in _templates:
+        _templates[name] = Contract.from_abi(name, ZERO_ADDRESS, abi, persist=False)
+    return _templates[name]
@@ -0,0 +1,170 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, List, Tuple
+
+from brownie import Wei, history, web3
+from brownie.network.account import Account
+from brownie.network.gas.bases import GasABC
+from brownie.network.transaction import TransactionReceipt
+from web3.exceptions import TransactionNotFound
+
+# seconds to wait for a nonce to be mined before resubmitting
+RESUBMIT_TIMEOUT = 600
+
+# minimum gas price increase accepted by nodes when replacing a transaction
+REPLACEMENT_BUMP = 1.125
+
+# maximum number of times a send is repriced after an underpriced replacement error
+MAX_REPLACEMENTS = 5
+
+
+def _resolve_gas_price(gas_price: Any) -> int:
+    """Get the gas price a transaction sent with `gas_price` would start at.
+
+    Gas strategies are resolved to their current (or initial) price, and
+    `None` or "auto" to the price suggested by the node.
+    """
+    if isinstance(gas_price, GasABC):
+        value = gas_price.get_gas_price()
+        return int(next(value) if isinstance(value, Iterator) else value)
+    if gas_price in (None, "auto"):
+        return web3.eth.gas_price
+    return int(Wei(gas_price))
+
+
+class NonceManager:
+    """Assigns nonces locally, so transactions can be sent without waiting."""
+
+    def __init__(self, account: Account) -> None:
+        self.account = account
+        self.sync()
+
+    def sync(self) -> None:
+        """Re-read the next nonce from the node."""
+        self._next = self.account.nonce
+
+    def next(self) -> int:
+        nonce = self._next
+        self._next += 1
+        return nonce
+
+
+class Pipeline:
+    """Submit transactions without blocking on each confirmation.
+
+    Transactions are only tracked by nonce. When the gas strategy reprices a
+    transaction, brownie replaces it with a new one using the same nonce - so
+    whichever transaction ends up mined at that nonce is the result.
+
+    Calling `wait` acts as a barrier: it blocks until every transaction in
+    flight has confirmed, and must be used between dependent stages.
+
+    Args:
+        account: Account to send transactions from
+        gas_price: Gas price or gas strategy, for legacy transactions
+        max_in_flight: Maximum number of unconfirmed transactions
+        priority_fee: If given, EIP-1559 transactions are sent with this
+            priority fee and `gas_price` is ignored
+    """
+
+    def __init__(
+        self, account: Account, gas_price: Any, max_in_flight: int = 4, priority_fee: Any = None
+    ) -> None:
+        self.account = account
+        self.gas_price = gas_price
+        self.priority_fee = priority_fee
+        self.max_in_flight = max_in_flight
+        self.nonces = NonceManager(account)
+        self._pending: "OrderedDict[int, Tuple[Callable, tuple, float]]" = OrderedDict()
+
+    def submit(self, fn: Callable, *args: Any) -> int:
+        """Send a contract transaction without waiting for it to confirm.
+
+        Args:
+            fn: Contract method to call, e.g. `proxy.withdraw_many`
+            args: Arguments for the call, without the transaction dict
+
+        Returns:
+            Nonce the transaction was sent with
+        """
+        if not self._pending:
+            # nothing in flight, make sure no other transactions were sent meanwhile
+            self.nonces.sync()
+        while len(self._pending) >= self.max_in_flight:
+            self._wait_for(next(iter(self._pending)))
+
+        nonce = self.nonces.next()
+        self._send(fn, args, nonce, self.gas_price)
+        self._pending[nonce] = (fn, args, time.time())
+        return nonce
+
+    def wait(self) -> List[TransactionReceipt]:
+        """Wait for every transaction in flight to confirm.
+
+        Returns:
+            Receipts of the mined transactions, in nonce order
+        """
+        return [self._wait_for(nonce) for nonce in list(self._pending)]
+
+    def _send(self, fn: Callable, args: tuple, nonce: int, gas_price: Any) -> None:
+        for attempt in range(MAX_REPLACEMENTS + 1):
+            params = {"from": self.account, "nonce": nonce, "required_confs": 0}
+            if self.priority_fee is not None:
+                params["priority_fee"] = self.priority_fee
+            else:
+                params["gas_price"] = gas_price
+            try:
+                fn(*args, params)
+                return
+            except ValueError as exc:
+                message = str(exc).lower()
+                if "already known" in message:
+                    # a previous attempt already reached the node
+                    return
+                if (
+                    "underpriced" not in message
+                    or self.priority_fee is not None
+                    or attempt == MAX_REPLACEMENTS
+                ):
+                    raise
+            # a transaction with this nonce is already pending at a higher price - the
+            # replacement uses a fixed price, as a strategy would restart from its initial one
+            gas_price = int(_resolve_gas_price(gas_price) * REPLACEMENT_BUMP)
+
+    def _mined_receipt(self, nonce: int) -> TransactionReceipt:
+        for tx in history.filter(sender=self.account, nonce=nonce):
+            try:
+                web3.eth.get_transaction_receipt(tx.txid)
+            except TransactionNotFound:
+                # not mined - replaced by the gas strategy, or still pending
+                continue
+            return tx
+        return None
+
+    def _is_dropped(self, nonce: int) -> bool:
+        for tx in history.filter(sender=self.account, nonce=nonce):
+            try:
+                web3.eth.get_transaction(tx.txid)
+                return False
+            except TransactionNotFound:
+                continue
+        return True
+
+    def _wait_for(self, nonce: int) -> TransactionReceipt:
+        fn, args, sent_at = self._pending[nonce]
+        while self.account.nonce <= nonce:
+            if time.time() - sent_at > RESUBMIT_TIMEOUT and self._is_dropped(nonce):
+                # every version of the transaction has left the mempool, send it again
+                print(f"Transaction with nonce {nonce} was dropped, resubmitting")
+                self._send(fn, args, nonce, self.gas_price)
+                sent_at = time.time()
+            time.sleep(2)
+
+        del self._pending[nonce]
+        tx = self._mined_receipt(nonce)
+        if tx is None:
+            raise RuntimeError(f"Nonce {nonce} was used by a transaction sent outside the pipeline")
+        tx.wait(1)
+        if tx.status != 1:
+            raise RuntimeError(f"Transaction {tx.txid} reverted")
+        return tx
@@ -0,0 +1,241 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+from brownie import ZERO_ADDRESS, Contract, chain, web3
+from brownie.network.transaction import TransactionReceipt
+from eth_utils import keccak
+
+from scripts.burners.multicall import batch_call
+from scripts.burners.rpc import MAX_WORKERS
+from scripts.cache import load_json, save_json
+
+# maximum number of coins in a single `burn_many` call
+MAX_COINS = 20
+
+# gas used by `burn_many` itself, outside of the calls to each burner
+BASE_GAS = 60000
+
+# assumed cost of burning a coin with a burner we have no data for - this
+# is deliberately pessimistic, an empty model is seeded from past burns
+DEFAULT_BURNER_GAS = 800000
+
+# number of recent blocks searched for `burn_many` calls when seeding a model
+SEED_BLOCKS = 200000
+
+# blocks queried in one `eth_getLogs` request while seeding
+SEED_RANGE = 10000
+
+TRANSFER_TOPIC = "0x" + keccak(text="Transfer(address,address,uint256)").hex()
+
+# weight given to each new observation when updating the learned cost
+LEARNING_RATE = 0.5
+
+
+class GasModel:
+    """Learned gas cost of calling `burn` on each burner.
+
+    Costs are keyed by burner address, as given by `PoolProxy.burners`, and
+    persisted to disk so that every run (including fork runs) refines them.
+    """
+
+    def __init__(self, name: str = "burner-gas", chain_id: int = None) -> None:
+        # fork runs may pass the id of the forked chain, to refine its model
+        self.cache_name = f"{name}-{chain.id if chain_id is None else chain_id}.json"
+        self.costs: Dict[str, int] = load_json(self.cache_name, {})
+
+    def estimate(self, burner: str) -> int:
+        """Get the expected gas used to burn one coin with `burner`."""
+        return self.costs.get(burner, DEFAULT_BURNER_GAS)
+
+    def estimate_batch(self, burners: Iterable[str]) -> int:
+        """Get the expected gas used by a `burn_many` call."""
+        return BASE_GAS + sum(self.estimate(i) for i in burners)
+
+    def record(self, burners: List[str], gas_used: int) -> None:
+        """Update the model from the gas used by a `burn_many` call.
+
+        The gas used by the call is attributed to each burner in proportion
+        to the current estimates, so batches mixing several burners are still
+        useful observations.
+
+        Args:
+            burners: Burner used for each coin within the call
+            gas_used: Gas used by the transaction
+        """
+        if not burners:
+            return
+        predicted = sum(self.estimate(i) for i in burners)
+        ratio = max(gas_used - BASE_GAS, 0) / predicted
+        for burner in set(burners):
+            observed = self.estimate(burner) * ratio
+            if burner in self.costs:
+                observed = (1 - LEARNING_RATE) * self.costs[burner] + LEARNING_RATE * observed
+            self.costs[burner] = int(observed)
+
+    def seed(self, proxy: Contract, blocks: int = SEED_BLOCKS) -> int:
+        """Learn burner costs from the receipts of recent `burn_many` calls.
+
+        Burners pull each coin from the proxy, so the calls are found through
+        `Transfer` logs sent from the proxy within the last `blocks` blocks.
+        Costs are attributed using the current burner of each coin.
+
+        Returns:
+            Number of calls recorded
+        """
+        end = web3.eth.blockNumber
+        sender = "0x" + bytes(12).hex() + proxy.address[2:].lower()
+        tx_hashes: Dict[str, None] = {}
+        for start in range(max(end - blocks, 0), end + 1, SEED_RANGE):
+            logs = web3.eth.getLogs(
+                {
+                    "fromBlock": start,
+                    "toBlock": min(start + SEED_RANGE - 1, end),
+                    "topics": [TRANSFER_TOPIC, sender],
+                }
+            )
+            tx_hashes.update((i["transactionHash"], None) for i in logs)
+
+        with ThreadPoolExecutor(MAX_WORKERS) as executor:
+            txs = list(executor.map(web3.eth.get_transaction, tx_hashes))
+        calls = []
+        for tx in txs:
+            if tx["to"] != proxy.address or tx["input"][:10] != proxy.burn_many.signature:
+                continue
+            coins = proxy.burn_many.decode_input(tx["input"])[0]
+            calls.append((tx["hash"], [i for i in coins if i != ZERO_ADDRESS]))
+        if not calls:
+            return 0
+
+        with ThreadPoolExecutor(MAX_WORKERS) as executor:
+            receipts = list(executor.map(web3.eth.get_transaction_receipt, [i[0] for i in calls]))
+        burners = get_burners(proxy, sorted(set(i for _, coins in calls for i in coins)))
+        count = 0
+        for (_, coins), receipt in zip(calls, receipts):
+            call_burners = [burners[i] for i in coins]
+            # skip failed calls, and coins that no longer have a burner
+            if receipt["status"] and ZERO_ADDRESS not in call_burners:
+                self.record(call_burners, receipt["gasUsed"])
+                count += 1
+
+        return count
+
+    def save(self) -> None:
+        save_json(self.cache_name, self.costs)
+
+
+def get_burners(proxy: Contract, coins: List[str]) -> Dict[str, str]:
+    """Get the burner assigned to each coin, in a single batched read."""
+    return dict(zip(coins, batch_call([(proxy.burners, (coin,)) for coin in coins])))
+
+
+def plan_batches(
+    coins: List[str],
+    burners: Dict[str, str],
+    model: GasModel,
+    gas_limit: int,
+    first: Iterable[str] = (),
+    last: Iterable[str] = (),
+) -> List[List[str]]:
+    """Pack coins into as few `burn_many` calls as possible.
+
+    Coins handled by a burner in `first` (burners that forward into other
+    burners, e.g. the LP burner) are always burned before any other coin,
+    and coins handled by a burner in `last` (burners that others forward
+    into, e.g. the underlying burner) are burned after every other coin.
+    Within these constraints, coins are packed first-fit decreasing.
+
+    Args:
+        coins: Coins to burn
+        burners: Dict of {coin: burner}
+        model: Gas model used to estimate the cost of each burn
+        gas_limit: Maximum expected gas for a single `burn_many` call
+        first: Burners whose coins must be burned first
+        last: Burners whose coins must be burned last
+
+    Returns:
+        List of batches, in the order they must be executed. Coins within each
+        batch are also ordered.
+    """
+    first, last = set(first), set(last)
+
+    def stage(coin):
+        burner = burners[coin]
+        return 0 if burner in first else 2 if burner in last else 1
+
+    batches: List[List[str]] = []
+    gas: List[int] = []
+    floor = 0
+    for current in range(3):
+        stage_coins = [i for i in coins if stage(i) == current]
+        stage_coins.sort(key=lambda k: model.estimate(burners[k]), reverse=True)
+        for coin in stage_coins:
+            cost = model.estimate(burners[coin])
+            # a coin may only join a batch that executes after every batch
+            # containing a coin from an earlier stage
+            for idx in range(floor, len(batches)):
+                if len(batches[idx]) < MAX_COINS and gas[idx] + cost <= gas_limit:
+                    batches[idx].append(coin)
+                    gas[idx] += cost
+                    break
+            else:
+                batches.append([coin])
+                gas.append(BASE_GAS + cost)
+        if batches:
+            floor = len(batches) - 1
+
+    return batches
+
+
+def _pad(coins: List[str]) -> List[str]:
+    return coins + [ZERO_ADDRESS] * (MAX_COINS - len(coins))
+
+
+def _estimate_gas(proxy: Contract, coins: List[str], tx_params: dict) -> int:
+    return proxy.burn_many.estimate_gas(_pad(coins), {"from": tx_params["from"]})
+
+
+def execute_plan(
+    proxy: Contract,
+    batches: List[List[str]],
+    burners: Dict[str, str],
+    model: GasModel,
+    gas_limit: int,
+    tx_params: dict,
+) -> List[TransactionReceipt]:
+    """Execute planned `burn_many` calls.
+
+    Each batch is verified with an `estimate_gas` call immediately before it
+    is sent. If the estimate exceeds `gas_limit`, the batch is split in two
+    and each half is verified again. If it leaves headroom, the following
+    batch is appended for as long as the combined estimate still fits, so a
+    pessimistic model does not cost extra transactions. The gas used by every
+    call is fed back into `model`.
+
+    Returns:
+        List of transaction receipts
+    """
+    batches = [list(i) for i in batches]
+    receipts = []
+    while batches:
+        batch = batches.pop(0)
+        estimate = _estimate_gas(proxy, batch, tx_params)
+        if estimate > gas_limit and len(batch) > 1:
+            middle = len(batch) // 2
+            batches = [batch[:middle], batch[middle:]] + batches
+            continue
+
+        # batches are executed in order, so joining consecutive batches keeps every coin's order
+        while estimate < gas_limit and batches and len(batch) + len(batches[0]) <= MAX_COINS:
+            merged = batch + batches[0]
+            merged_estimate = _estimate_gas(proxy, merged, tx_params)
+            if merged_estimate > gas_limit:
+                break
+            batches.pop(0)
+            batch, estimate = merged, merged_estimate
+
+        tx = proxy.burn_many(_pad(batch), tx_params)
+        model.record([burners[i] for i in batch], tx.gas_used)
+        receipts.append(tx)
+
+    model.save()
+    return receipts
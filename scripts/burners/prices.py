@@ -0,0 +1,259 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+import requests
+from brownie import ETH_ADDRESS, ZERO_ADDRESS, Contract, chain
+
+from scripts.burners.multicall import batch_call, get_template, view_abi
+from scripts.burners.registry import get_registry
+from scripts.burners.valuation import get_decimals
+from scripts.cache import load_json, save_json
+
+# coins assumed to be worth exactly $1 when pricing on-chain
+USD_ANCHORS = {
+    "0x6b175474e89094c44da98b954eedeac495271d0f": 1.0,  # DAI
+    "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": 1.0,  # USDC
+    "0xdac17f958d2ee523a2206206994597c13d831ec7": 1.0,  # USDT
+}
+
+# seconds before a cached price is considered stale
+PRICE_TTL = 3600
+
+# maximum number of token addresses in one CoinGecko request
+COINGECKO_BATCH = 50
+
+
+class PriceProvider(ABC):
+    """Base class for USD price sources.
+
+    Providers only need to implement `fetch`. Coins are always given and
+    returned as lowercase addresses.
+    """
+
+    @abstractmethod
+    def fetch(self, coins: List[str]) -> Dict[str, float]:
+        """Get the USD price of as many `coins` as possible.
+
+        Coins without a known price should be omitted from the result.
+        """
+        ...
+
+
+class CoinGeckoProvider(PriceProvider):
+    """Prices from the CoinGecko API."""
+
+    def fetch(self, coins: List[str]) -> Dict[str, float]:
+        prices = {}
+        if ETH_ADDRESS.lower() in coins:
+            prices[ETH_ADDRESS.lower()] = requests.get(
+                "https://api.coingecko.com/api/v3/simple/price",
+                params={"ids": "ethereum", "vs_currencies": "usd"},
+            ).json()["ethereum"]["usd"]
+        for i in range(0, len(coins), COINGECKO_BATCH):
+            response = requests.get(
+                "https://api.coingecko.com/api/v3/simple/token_price/ethereum",
+                params={
+                    "contract_addresses": ",".join(coins[i : i + COINGECKO_BATCH]),
+                    "vs_currencies": "usd",
+                },
+            ).json()
+            for addr in response:
+                if "usd" in response[addr]:
+                    prices[addr.lower()] = response[addr]["usd"]
+
+        return prices
+
+
+class OnChainProvider(PriceProvider):
+    """Prices derived from the exchange rates within registry pools.
+
+    Exchange rates between every pair of coins in every pool, and the virtual
+    price and LP token of each pool, are read in one batched request. Prices
+    then spread outward from the USD anchor coins, one pool hop at a time.
+    """
+
+    def __init__(
+        self,
+        pool_list: Dict[str, List[str]],
+        registry: Contract = None,
+        anchors: Dict[str, float] = None,
+    ) -> None:
+        self.pool_list = {pool: [i.lower() for i in coins] for pool, coins in pool_list.items()}
+        self.registry = get_registry() if registry is None else registry
+        self.anchors = USD_ANCHORS if anchors is None else anchors
+
+    def fetch(self, coins: List[str]) -> Dict[str, float]:
+        # older pools use `int128` indexes and crypto pools use `uint256`, we try both
+        pool = get_template("CurvePoolRates", [view_abi("get_dy", ["int128", "int128", "uint256"])])
+        crypto_pool = get_template("CryptoPoolRates", [view_abi("get_dy", ["uint256"] * 3)])
+        lp_pool = get_template("CurvePoolPrice", [view_abi("get_virtual_price")])
+
+        decimals = get_decimals(coin for i in self.pool_list.values() for coin in i)
+        calls = []
+        for addr, pool_coins in self.pool_list.items():
+            calls += [
+                (lp_pool.get_virtual_price, (), addr),
+                (self.registry.get_lp_token, (addr,)),
+            ]
+            for i, coin_i in enumerate(pool_coins):
+                for j in range(len(pool_coins)):
+                    if i != j:
+                        amount = 10 ** decimals[coin_i]
+                        calls += [
+                            (pool.get_dy, (i, j, amount), addr),
+                            (crypto_pool.get_dy, (i, j, amount), addr),
+                        ]
+        results = iter(batch_call(calls, require_success=False))
+
+        # edges[coin] -> list of (other coin, amount of coin received for one other coin)
+        edges: Dict[str, list] = {}
+        lp_tokens = {}
+        for addr, pool_coins in self.pool_list.items():
+            virtual_price, lp_token = next(results), next(results)
+            if virtual_price and lp_token and lp_token != ZERO_ADDRESS:
+                lp_tokens[lp_token.lower()] = (virtual_price / 1e18, pool_coins)
+            for i, coin_i in enumerate(pool_coins):
+                for j, coin_j in enumerate(pool_coins):
+                    if i == j:
+                        continue
+                    dy, crypto_dy = next(results), next(results)
+                    dy = dy if dy is not None else crypto_dy
+                    if dy:
+                        edges.setdefault(coin_j, []).append((coin_i, dy / 10 ** decimals[coin_j]))
+
+        # breadth-first from the anchors, so each price uses the fewest hops possible
+        prices = dict(self.anchors)
+        queue = deque(prices)
+        while queue:
+            coin = queue.popleft()
+            for other, rate in edges.get(coin, []):
+                if other not in prices:
+                    prices[other] = prices[coin] * rate
+                    queue.append(other)
+
+        # LP tokens are worth their virtual price in terms of the underlying coins
+        for lp_token, (virtual_price, pool_coins) in lp_tokens.items():
+            underlying = [prices[i] for i in pool_coins if i in prices]
+            if lp_token not in prices and underlying:
+                prices[lp_token] = virtual_price * sum(underlying) / len(underlying)
+
+        return {coin: prices[coin] for coin in coins if coin in prices}
+
+
+class StubProvider(PriceProvider):
+    """Fixed prices, for offline and development runs.
+
+    Args:
+        prices: Dict of {coin: price}. Coins not included are worth `default`.
+        default: Price used for any other coin. If `None`, other coins are omitted.
+    """
+
+    def __init__(self, prices: Dict[str, float] = None, default: float = 1.0) -> None:
+        self.prices = {k.lower(): v for k, v in (prices or {}).items()}
+        self.default = default
+
+    def fetch(self, coins: List[str]) -> Dict[str, float]:
+        if self.default is None:
+            return {i: self.prices[i] for i in coins if i in self.prices}
+        return {i: self.prices.get(i, self.default) for i in coins}
+
+
+class PriceCache:
+    """TTL cache of USD prices, backed by an on-disk snapshot.
+
+    Providers are tried in order, each one only being asked for coins that the
+    previous providers could not price. Refreshes run in a background thread
+    and lookups never wait on them - until a refresh finishes, the last known
+    (possibly stale) price is used.
+    """
+
+    def __init__(self, providers: List[PriceProvider], ttl: int = PRICE_TTL) -> None:
+        self.providers = providers
+        self.ttl = ttl
+        self.cache_name = f"prices-{chain.id}.json"
+        # {coin: [price, timestamp]}
+        self.prices: Dict[str, list] = load_json(self.cache_name, {})
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+        # coins waiting on the running refresh thread
+        self._pending: Set[str] = set()
+        # {coin: timestamp of the last refresh attempt}
+        self._attempted: Dict[str, float] = {}
+
+    def _needs_refresh(self, coin: str) -> bool:
+        if coin in self.prices and time.time() - self.prices[coin][1] <= self.ttl:
+            return False
+        # don't retry coins that no provider could price within the last `ttl`
+        return time.time() - self._attempted.get(coin, 0) > self.ttl
+
+    def _refresh(self, coins: List[str]) -> None:
+        for provider in self.providers:
+            if not coins:
+                break
+            try:
+                result = provider.fetch(coins)
+            except Exception as exc:
+                print(f"{type(provider).__name__} failed to fetch prices: {exc}")
+                continue
+            now = time.time()
+            with self._lock:
+                for coin, price in result.items():
+                    self.prices[coin] = [price, now]
+                save_json(self.cache_name, self.prices)
+            coins = [i for i in coins if i not in result]
+
+    def _run(self) -> None:
+        # refresh pending coins until none remain, including any added meanwhile
+        while True:
+            with self._lock:
+                coins = sorted(self._pending)
+                self._pending.clear()
+                if not coins:
+                    self._thread = None
+                    return
+            self._refresh(coins)
+
+    def refresh(self, coins: Iterable[str]) -> None:
+        """Start refreshing any stale prices for `coins` in the background."""
+        coins = set(i.lower() for i in coins if self._needs_refresh(i.lower()))
+        if not coins:
+            return
+        now = time.time()
+        with self._lock:
+            self._attempted.update((i, now) for i in coins)
+            self._pending.update(coins)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wait for a refresh in progress to finish.
+
+        Returns:
+            `False` if the refresh is still running after `timeout` seconds
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def missing(self, coins: Iterable[str]) -> List[str]:
+        """Get the coins that have never been priced, not even a stale price."""
+        with self._lock:
+            return [i for i in (i.lower() for i in coins) if i not in self.prices]
+
+    def get_prices(self, coins: Iterable[str]) -> Dict[str, float]:
+        """Get the last known price for each coin, without waiting on providers.
+
+        Stale prices are refreshed in the background for later lookups. Coins
+        with no known price are omitted from the result.
+        """
+        coins = [i.lower() for i in coins]
+        self.refresh(coins)
+
+        with self._lock:
+            return {i: self.prices[i][0] for i in coins if i in self.prices}
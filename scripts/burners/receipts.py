@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+from brownie import web3
+from eth_utils import to_hex
+from hexbytes import HexBytes
+from web3 import Web3
+
+from scripts.burners.rpc import MAX_WORKERS, concurrent_batches, request, supports_batching, to_int
+
+
+def _format_receipt(receipt: dict) -> dict:
+    # decode the quantities used when serializing a receipt - the remaining
+    # fields are hex strings, which are handled the same as bytes
+    receipt = dict(receipt)
+    for key in ("status", "cumulativeGasUsed", "transactionIndex", "type"):
+        if key in receipt:
+            receipt[key] = to_int(receipt[key])
+    return receipt
+
+
+def get_block_receipts(block: dict, exclude: Iterable[bytes] = (), w3: Web3 = web3) -> List[dict]:
+    """Get the receipt of every transaction in a block.
+
+    Uses a single `eth_getBlockReceipts` call where the node supports it, and
+    otherwise fetches the receipts of each transaction in concurrent batches.
+
+    Args:
+        block: Block data, with `transactions` given as hashes
+        exclude: Hashes of transactions to omit, e.g. Bor state sync transactions
+        w3: Connection to the chain to fetch from, defaults to the active network
+
+    Returns:
+        Receipts, in the order of the transactions within the block
+    """
+    try:
+        receipts = request("eth_getBlockReceipts", [hex(block["number"])], w3)
+    except ValueError:
+        receipts = None
+
+    exclude = set(HexBytes(i) for i in exclude)
+    if receipts is None:
+        tx_hashes = [to_hex(i) for i in block["transactions"] if HexBytes(i) not in exclude]
+        if supports_batching(w3):
+            params = [(i,) for i in tx_hashes]
+            receipts = concurrent_batches("eth_getTransactionReceipt", params, w3=w3)
+        else:
+            with ThreadPoolExecutor(MAX_WORKERS) as executor:
+                receipts = list(executor.map(w3.eth.get_transaction_receipt, tx_hashes))
+
+    receipts = [i for i in receipts if HexBytes(i["transactionHash"]) not in exclude]
+    return sorted(map(_format_receipt, receipts), key=lambda k: k["transactionIndex"])
@@ -0,0 +1,90 @@
+import sys
+from typing import Dict, List
+
+from brownie import ZERO_ADDRESS, Contract, chain
+
+from scripts.burners.multicall import batch_call
+from scripts.cache import load_json, save_json
+
+ADDRESS_PROVIDER = "0x0000000022D53366457F9d5E68Ec105046FC4383"
+
+
+def get_registry() -> Contract:
+    """Get the main registry via the address provider."""
+    provider = Contract(ADDRESS_PROVIDER)
+    return Contract(provider.get_registry())
+
+
+def fetch_pools(registry: Contract, start: int = 0, end: int = None) -> Dict[str, List[str]]:
+    """Fetch pool addresses and their coins from the registry.
+
+    Pool addresses and coin lists are each read with aggregated multicall
+    requests, rather than two calls per pool.
+
+    Args:
+        registry: Registry contract
+        start: Index of the first pool to fetch
+        end: Index to stop fetching at. If not given, `registry.pool_count()` is used.
+
+    Returns:
+        Dict of {pool address: [coin addresses]}, ordered by registry index
+    """
+    if end is None:
+        end = registry.pool_count()
+    if start >= end:
+        return {}
+
+    sys.stdout.write(f"Getting pools {start}-{end-1} from registry...")
+    sys.stdout.flush()
+
+    pools = batch_call([(registry.pool_list, (i,)) for i in range(start, end)])
+    coins = batch_call([(registry.get_coins, (pool,)) for pool in pools])
+
+    print(" done")
+    return {
+        pool: [coin for coin in coin_list if coin != ZERO_ADDRESS]
+        for pool, coin_list in zip(pools, coins)
+    }
+
+
+def _snapshot_name(registry: Contract) -> str:
+    return f"registry-{chain.id}-{registry.address}.json"
+
+
+def sync_registry(registry: Contract = None) -> dict:
+    """Load the on-disk registry snapshot and bring it up to date.
+
+    Pools are only ever appended to the registry, so only pools between the
+    cached `pool_count` and the current one are fetched. If the snapshot is
+    missing, or the registry was modified in a way that invalidates it (a pool
+    was removed), a full sync is performed.
+
+    Args:
+        registry: Registry contract. Defaults to the main registry.
+
+    Returns:
+        Snapshot dict with keys `pool_count` and `pools` ({pool: [coins]})
+    """
+    if registry is None:
+        registry = get_registry()
+
+    empty = {"pool_count": 0, "pools": {}}
+    snapshot = load_json(_snapshot_name(registry), empty)
+    cached_count = snapshot["pool_count"]
+
+    calls = [(registry.pool_count, ())]
+    if cached_count:
+        calls.append((registry.pool_list, (cached_count - 1,)))
+    pool_count, *last_pool = batch_call(calls)
+
+    if pool_count < cached_count or last_pool != list(snapshot["pools"])[-1:]:
+        print("Registry snapshot is outdated, performing a full sync")
+        snapshot = empty
+        cached_count = 0
+
+    new_pools = fetch_pools(registry, cached_count, pool_count)
+    snapshot["pools"].update(new_pools)
+    snapshot["pool_count"] = pool_count
+
+    save_json(_snapshot_name(registry), snapshot)
+    return snapshot
@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Sequence
+
+import requests
+from brownie import web3
+from web3 import Web3
+
+# number of calls sent in a single JSON-RPC batch
+BATCH_SIZE = 100
+
+# maximum number of batches in flight at once
+MAX_WORKERS = 8
+
+
+def to_int(value: Any) -> int:
+    """Convert a hex encoded JSON-RPC quantity, leaving decoded values as they are."""
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def supports_batching(w3: Web3 = web3) -> bool:
+    """Check if a provider accepts JSON-RPC batches (i.e. is HTTP)."""
+    uri = getattr(w3.provider, "endpoint_uri", None)
+    return bool(uri) and str(uri).startswith("http")
+
+
+def request(method: str, params: Sequence, w3: Web3 = web3) -> Any:
+    """Make a single raw JSON-RPC request.
+
+    Raises:
+        ValueError: if the node returns an error
+    """
+    response = w3.provider.make_request(method, list(params))
+    if "error" in response:
+        raise ValueError(response["error"])
+    return response["result"]
+
+
+def batch_request(method: str, params: List[Sequence], w3: Web3 = web3) -> List[Any]:
+    """Make one raw JSON-RPC batch request, calling `method` once for each item in `params`.
+
+    Returns:
+        Results, in the same order as `params`
+
+    Raises:
+        ValueError: if the node rejects the batch or any call within it fails
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": list(args)}
+        for i, args in enumerate(params)
+    ]
+    response = requests.post(w3.provider.endpoint_uri, json=payload, timeout=60).json()
+    if not isinstance(response, list):
+        raise ValueError(f"Batch request failed: {response}")
+
+    results = [None] * len(params)
+    for item in response:
+        if "error" in item:
+            raise ValueError(f"{method} failed for {params[item['id']]}: {item['error']}")
+        results[item["id"]] = item["result"]
+    return results
+
+
+def concurrent_batches(
+    method: str, params: List[Sequence], batch_size: int = BATCH_SIZE, w3: Web3 = web3
+) -> List[Any]:
+    """Call `method` once for each item in `params`, in concurrent batches.
+
+    Returns:
+        Results, in the same order as `params`
+    """
+    batches = [params[i : i + batch_size] for i in range(0, len(params), batch_size)]
+    with ThreadPoolExecutor(MAX_WORKERS) as executor:
+        return [
+            i
+            for batch in executor.map(lambda k: batch_request(method, k, w3), batches)
+            for i in batch
+        ]
@@ -0,0 +1,71 @@
+import time
+from typing import Iterable, Tuple
+
+from brownie import Contract
+
+from scripts.burners.multicall import view_abi
+
+# Synthetix `ReadProxyAddressResolver`, used to locate the current `Exchanger`
+ADDRESS_RESOLVER = "0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2"
+
+SUSD_CURRENCY_KEY = "0x7355534400000000000000000000000000000000000000000000000000000000"
+
+EXCHANGER_ABI = [view_abi("maxSecsLeftInWaitingPeriod", ["address", "bytes32"])]
+
+# maximum number of seconds between checks of the waiting period
+POLL_INTERVAL = 5
+
+
+def get_exchanger() -> Contract:
+    """Get the current Synthetix `Exchanger`."""
+    abi = [view_abi("getAddress", ["bytes32"], "address")]
+    resolver = Contract.from_abi("AddressResolver", ADDRESS_RESOLVER, abi, persist=False)
+    exchanger = resolver.getAddress(b"Exchanger".ljust(32, b"\x00"))
+    return Contract.from_abi("Exchanger", exchanger, EXCHANGER_ABI, persist=False)
+
+
+def get_secs_left(
+    exchanger: Contract,
+    accounts: Iterable[str],
+    currency_keys: Tuple[str, ...] = (SUSD_CURRENCY_KEY,),
+) -> int:
+    """Get the number of seconds until every pending synth exchange can be settled."""
+    return max(
+        exchanger.maxSecsLeftInWaitingPeriod(account, key)
+        for account in accounts
+        for key in currency_keys
+    )
+
+
+def wait_for_settlement(
+    exchanger: Contract,
+    accounts: Iterable[str],
+    currency_keys: Tuple[str, ...] = (SUSD_CURRENCY_KEY,),
+    timeout: int = 900,
+) -> None:
+    """Block until the waiting period has ended for every synth exchange.
+
+    Instead of sleeping for the maximum settlement time, the exchanger is
+    queried for the time remaining on each account, and this returns as soon
+    as all of them reach zero.
+
+    Args:
+        exchanger: Synthetix `Exchanger` contract
+        accounts: Addresses that performed synth exchanges
+        currency_keys: Currency keys of the synths that were received
+        timeout: Maximum number of seconds to wait
+
+    Raises:
+        TimeoutError: if the waiting period has not ended after `timeout` seconds
+    """
+    accounts = list(accounts)
+    start = time.time()
+    while True:
+        secs_left = get_secs_left(exchanger, accounts, currency_keys)
+        if secs_left == 0:
+            return
+        if time.time() - start >= timeout:
+            raise TimeoutError(f"Synths still in waiting period ({secs_left}s remaining)")
+        # the waiting period ends based on block timestamps, so the remaining time
+        # is only a lower bound - check again once it elapses, or sooner
+        time.sleep(min(secs_left, POLL_INTERVAL))
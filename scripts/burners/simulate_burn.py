@@ -0,0 +1,100 @@
+"""Dry run of a full fee burn cycle on a mainnet fork.
+
+Runs the same stages as `claim_and_burn_fees`, and reports the gas used,
+number of transactions and wall time of each stage, along with the amount of
+3CRV delivered to the fee distributor. Use this to tune `CLAIM_THRESHOLD`
+and `BURN_GAS_LIMIT` before broadcasting.
+
+Usage: brownie run burners/simulate_burn --network mainnet-fork
+
+Set `SEED_USD` to mint an additional amount of every fee coin to the pool
+proxy before burning, to simulate a week with larger fees.
+"""
+import time
+
+from brownie import ETH_ADDRESS, Contract, accounts, chain, history, network
+from brownie_tokens import MintableForkToken
+
+from scripts.burners import claim_and_burn_fees as burn
+from scripts.burners.planner import GasModel
+from scripts.burners.settlement import get_exchanger, get_secs_left
+from scripts.burners.valuation import get_decimals
+
+# USD value of each fee coin to mint to the pool proxy prior to burning
+SEED_USD = 0
+
+# fork runs use a different chain id, but should still refine the mainnet gas model
+MAINNET_CHAIN_ID = 1
+
+
+def _load_prices(pool_list):
+    # fetch every price up front, so stage timings and claim decisions never depend on it
+    price_cache = burn._get_price_cache(pool_list)
+    price_cache.refresh(burn.COINS + [i for v in pool_list.values() for i in v])
+    price_cache.wait()
+    return price_cache
+
+
+def _seed_fees(proxy, price_cache, amount_usd):
+    coins = [i.lower() for i in burn.COINS if i.lower() != ETH_ADDRESS.lower()]
+    decimals = get_decimals(coins)
+    rates = price_cache.get_prices(coins)
+    for coin in coins:
+        amount = int(amount_usd / rates.get(coin, 1) * 10 ** decimals[coin])
+        try:
+            MintableForkToken(coin)._mint_for_testing(proxy, amount)
+        except Exception as exc:
+            print(f"Unable to mint {coin}: {exc}")
+
+
+def _settle():
+    # on a fork no time passes on its own - advance the chain past the waiting period
+    secs_left = get_secs_left(get_exchanger(), burn.SYNTH_BURNERS + [burn.UNDERLYING_BURNER])
+    if secs_left:
+        chain.sleep(secs_left + 1)
+        chain.mine()
+
+
+def _run_stage(report, name, fn, *args):
+    tx_count = len(history)
+    start = time.time()
+    fn(*args)
+    txs = history[tx_count:]
+    report.append((name, sum(i.gas_used for i in txs), len(txs), time.time() - start))
+
+
+def main(claim_threshold=burn.CLAIM_THRESHOLD, gas_limit=burn.BURN_GAS_LIMIT, seed_usd=SEED_USD):
+    assert "fork" in network.show_active(), "Simulations must be run on a fork"
+
+    acct = accounts[0]
+    lp_tripool = Contract(burn.LP_TRIPOOL)
+    distributor = Contract(burn.FEE_DISTRIBUTOR)
+    proxy = Contract(burn.POOL_PROXY)
+    initial_balance = lp_tripool.balanceOf(distributor)
+
+    pool_list = burn._get_pool_list()
+    price_cache = _load_prices(pool_list)
+    if seed_usd:
+        _seed_fees(proxy, price_cache, seed_usd)
+
+    report = []
+    model = GasModel(chain_id=MAINNET_CHAIN_ID)
+    _run_stage(report, "withdraw", burn.withdraw_fees, proxy, pool_list, acct, claim_threshold, 0)
+    _run_stage(report, "burn", burn.burn_fees, proxy, acct, 0, gas_limit, model)
+    _run_stage(report, "settle", _settle)
+    _run_stage(report, "execute", burn.execute_underlying, acct, 0)
+    _run_stage(report, "forward", burn.forward_3crv, proxy, acct, 0)
+
+    delivered = (lp_tripool.balanceOf(distributor) - initial_balance) / 1e18
+
+    print(f"\nClaim threshold: ${claim_threshold:,}  Burn gas limit: {gas_limit:,}\n")
+    print(f"{'Stage':<10}{'Gas used':>14}{'Txs':>6}{'Time (s)':>10}")
+    for name, gas_used, tx_count, elapsed in report:
+        print(f"{name:<10}{gas_used:>14,}{tx_count:>6}{elapsed:>10.1f}")
+    total_gas = sum(i[1] for i in report)
+    total_txs = sum(i[2] for i in report)
+    total_time = sum(i[3] for i in report)
+    print(f"{'total':<10}{total_gas:>14,}{total_txs:>6}{total_time:>10.1f}")
+    print(f"\n3CRV delivered to fee distributor: {delivered:,.4f}")
+
+    return report, delivered
@@ -1,45 +1,79 @@
-import json
-from pathlib import Path
-
 from brownie import Contract, FeeDistributor, accounts, chain
 
+from scripts.stats.event_index import CONFIRMATIONS
+from scripts.stats.fee_model import WEEK, FeeDistributorModel
+from scripts.stats.ve_index import VotingEscrowIndex
+from scripts.stats.vecrv_supply import START_BLOCK, VotingEscrowSupply
+
 
-def main():
+def main(verify: int = 10):
     alice = accounts[0]
     fee_token = Contract("0x6c3F90f043a72FA612cbac8115EE7e52BDe6E490")
     voting_escrow = Contract("0x5f3b5dfeb7b28cdbd7faba78963ee202a494e2a2")
 
+    # index lockers before any blocks are mined on the fork, so the index only holds mainnet data
+    index = VotingEscrowIndex(voting_escrow, START_BLOCK)
+    index.sync(chain.height - CONFIRMATIONS)
+
     # sept 17, 2020 - 2 days before admin fee collection begins
     start_time = 1600300800
     distributor = FeeDistributor.deploy(
         voting_escrow, start_time, fee_token, alice, alice, {"from": alice}
     )
+    model = FeeDistributorModel(
+        VotingEscrowSupply(index.lock_events()), start_time, distributor.tx.timestamp
+    )
 
     # transfer 2m USD of 3CRV
     fee_token.mint(
         distributor, 2000000 * 10 ** 18, {"from": "0xbebc44782c7db0a1a60cb6fe97d0b483032ff1c7"}
     )
 
-    distributor.checkpoint_token()
-    distributor.checkpoint_total_supply()
+    def checkpoint_total_supply():
+        tx = distributor.checkpoint_total_supply()
+        model.set_time(tx.timestamp)
+        model.checkpoint_total_supply()
+
+    def checkpoint_token():
+        tx = distributor.checkpoint_token()
+        model.set_time(tx.timestamp)
+        model.checkpoint_token(fee_token.balanceOf(distributor))
+
+    checkpoint_token()
+    checkpoint_total_supply()
     chain.sleep(86400 * 14)
-    distributor.checkpoint_token()
-    distributor.checkpoint_total_supply()
+    checkpoint_token()
+    checkpoint_total_supply()
+
+    # each call records at most 20 weeks of supply - catch up, as the first claims would
+    while distributor.time_cursor() <= chain.time() // WEEK * WEEK:
+        checkpoint_total_supply()
 
-    with Path("votelocks-11237343.json").open() as fp:
-        data = json.load(fp)
-    data = set([i["provider"] for i in data])
+    # the total of every `claim` call each account needs, without sending any of them
+    data = index.providers
+    amounts, dust = model.claimable(data)
+    print(f"Claimable by {len(data)} accounts: ${sum(amounts)/1e18:,.2f}")
+    print(f"Undistributed dust: ${dust/1e18:,.2f}")
 
-    for c, acct in enumerate(data):
-        print(f"Claiming, {c}/{len(data)}")
+    # spot check the largest claims against the contract
+    last_week = distributor.last_token_time() // WEEK * WEEK
+    claimed = 0
+    for i in sorted(range(len(data)), key=lambda k: -amounts[k])[:verify]:
+        acct = data[i]
+        balance = fee_token.balanceOf(acct)
 
-        # ensure we claim up to the user's max epoch, some accounts require multiple claims
-        max_epoch = voting_escrow.user_point_epoch(acct)
-        epoch = 0
+        # each claim walks at most 50 weeks and user points, so some accounts require
+        # several - stop once the cursor reaches the last week or a claim makes no progress
+        progress = (distributor.time_cursor_of(acct), distributor.user_epoch_of(acct))
+        while progress[0] < last_week:
+            distributor.claim(acct, {"from": alice})
+            last_progress = progress
+            progress = (distributor.time_cursor_of(acct), distributor.user_epoch_of(acct))
+            if progress == last_progress:
+                break
 
-        while epoch < max_epoch:
-            distributor.claim({"from": acct})
-            epoch = distributor.user_epoch_of(acct)
+        assert fee_token.balanceOf(acct) - balance == amounts[i]
+        claimed += amounts[i]
 
-    amount = fee_token.balanceOf(distributor)
+    amount = fee_token.balanceOf(distributor) - (sum(amounts) - claimed)
     print(f"Remaining fee balance: ${amount/1e18:,.2f}")
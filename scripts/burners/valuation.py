@@ -0,0 +1,119 @@
+from typing import Dict, Iterable, List
+
+from brownie import ETH_ADDRESS, chain
+
+from scripts.burners.multicall import batch_call, get_multicall, get_template, view_abi
+from scripts.cache import load_json, save_json
+
+
+def _pool():
+    abi = [view_abi("admin_balances", ["uint256"]), view_abi("balances", ["uint256"])]
+    return get_template("CurvePool", abi)
+
+
+def _pool_int128():
+    # older pools use `int128` for coin indexes
+    return get_template("CurvePoolInt128", [view_abi("balances", ["int128"])])
+
+
+def _erc20():
+    return get_template("ERC20", [view_abi("balanceOf", ["address"]), view_abi("decimals")])
+
+
+def _decimals_cache_name() -> str:
+    return f"decimals-{chain.id}.json"
+
+
+def get_decimals(coins: Iterable[str]) -> Dict[str, int]:
+    """Get the decimals of many coins.
+
+    Decimals never change, so results are kept in a persistent cache and
+    only unknown coins are queried - in a single batched read.
+
+    Returns:
+        Dict of {lowercase coin address: decimals}
+    """
+    cache = load_json(_decimals_cache_name(), {})
+    cache[ETH_ADDRESS.lower()] = 18
+
+    coins = set(i.lower() for i in coins)
+    missing = sorted(i for i in coins if i not in cache)
+    if missing:
+        results = batch_call(
+            [(_erc20().decimals, (), coin) for coin in missing], require_success=False
+        )
+        for coin, decimals in zip(missing, results):
+            if decimals is not None:
+                cache[coin] = decimals
+        save_json(_decimals_cache_name(), cache)
+
+    # coins that do not implement `decimals` are assumed to use 18
+    return {coin: cache.get(coin, 18) for coin in coins}
+
+
+def get_admin_balances(pool_list: Dict[str, List[str]]) -> Dict[str, List[float]]:
+    """Get the claimable admin fees for every coin, in every pool.
+
+    All balance reads for every pool, and the decimals of any coin not yet
+    cached, are performed within the same batched read.
+
+    Args:
+        pool_list: Dict of {pool address: [coin addresses]}
+
+    Returns:
+        Dict of {pool address: [admin balance of each coin]}. Balances are
+        given in whole tokens, i.e. already divided by the coin's decimals.
+    """
+    multicall = get_multicall()
+    decimals = get_decimals(coin for coins in pool_list.values() for coin in coins)
+
+    # for each coin we request `admin_balances`, and everything needed to calculate
+    # the admin balance for older pools that do not implement it. whichever call
+    # succeeds is used - this costs calldata, but avoids a round trip per pool.
+    calls = []
+    for pool, coins in pool_list.items():
+        for i, coin in enumerate(coins):
+            if coin.lower() == ETH_ADDRESS.lower():
+                calls.append((multicall.getEthBalance, (pool,)))
+            else:
+                calls.append((_erc20().balanceOf, (pool,), coin))
+            calls += [
+                (_pool().admin_balances, (i,), pool),
+                (_pool().balances, (i,), pool),
+                (_pool_int128().balances, (i,), pool),
+            ]
+    results = iter(batch_call(calls, require_success=False))
+
+    admin_balances = {}
+    for pool, coins in pool_list.items():
+        admin_balances[pool] = []
+        for coin in coins:
+            balance, admin_balance, pool_balance, pool_balance_int128 = [
+                next(results) for _ in range(4)
+            ]
+            if admin_balance is None:
+                if pool_balance is None:
+                    pool_balance = pool_balance_int128
+                if balance is None or pool_balance is None:
+                    admin_balance = 0
+                else:
+                    admin_balance = balance - pool_balance
+
+            admin_balances[pool].append(admin_balance / 10 ** decimals[coin.lower()])
+
+    return admin_balances
+
+
+def get_balances(account: str, coins: List[str]) -> Dict[str, int]:
+    """Get the balance of each coin held by `account`, in a single batched read."""
+    multicall = get_multicall()
+    calls = []
+    for coin in coins:
+        if coin.lower() == ETH_ADDRESS.lower():
+            calls.append((multicall.getEthBalance, (account,)))
+        else:
+            calls.append((_erc20().balanceOf, (account,), coin))
+
+    return {
+        coin: balance or 0 for coin, balance in zip(coins, batch_call(calls, require_success=False))
+    }
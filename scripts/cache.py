@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+from typing import Any
+
+# on-disk caches are kept outside of `build/`, so recompiling never discards them
+CACHE_PATH = Path(".cache")
+
+
+def get_cache_path(name: str) -> Path:
+    """Get the path to a cache file, creating the cache directory if required."""
+    path = CACHE_PATH.joinpath(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_json(name: str, default: Any = None) -> Any:
+    """Load a JSON cache file, returning `default` if it does not exist."""
+    path = get_cache_path(name)
+    if not path.exists():
+        return default
+    with path.open() as fp:
+        return json.load(fp)
+
+
+def save_json(name: str, data: Any) -> None:
+    """Atomically write a JSON cache file."""
+    path = get_cache_path(name)
+    temp_path = path.with_suffix(".tmp")
+    with temp_path.open("w") as fp:
+        json.dump(data, fp)
+    temp_path.replace(path)
+
+
+def load_bytes(name: str) -> bytes:
+    """Load a binary cache file, returning `None` if it does not exist."""
+    path = get_cache_path(name)
+    if not path.exists():
+        return None
+    return path.read_bytes()
+
+
+def save_bytes(name: str, data: bytes) -> None:
+    """Atomically write a binary cache file."""
+    path = get_cache_path(name)
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_bytes(data)
+    temp_path.replace(path)
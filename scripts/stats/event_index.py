@@ -0,0 +1,111 @@
+"""
+Base class for incremental indexes of contract event logs.
+
+Logs for every indexed event are fetched with a single topic filter, in block
+ranges that grow while requests succeed and are split in half when the node
+rejects them. Subclasses decide how decoded logs are stored, and persist
+them after each range so syncing resumes from the last indexed block.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+import requests
+from brownie import Contract, web3
+from hexbytes import HexBytes
+from tqdm import tqdm
+
+# initial and maximum number of blocks queried in one `eth_getLogs` request
+INITIAL_RANGE = 10000
+MAX_RANGE = 500000
+
+# blocks behind the chain head that are not indexed, so reorgs cannot affect the index
+CONFIRMATIONS = 5
+
+
+class EventIndex(ABC):
+    """Incrementally synced index of a contract's event logs.
+
+    Subclasses set `EVENTS` and implement `__len__`, `_process` and `_save`.
+
+    Args:
+        contract: Contract emitting the events
+        last_block: Last block that has already been indexed
+    """
+
+    EVENTS: Tuple[str, ...] = ()
+
+    def __init__(self, contract: Contract, last_block: int) -> None:
+        self.contract = contract
+        self.last_block = last_block
+
+        w3_contract = web3.eth.contract(contract.address, abi=contract.abi)
+        self._topics = [contract.topics[i] for i in self.EVENTS]
+        self._events: Dict[HexBytes, object] = {
+            HexBytes(contract.topics[i]): getattr(w3_contract.events, i)() for i in self.EVENTS
+        }
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def _get_logs(self, start: int, end: int) -> List[dict]:
+        return web3.eth.getLogs(
+            {
+                "address": self.contract.address,
+                "fromBlock": start,
+                "toBlock": end,
+                "topics": [self._topics],
+            }
+        )
+
+    def _decode(self, log: dict):
+        return self._events[HexBytes(log["topics"][0])].processLog(log)
+
+    @abstractmethod
+    def _process(self, logs: List[dict]) -> None:
+        # add the logs of one block range, in the order they were emitted
+        ...
+
+    @abstractmethod
+    def _save(self) -> None:
+        ...
+
+    def sync(self, end_block: int = None, confirmations: int = CONFIRMATIONS) -> int:
+        """Index every event since the last indexed block.
+
+        Args:
+            end_block: Last block to index. Defaults to the chain head, less
+                `confirmations` blocks.
+
+        Returns:
+            Number of new rows
+        """
+        if end_block is None:
+            end_block = web3.eth.blockNumber - confirmations
+        if end_block <= self.last_block:
+            return 0
+
+        count = len(self)
+        block_range = INITIAL_RANGE
+        progress = tqdm(
+            total=end_block - self.last_block, desc=f"Indexing {self.contract._name}", unit="block"
+        )
+        while self.last_block < end_block:
+            start = self.last_block + 1
+            end = min(start + block_range - 1, end_block)
+            try:
+                logs = self._get_logs(start, end)
+            except (ValueError, requests.RequestException):
+                # too many results or a timeout - retry with a smaller range
+                if start == end:
+                    raise
+                block_range = (end - start + 1) // 2
+                continue
+            self._process(logs)
+            self.last_block = end
+            self._save()
+            progress.update(end - start + 1)
+            block_range = min(block_range * 2, MAX_RANGE)
+        progress.close()
+
+        return len(self) - count
@@ -0,0 +1,124 @@
+"""
+Local weekly history of the fees distributed to veCRV holders.
+
+For each week, the store holds `FeeDistributor.tokens_per_week`,
+`FeeDistributor.ve_supply` and the 3pool virtual price at the first block of
+the week. A week is only stored once all of these values are final, so each
+sync fetches just the weeks completed since the previous one.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Sequence, Tuple
+
+from brownie import Contract, chain, web3
+
+from scripts.burners.multicall import batch_call
+from scripts.burners.rpc import MAX_WORKERS, concurrent_batches, request, supports_batching, to_int
+from scripts.cache import load_json, save_json
+
+DISTRIBUTOR = "0xA464e6DCda8AC41e03616F95f4BC98a13b8922Dc"
+TRI_POOL = "0xbEbc44782C7dB0a1A60Cb6fe97d0b483032FF1C7"
+
+WEEK = 86400 * 7
+
+# (tokens_per_week, ve_supply, virtual_price)
+WeekData = Tuple[int, int, int]
+
+
+def _request_all(method: str, params: List[Sequence]) -> List[Any]:
+    # batch where the provider allows it, otherwise make concurrent single requests
+    if supports_batching():
+        return concurrent_batches(method, params)
+    with ThreadPoolExecutor(MAX_WORKERS) as executor:
+        return list(executor.map(lambda k: request(method, k), params))
+
+
+def find_blocks(timestamps: List[int]) -> List[int]:
+    """Find the first block at or after each timestamp.
+
+    All timestamps are searched for at once, so each bisection step is a
+    single batch of `eth_getBlockByNumber` requests.
+    """
+    # invariant: block `low` is before the timestamp, block `high` is at or after it
+    low = [0] * len(timestamps)
+    high = [web3.eth.blockNumber] * len(timestamps)
+    while True:
+        pending = [i for i in range(len(timestamps)) if high[i] - low[i] > 1]
+        if not pending:
+            return high
+        mids = sorted({(low[i] + high[i]) // 2 for i in pending})
+        blocks = _request_all("eth_getBlockByNumber", [(hex(i), False) for i in mids])
+        block_times = dict(zip(mids, (to_int(i["timestamp"]) for i in blocks)))
+        for i in pending:
+            mid = (low[i] + high[i]) // 2
+            if block_times[mid] < timestamps[i]:
+                low[i] = mid
+            else:
+                high[i] = mid
+
+
+class FeeHistory:
+    """Weekly time series of fee distribution data, persisted to disk.
+
+    Args:
+        distributor: `FeeDistributor` contract
+        pool: Pool of the distributed LP token, used to value fees
+    """
+
+    def __init__(self, distributor: Contract, pool: Contract) -> None:
+        self.distributor = distributor
+        self.pool = pool
+        self.cache_name = f"weekly-fees-{chain.id}-{distributor.address}.json"
+        data = load_json(self.cache_name, {"start": None, "weeks": []})
+        self.start: int = data["start"]
+        self.weeks: List[WeekData] = [tuple(i) for i in data["weeks"]]
+
+    def __len__(self) -> int:
+        return len(self.weeks)
+
+    @property
+    def timestamps(self) -> List[int]:
+        """Get the start time of each stored week."""
+        return [self.start + i * WEEK for i in range(len(self))]
+
+    def _final_until(self) -> int:
+        # a week is final once tokens have been checkpointed up to the end of
+        # it, and the veCRV supply at the start of it has been checkpointed
+        last_token_time = self.distributor.last_token_time()
+        return min(last_token_time // WEEK * WEEK, self.distributor.time_cursor())
+
+    def _fetch(self, timestamps: List[int]) -> List[WeekData]:
+        calls = [(self.distributor.tokens_per_week, (i,)) for i in timestamps]
+        calls += [(self.distributor.ve_supply, (i,)) for i in timestamps]
+        values = batch_call(calls)
+
+        call = {"to": self.pool.address, "data": self.pool.get_virtual_price.encode_input()}
+        params = [(call, hex(i)) for i in find_blocks(timestamps)]
+        virtual_prices = [to_int(i) for i in _request_all("eth_call", params)]
+
+        count = len(timestamps)
+        return list(zip(values[:count], values[count:], virtual_prices))
+
+    def sync(self) -> int:
+        """Add every week that has been finalized since the last sync.
+
+        Returns:
+            Number of new weeks
+        """
+        if self.start is None:
+            self.start = self.distributor.start_time()
+
+        final_until = self._final_until()
+        timestamps = list(range(self.start + len(self) * WEEK, final_until, WEEK))
+        if not timestamps:
+            return 0
+
+        self.weeks += self._fetch(timestamps)
+        save_json(self.cache_name, {"start": self.start, "weeks": self.weeks})
+        return len(timestamps)
+
+
+def get_fee_history() -> FeeHistory:
+    """Get the synced fee history of the mainnet `FeeDistributor`."""
+    history = FeeHistory(Contract(DISTRIBUTOR), Contract(TRI_POOL))
+    history.sync()
+    return history
@@ -0,0 +1,206 @@
+"""
+Offline Python model of `FeeDistributor` claims.
+
+The model mirrors `tokens_per_week`, `ve_supply` and the time cursors of
+`contracts/FeeDistributor.vy`, using the same integer math as
+`_checkpoint_token` and `_checkpoint_total_supply`. veCRV balances are read
+from a `VotingEscrowSupply` rebuilt from indexed lock events, which gives
+exactly the values `ve_for_at` and `VotingEscrow.checkpoint` produce.
+
+`_claim` walks at most 50 user points and weeks per call, so a claim for an
+account with a long history has to be repeated. The sum over every call is
+the same as evaluating the user's balance at the start of each week and
+adding `balance * tokens_per_week // ve_supply` for that week. `claimable`
+does this for every holder and week at once, as a single matrix operation:
+
+    model = FeeDistributorModel(supply, start_time, timestamp)
+    model.checkpoint_token(token_balance)
+    model.checkpoint_total_supply()
+    amounts, dust = model.claimable(users)
+"""
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from scripts.stats.ve_model import Revert, _sub
+from scripts.stats.vecrv_supply import VotingEscrowSupply
+
+WEEK = 7 * 86400
+
+# user and week indexes are packed into one sortable int64 key
+KEY_SHIFT = 40
+
+
+class FeeDistributorModel:
+    """State and methods of a `FeeDistributor` deployment.
+
+    Args:
+        voting_escrow: veCRV balances and supply, up to date as of `timestamp`
+        start_time: Epoch time for fee distribution to start
+        timestamp: Timestamp of the deployment block
+    """
+
+    def __init__(self, voting_escrow: VotingEscrowSupply, start_time: int, timestamp: int) -> None:
+        self.voting_escrow = voting_escrow
+        self.timestamp = timestamp
+
+        t = start_time // WEEK * WEEK
+        self.start_time = t
+        self.last_token_time = t
+        self.time_cursor = t
+        self.token_last_balance = 0
+        self.tokens_per_week: Dict[int, int] = {}
+        self.ve_supply: Dict[int, int] = {}
+
+    def set_time(self, timestamp: int) -> None:
+        """Set the block timestamp that subsequent calls are executed at."""
+        self.timestamp = timestamp
+
+    def checkpoint_token(self, token_balance: int) -> int:
+        """Split newly received fees across the weeks since the last checkpoint.
+
+        Args:
+            token_balance: Fee token balance of the distributor
+
+        Returns:
+            Amount of fees distributed
+        """
+        to_distribute = _sub(token_balance, self.token_last_balance)
+        self.token_last_balance = token_balance
+
+        t = self.last_token_time
+        since_last = _sub(self.timestamp, t)
+        self.last_token_time = self.timestamp
+        this_week = t // WEEK * WEEK
+        for _ in range(20):
+            next_week = this_week + WEEK
+            if self.timestamp < next_week:
+                if since_last == 0 and self.timestamp == t:
+                    amount = to_distribute
+                else:
+                    amount = to_distribute * (self.timestamp - t) // since_last
+                self.tokens_per_week[this_week] = self.tokens_per_week.get(this_week, 0) + amount
+                break
+            if since_last == 0 and next_week == t:
+                amount = to_distribute
+            else:
+                amount = to_distribute * (next_week - t) // since_last
+            self.tokens_per_week[this_week] = self.tokens_per_week.get(this_week, 0) + amount
+            t = next_week
+            this_week = next_week
+
+        return to_distribute
+
+    def checkpoint_total_supply(self) -> None:
+        """Record the veCRV supply for up to 20 weeks past `time_cursor`."""
+        rounded_timestamp = self.timestamp // WEEK * WEEK
+        weeks = [self.time_cursor + i * WEEK for i in range(20)]
+        weeks = [i for i in weeks if i <= rounded_timestamp]
+        if not weeks:
+            return
+
+        self.ve_supply.update(zip(weeks, self.voting_escrow.total_supply(weeks).tolist()))
+        self.time_cursor = weeks[-1] + WEEK
+
+    def ve_for_at(self, user: str, timestamp: int) -> int:
+        """Get the veCRV balance for `user` at `timestamp`."""
+        return self.voting_escrow.balance_of(user, [timestamp])[0]
+
+    def claim_weeks(self) -> np.ndarray:
+        """Get the weeks that fees can currently be claimed for."""
+        last_token_time = self.last_token_time // WEEK * WEEK
+        return np.arange(self.start_time, last_token_time, WEEK, dtype=np.int64)
+
+    def claimable_matrix(
+        self, users: Sequence[str], time_cursor_of: Sequence[int] = None
+    ) -> np.ndarray:
+        """Get the fees each user can claim for each week.
+
+        Args:
+            users: Addresses to calculate claims for
+            time_cursor_of: `FeeDistributor.time_cursor_of` for each user, if any
+                fees have already been claimed. Weeks before it are excluded.
+
+        Returns:
+            Object array of shape `(len(users), len(claim_weeks()))`
+        """
+        weeks = self.claim_weeks()
+        claims = np.zeros((len(users), len(weeks)), dtype=object)
+
+        owners, starts, slopes, ends = [], [], [], []
+        for i, user in enumerate(users):
+            for start, slope, end in self.voting_escrow.user_segments.get(user, []):
+                owners.append(i)
+                starts.append(start)
+                slopes.append(slope)
+                ends.append(end)
+        if not owners or not len(weeks):
+            return claims
+        owners = np.array(owners, dtype=np.int64)
+        ends = np.array(ends, dtype=np.int64)
+        slopes = np.array(slopes, dtype=object)
+        positive = (slopes > 0).astype(bool)
+
+        # the last lock change of each user at or before the start of each week
+        keys = owners << KEY_SHIFT | np.array(starts, dtype=np.int64)
+        rows = np.arange(len(users), dtype=np.int64)[:, None]
+        idx = np.searchsorted(keys, rows << KEY_SHIFT | weeks, side="right") - 1
+        active = idx >= 0
+        idx[~active] = 0
+        active &= (owners[idx] == rows) & (ends[idx] > weeks) & positive[idx]
+        if time_cursor_of is not None:
+            active &= weeks >= np.array(time_cursor_of, dtype=np.int64)[:, None]
+
+        row, col = np.nonzero(active)
+        seg = idx[row, col]
+        balance = slopes[seg] * (ends[seg] - weeks[col]).astype(object)
+
+        tokens = np.array([self.tokens_per_week.get(i, 0) for i in weeks.tolist()], dtype=object)
+        ve_supply = np.array([self.ve_supply.get(i, 0) for i in weeks.tolist()], dtype=object)
+        if (ve_supply[col] == 0).astype(bool).any():
+            # `_claim` divides by the supply of every week the user has a balance in
+            raise Revert("division by zero")
+
+        claims[row, col] = balance * tokens[col] // ve_supply[col]
+        return claims
+
+    def claimable(
+        self, users: Sequence[str], time_cursor_of: Sequence[int] = None
+    ) -> Tuple[np.ndarray, int]:
+        """Get the total fees each user receives by calling `claim` until complete.
+
+        Args:
+            users: Addresses to calculate claims for
+            time_cursor_of: `FeeDistributor.time_cursor_of` for each user, if any
+                fees have already been claimed
+
+        Returns:
+            Object array of the amount claimable by each user, and the fees for
+            the claimable weeks that these claims do not pay out
+        """
+        claims = self.claimable_matrix(users, time_cursor_of)
+        tokens = sum(self.tokens_per_week.get(i, 0) for i in self.claim_weeks().tolist())
+        return claims.sum(axis=1), tokens - claims.sum()
+
+    def claim(self, users: Sequence[str], time_cursor_of: Sequence[int] = None) -> np.ndarray:
+        """Pay out fees to each user, as calling `claim` until complete would.
+
+        Mirrors the supply checkpoint `claim` makes once `time_cursor` has
+        passed, and removes the paid fees from `token_last_balance` so later
+        token checkpoints only distribute newly received fees. Call `set_time`
+        with the timestamp of the claim first. The token checkpoint `claim`
+        makes when `can_checkpoint_token` is set is not included.
+
+        Args:
+            users: Addresses claiming fees
+            time_cursor_of: `FeeDistributor.time_cursor_of` for each user, if any
+                fees have already been claimed
+
+        Returns:
+            Object array of the amount paid to each user
+        """
+        if self.timestamp >= self.time_cursor:
+            self.checkpoint_total_supply()
+        amounts = self.claimable_matrix(users, time_cursor_of).sum(axis=1)
+        self.token_last_balance = _sub(self.token_last_balance, int(amounts.sum()))
+        return amounts
@@ -0,0 +1,67 @@
+"""
+Incremental index of GaugeController weight events.
+
+Every event that changes gauge, type or total weights is stored in a single
+JSON cache file, along with the timestamp of the block that emitted it.
+`VoteForGauge` and `NewGaugeWeight` already log the block timestamp - for
+`NewGauge` and `NewTypeWeight` it is fetched from the block.
+"""
+from typing import Dict, List, Tuple
+
+from brownie import Contract, chain, web3
+
+from scripts.cache import load_json, save_json
+from scripts.stats.event_index import EventIndex
+
+EVENTS = ("NewTypeWeight", "NewGauge", "NewGaugeWeight", "VoteForGauge")
+
+# (block, log index, timestamp, event name, event args)
+GaugeEvent = Tuple[int, int, int, str, dict]
+
+
+class GaugeControllerIndex(EventIndex):
+    """Ordered store of GaugeController weight events.
+
+    Args:
+        gauge_controller: `GaugeController` contract
+        start_block: Block to start indexing from, e.g. the deployment block
+    """
+
+    EVENTS = EVENTS
+
+    def __init__(self, gauge_controller: Contract, start_block: int = 0) -> None:
+        self.gauge_controller = gauge_controller
+        self.path = f"gauge-index-{chain.id}-{gauge_controller.address}.json"
+        data = load_json(self.path)
+        if data is None:
+            data = {
+                "last_block": start_block - 1,
+                "start_time": web3.eth.getBlock(start_block).timestamp,
+                "events": [],
+            }
+        super().__init__(gauge_controller, data["last_block"])
+        self.start_time: int = data["start_time"]
+        self.events: List[GaugeEvent] = [tuple(i) for i in data["events"]]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _process(self, logs: List[dict]) -> None:
+        block_times: Dict[int, int] = {}
+        for log in logs:
+            event = self._decode(log)
+            args = dict(event.args)
+            if "time" in args and event.event != "NewTypeWeight":
+                timestamp = args["time"]
+            else:
+                block = log["blockNumber"]
+                if block not in block_times:
+                    block_times[block] = web3.eth.getBlock(block).timestamp
+                timestamp = block_times[block]
+            self.events.append((log["blockNumber"], log["logIndex"], timestamp, event.event, args))
+
+    def _save(self) -> None:
+        save_json(
+            self.path,
+            {"last_block": self.last_block, "start_time": self.start_time, "events": self.events},
+        )
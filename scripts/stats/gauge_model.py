@@ -0,0 +1,601 @@
+"""
+Exact Python model of `GaugeController`.
+
+The model mirrors the storage and integer math of `contracts/GaugeController.vy`:
+`points_weight`, `changes_weight`, `points_sum`, `changes_sum`, `points_total`,
+`points_type_weight` and `vote_user_slopes` are written week by week exactly
+as the contract writes them. Any condition that reverts the contract raises
+`Revert`, with the contract's revert string where it has one, and discards
+every write made by the call.
+
+The block context is set with `set_time` before each call. Votes read the
+voter's slope and lock end from `voting_escrow`, which may be the contract,
+a `VotingEscrowModel` or the `LockedBalances` built while replaying indexed
+events with `replay`.
+
+Once seeded, `relative_weights` gives the relative weight of every gauge for
+any number of weeks in one vectorized pass - the value `gauge_relative_weight`
+returns for that week, assuming no further votes or admin changes.
+"""
+import functools
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from brownie import Contract, web3
+
+from scripts.stats.event_index import CONFIRMATIONS
+from scripts.stats.gauge_index import GaugeControllerIndex
+from scripts.stats.ve_index import WITHDRAW, VotingEscrowIndex
+from scripts.stats.ve_model import Revert, _sub
+from scripts.stats.vecrv_supply import START_BLOCK, VOTING_ESCROW
+
+GAUGE_CONTROLLER = "0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB"
+
+WEEK = 7 * 86400
+MAXTIME = 4 * 365 * 86400
+WEIGHT_VOTE_DELAY = 10 * 86400
+MULTIPLIER = 10 ** 18
+
+# (bias, slope)
+Point = Tuple[int, int]
+EMPTY_POINT: Point = (0, 0)
+
+# (slope, power, end)
+VotedSlope = Tuple[int, int, int]
+
+_MISSING = object()
+
+
+def _project(
+    points: List[Dict[int, Point]], changes: List[Dict[int, int]], last: List[int], grid: np.ndarray
+) -> np.ndarray:
+    """Get the bias of several decaying points at each week of `grid`.
+
+    Weeks up to `last` hold the stored bias. Later weeks are filled the way
+    `_get_weight` and `_get_sum` fill them, for all points at once.
+
+    Args:
+        points: Points of each series, by week
+        changes: Scheduled slope changes of each series, by week
+        last: Last filled week of each series
+        grid: Consecutive weeks
+
+    Returns:
+        Object array of biases, with one row per series
+    """
+    n, m = len(points), len(grid)
+    columns = {t: i for i, t in enumerate(grid.tolist())}
+    step = grid[None, :] > np.array(last, dtype=np.int64).reshape(n, 1)
+
+    bias = np.zeros(n, dtype=object)
+    slope = np.zeros(n, dtype=object)
+    stored = np.zeros((n, m), dtype=object)
+    d_slope = np.zeros((n, m), dtype=object)
+    for i in range(n):
+        bias[i], slope[i] = points[i].get(last[i], EMPTY_POINT)
+        for t, point in points[i].items():
+            if t <= last[i] and t in columns:
+                stored[i, columns[t]] = point[0]
+        for t, value in changes[i].items():
+            if t > last[i] and t in columns:
+                d_slope[i, columns[t]] = value
+
+    # slope going into each weekly step, and the bias after it
+    slopes = slope.reshape(n, 1) - (np.cumsum(d_slope, axis=1) - d_slope)
+    biases = bias.reshape(n, 1) - WEEK * np.cumsum(np.where(step, slopes, 0), axis=1)
+    # a point stays at zero once its bias has run out
+    alive = np.logical_and.accumulate(~step | (biases > 0).astype(bool), axis=1)
+
+    return np.where(step, np.where(alive, biases, 0), stored)
+
+
+def _atomic(fn: Callable) -> Callable:
+    # undo every write made by a call that reverts, as the EVM would
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if self._journal is not None:
+            return fn(self, *args, **kwargs)
+        self._journal = []
+        try:
+            return fn(self, *args, **kwargs)
+        except Revert:
+            for mapping, key, value in reversed(self._journal):
+                if value is _MISSING:
+                    del mapping[key]
+                else:
+                    mapping[key] = value
+            raise
+        finally:
+            self._journal = None
+
+    return wrapper
+
+
+class GaugeControllerModel:
+    """State and methods of a `GaugeController` deployment.
+
+    Admin checks are not modelled.
+
+    Args:
+        voting_escrow: Object providing `get_last_user_slope` and `locked__end`
+        timestamp: Timestamp of the deployment block
+    """
+
+    def __init__(self, voting_escrow, timestamp: int) -> None:
+        self.voting_escrow = voting_escrow
+        self.timestamp = timestamp
+
+        self.n_gauge_types = 0
+        self.gauges: List[str] = []
+        self.gauge_type_names: Dict[int, str] = {}
+        self.gauge_types_: Dict[str, int] = {}
+
+        self.vote_user_slopes: Dict[str, Dict[str, VotedSlope]] = {}
+        self.vote_user_power: Dict[str, int] = {}
+        self.last_user_vote: Dict[str, Dict[str, int]] = {}
+
+        self.points_weight: Dict[str, Dict[int, Point]] = {}
+        self.changes_weight: Dict[str, Dict[int, int]] = {}
+        self.time_weight: Dict[str, int] = {}
+
+        self.points_sum: Dict[int, Dict[int, Point]] = {}
+        self.changes_sum: Dict[int, Dict[int, int]] = {}
+        self.time_sum: Dict[int, int] = {}
+
+        self.points_total: Dict[int, int] = {}
+        self.time_total = timestamp // WEEK * WEEK
+
+        self.points_type_weight: Dict[int, Dict[int, int]] = {}
+        self.time_type_weight: Dict[int, int] = {}
+
+        self._journal: List[Tuple[dict, object, object]] = None
+
+    @property
+    def n_gauges(self) -> int:
+        return len(self.gauges)
+
+    def set_time(self, timestamp: int) -> None:
+        """Set the block timestamp that subsequent calls are executed at."""
+        self.timestamp = timestamp
+
+    def _set(self, mapping: dict, key, value) -> None:
+        # journal every write, so it can be undone if the call reverts
+        if self._journal is not None:
+            self._journal.append((mapping, key, mapping.get(key, _MISSING)))
+        mapping[key] = value
+
+    def _set_bias(self, points: Dict[int, Point], t: int, bias: int) -> None:
+        # write `points[t].bias`, keeping the slope
+        self._set(points, t, (bias, points.get(t, EMPTY_POINT)[1]))
+
+    def _next_time(self) -> int:
+        return (self.timestamp + WEEK) // WEEK * WEEK
+
+    def _fill(self, points: Dict[int, Point], changes: Dict[int, int], t: int) -> Tuple[int, int]:
+        # shared loop of `_get_sum` and `_get_weight`, returns the bias and last filled week
+        bias, slope = points.get(t, EMPTY_POINT)
+        for _ in range(500):
+            if t > self.timestamp:
+                break
+            t += WEEK
+            d_bias = slope * WEEK
+            if bias > d_bias:
+                bias -= d_bias
+                slope = _sub(slope, changes.get(t, 0))
+            else:
+                bias = slope = 0
+            self._set(points, t, (bias, slope))
+        return bias, t
+
+    def _get_type_weight(self, gauge_type: int) -> int:
+        t = self.time_type_weight.get(gauge_type, 0)
+        if t == 0:
+            return 0
+        weights = self.points_type_weight.setdefault(gauge_type, {})
+        w = weights.get(t, 0)
+        for _ in range(500):
+            if t > self.timestamp:
+                break
+            t += WEEK
+            self._set(weights, t, w)
+        if t > self.timestamp:
+            self._set(self.time_type_weight, gauge_type, t)
+        return w
+
+    def _get_sum(self, gauge_type: int) -> int:
+        t = self.time_sum.get(gauge_type, 0)
+        if t == 0:
+            return 0
+        points = self.points_sum.setdefault(gauge_type, {})
+        bias, t = self._fill(points, self.changes_sum.get(gauge_type, {}), t)
+        if t > self.timestamp:
+            self._set(self.time_sum, gauge_type, t)
+        return bias
+
+    def _get_total(self) -> int:
+        t = self.time_total
+        n_types = min(self.n_gauge_types, 100)
+        if t > self.timestamp:
+            # If we have already checkpointed - still need to change the value
+            t -= WEEK
+        pt = self.points_total.get(t, 0)
+        for gauge_type in range(n_types):
+            self._get_sum(gauge_type)
+            self._get_type_weight(gauge_type)
+        for _ in range(500):
+            if t > self.timestamp:
+                break
+            t += WEEK
+            pt = 0
+            for gauge_type in range(n_types):
+                type_sum = self.points_sum.get(gauge_type, {}).get(t, EMPTY_POINT)[0]
+                type_weight = self.points_type_weight.get(gauge_type, {}).get(t, 0)
+                pt += type_sum * type_weight
+            self._set(self.points_total, t, pt)
+            if t > self.timestamp:
+                self._set(self.__dict__, "time_total", t)
+        return pt
+
+    def _get_weight(self, gauge_addr: str) -> int:
+        t = self.time_weight.get(gauge_addr, 0)
+        if t == 0:
+            return 0
+        points = self.points_weight.setdefault(gauge_addr, {})
+        bias, t = self._fill(points, self.changes_weight.get(gauge_addr, {}), t)
+        if t > self.timestamp:
+            self._set(self.time_weight, gauge_addr, t)
+        return bias
+
+    def gauge_types(self, addr: str) -> int:
+        gauge_type = self.gauge_types_.get(addr, 0)
+        if gauge_type == 0:
+            raise Revert("gauge not added")
+        return gauge_type - 1
+
+    @_atomic
+    def add_gauge(self, addr: str, gauge_type: int, weight: int = 0) -> None:
+        if not 0 <= gauge_type < self.n_gauge_types:
+            raise Revert("invalid gauge type")
+        if self.gauge_types_.get(addr, 0) != 0:
+            raise Revert("dev: cannot add the same gauge twice")
+
+        self._set(self.gauge_types_, addr, gauge_type + 1)
+        next_time = self._next_time()
+
+        if weight > 0:
+            _type_weight = self._get_type_weight(gauge_type)
+            _old_sum = self._get_sum(gauge_type)
+            _old_total = self._get_total()
+
+            points_sum = self.points_sum.setdefault(gauge_type, {})
+            self._set_bias(points_sum, next_time, weight + _old_sum)
+            self._set(self.time_sum, gauge_type, next_time)
+            self._set(self.points_total, next_time, _old_total + _type_weight * weight)
+            self._set(self.__dict__, "time_total", next_time)
+
+            points_weight = self.points_weight.setdefault(addr, {})
+            self._set_bias(points_weight, next_time, weight)
+
+        if self.time_sum.get(gauge_type, 0) == 0:
+            self._set(self.time_sum, gauge_type, next_time)
+        self._set(self.time_weight, addr, next_time)
+        # appended last, as nothing can revert after it
+        self.gauges.append(addr)
+
+    @_atomic
+    def checkpoint(self) -> None:
+        self._get_total()
+
+    @_atomic
+    def checkpoint_gauge(self, addr: str) -> None:
+        self._get_weight(addr)
+        self._get_total()
+
+    def gauge_relative_weight(self, addr: str, time: int = None) -> int:
+        if time is None:
+            time = self.timestamp
+        t = time // WEEK * WEEK
+        _total_weight = self.points_total.get(t, 0)
+        if _total_weight == 0:
+            return 0
+        gauge_type = self.gauge_types_.get(addr, 0) - 1
+        _type_weight = self.points_type_weight.get(gauge_type, {}).get(t, 0)
+        _gauge_weight = self.points_weight.get(addr, {}).get(t, EMPTY_POINT)[0]
+        return MULTIPLIER * _type_weight * _gauge_weight // _total_weight
+
+    @_atomic
+    def gauge_relative_weight_write(self, addr: str, time: int = None) -> int:
+        self._get_weight(addr)
+        self._get_total()
+        return self.gauge_relative_weight(addr, time)
+
+    def _change_type_weight(self, type_id: int, weight: int) -> None:
+        old_weight = self._get_type_weight(type_id)
+        old_sum = self._get_sum(type_id)
+        _total_weight = self._get_total()
+        next_time = self._next_time()
+
+        _total_weight = _sub(_total_weight + old_sum * weight, old_sum * old_weight)
+        self._set(self.points_total, next_time, _total_weight)
+        self._set(self.points_type_weight.setdefault(type_id, {}), next_time, weight)
+        self._set(self.__dict__, "time_total", next_time)
+        self._set(self.time_type_weight, type_id, next_time)
+
+    @_atomic
+    def add_type(self, name: str, weight: int = 0) -> None:
+        type_id = self.n_gauge_types
+        self._set(self.gauge_type_names, type_id, name)
+        self._set(self.__dict__, "n_gauge_types", type_id + 1)
+        if weight != 0:
+            self._change_type_weight(type_id, weight)
+
+    @_atomic
+    def change_type_weight(self, type_id: int, weight: int) -> None:
+        self._change_type_weight(type_id, weight)
+
+    @_atomic
+    def change_gauge_weight(self, addr: str, weight: int) -> None:
+        gauge_type = self.gauge_types_.get(addr, 0) - 1
+        if gauge_type < 0:
+            # `time_type_weight[-1]` is out of bounds
+            raise Revert("gauge not added")
+        old_gauge_weight = self._get_weight(addr)
+        type_weight = self._get_type_weight(gauge_type)
+        old_sum = self._get_sum(gauge_type)
+        _total_weight = self._get_total()
+        next_time = self._next_time()
+        new_sum = _sub(old_sum + weight, old_gauge_weight)
+        _total_weight = _sub(_total_weight + new_sum * type_weight, old_sum * type_weight)
+
+        points_weight = self.points_weight.setdefault(addr, {})
+        self._set_bias(points_weight, next_time, weight)
+        self._set(self.time_weight, addr, next_time)
+
+        points_sum = self.points_sum.setdefault(gauge_type, {})
+        self._set_bias(points_sum, next_time, new_sum)
+        self._set(self.time_sum, gauge_type, next_time)
+
+        self._set(self.points_total, next_time, _total_weight)
+        self._set(self.__dict__, "time_total", next_time)
+
+    @_atomic
+    def vote_for_gauge_weights(self, user: str, _gauge_addr: str, _user_weight: int) -> None:
+        slope = self.voting_escrow.get_last_user_slope(user)
+        lock_end = self.voting_escrow.locked__end(user)
+        next_time = self._next_time()
+        if lock_end <= next_time:
+            raise Revert("Your token lock expires too soon")
+        if not 0 <= _user_weight <= 10000:
+            raise Revert("You used all your voting power")
+        last_vote = self.last_user_vote.get(user, {}).get(_gauge_addr, 0)
+        if self.timestamp < last_vote + WEIGHT_VOTE_DELAY:
+            raise Revert("Cannot vote so often")
+        gauge_type = self.gauge_types_.get(_gauge_addr, 0) - 1
+        if gauge_type < 0:
+            raise Revert("Gauge not added")
+
+        # Prepare slopes and biases
+        old_slope, old_power, old_end = self.vote_user_slopes.get(user, {}).get(
+            _gauge_addr, (0, 0, 0)
+        )
+        old_dt = old_end - next_time if old_end > next_time else 0
+        old_bias = old_slope * old_dt
+        new_slope = slope * _user_weight // 10000
+        new_bias = new_slope * (lock_end - next_time)
+
+        # Check powers (weights) used before any state is written
+        power_used = _sub(self.vote_user_power.get(user, 0) + _user_weight, old_power)
+        if power_used > 10000:
+            raise Revert("Used too much power")
+        self._set(self.vote_user_power, user, power_used)
+
+        # Remove old and schedule new slope changes
+        old_weight_bias = self._get_weight(_gauge_addr)
+        points_weight = self.points_weight.setdefault(_gauge_addr, {})
+        old_weight_slope = points_weight.get(next_time, EMPTY_POINT)[1]
+        old_sum_bias = self._get_sum(gauge_type)
+        points_sum = self.points_sum.setdefault(gauge_type, {})
+        old_sum_slope = points_sum.get(next_time, EMPTY_POINT)[1]
+
+        weight_bias = max(old_weight_bias + new_bias, old_bias) - old_bias
+        sum_bias = max(old_sum_bias + new_bias, old_bias) - old_bias
+        if old_end > next_time:
+            weight_slope = max(old_weight_slope + new_slope, old_slope) - old_slope
+            sum_slope = max(old_sum_slope + new_slope, old_slope) - old_slope
+        else:
+            weight_slope = old_weight_slope + new_slope
+            sum_slope = old_sum_slope + new_slope
+        self._set(points_weight, next_time, (weight_bias, weight_slope))
+        self._set(points_sum, next_time, (sum_bias, sum_slope))
+
+        changes_weight = self.changes_weight.setdefault(_gauge_addr, {})
+        changes_sum = self.changes_sum.setdefault(gauge_type, {})
+        if old_end > self.timestamp:
+            # Cancel old slope changes if they still didn't happen
+            self._set(changes_weight, old_end, _sub(changes_weight.get(old_end, 0), old_slope))
+            self._set(changes_sum, old_end, _sub(changes_sum.get(old_end, 0), old_slope))
+        self._set(changes_weight, lock_end, changes_weight.get(lock_end, 0) + new_slope)
+        self._set(changes_sum, lock_end, changes_sum.get(lock_end, 0) + new_slope)
+
+        self._get_total()
+
+        new_voted_slope = (new_slope, _user_weight, lock_end)
+        self._set(self.vote_user_slopes.setdefault(user, {}), _gauge_addr, new_voted_slope)
+        self._set(self.last_user_vote.setdefault(user, {}), _gauge_addr, self.timestamp)
+
+    def get_gauge_weight(self, addr: str) -> int:
+        t = self.time_weight.get(addr, 0)
+        return self.points_weight.get(addr, {}).get(t, EMPTY_POINT)[0]
+
+    def get_type_weight(self, type_id: int) -> int:
+        return self.points_type_weight.get(type_id, {}).get(
+            self.time_type_weight.get(type_id, 0), 0
+        )
+
+    def get_total_weight(self) -> int:
+        return self.points_total.get(self.time_total, 0)
+
+    def get_weights_sum_per_type(self, type_id: int) -> int:
+        t = self.time_sum.get(type_id, 0)
+        return self.points_sum.get(type_id, {}).get(t, EMPTY_POINT)[0]
+
+    def relative_weights(self, weeks: Sequence[int]) -> np.ndarray:
+        """Get the relative weight of every gauge at each of `weeks`.
+
+        Past weeks give the value `gauge_relative_weight` currently returns.
+        Weeks that have not been filled yet give the value it will return once
+        the week is checkpointed, if there are no further votes or admin
+        changes before then.
+
+        Args:
+            weeks: Timestamps, rounded down to the start of their week
+
+        Returns:
+            Object array of relative weights normalized to 1e18, with one row
+            per gauge in the order of `gauges`
+        """
+        weeks = np.asarray(weeks, dtype=np.int64) // WEEK * WEEK
+        types = range(self.n_gauge_types)
+        gauge_last = [self.time_weight.get(i, 0) for i in self.gauges]
+        sum_last = [self.time_sum.get(i, 0) for i in types]
+        type_last = [self.time_type_weight.get(i, 0) for i in types]
+
+        start = min([i for i in gauge_last + sum_last + type_last if i > 0] + [weeks.min()])
+        grid = np.arange(start, weeks.max() + WEEK, WEEK, dtype=np.int64)
+
+        # type weights stay constant after the last change
+        type_weights = np.zeros((len(types), len(grid)), dtype=object)
+        for i, last in zip(types, type_last):
+            history = self.points_type_weight.get(i, {})
+            type_weights[i] = [
+                history.get(t, 0) if t <= last else history.get(last, 0) for t in grid
+            ]
+
+        sums = _project(
+            [self.points_sum.get(i, {}) for i in types],
+            [self.changes_sum.get(i, {}) for i in types],
+            sum_last,
+            grid,
+        )
+        total = np.where(
+            grid <= self.time_total,
+            np.array([self.points_total.get(t, 0) for t in grid.tolist()], dtype=object),
+            (sums * type_weights).sum(axis=0),
+        )
+
+        weights = _project(
+            [self.points_weight.get(i, {}) for i in self.gauges],
+            [self.changes_weight.get(i, {}) for i in self.gauges],
+            gauge_last,
+            grid,
+        )
+        gauge_types = [self.gauge_types_[i] - 1 for i in self.gauges]
+        has_total = (total > 0).astype(bool)
+        relative = np.where(
+            has_total,
+            MULTIPLIER * type_weights[gauge_types] * weights // np.where(has_total, total, 1),
+            0,
+        )
+
+        return relative[:, (weeks - start) // WEEK]
+
+
+class LockedBalances:
+    """`VotingEscrow` lock state, rebuilt from indexed lock changes.
+
+    Provides the two views that `vote_for_gauge_weights` reads from the escrow.
+    """
+
+    def __init__(self) -> None:
+        self.locked: Dict[str, Tuple[int, int]] = {}
+
+    def apply(self, provider: str, kind: int, value: int, locktime: int) -> None:
+        if kind == WITHDRAW:
+            self.locked[provider] = (0, 0)
+        else:
+            amount = self.locked.get(provider, (0, 0))[0]
+            self.locked[provider] = (amount + value, locktime)
+
+    def get_last_user_slope(self, addr: str) -> int:
+        # the last user point is only written while the lock is active
+        return self.locked.get(addr, (0, 0))[0] // MAXTIME
+
+    def locked__end(self, addr: str) -> int:
+        return self.locked.get(addr, (0, 0))[1]
+
+
+def _add_types(model: GaugeControllerModel, type_id: int) -> None:
+    # `add_type` without a weight emits no event, so types are added when first used
+    while model.n_gauge_types <= type_id:
+        model.add_type("")
+
+
+def replay(gauge_index: GaugeControllerIndex, ve_index: VotingEscrowIndex) -> GaugeControllerModel:
+    """Build a model from indexed GaugeController and VotingEscrow events.
+
+    Lock changes and gauge events are merged in the order they were emitted,
+    so each vote reads the voter's lock as it was at the time. Events are
+    replayed up to the last block covered by both indexes.
+    """
+    locks = LockedBalances()
+    model = GaugeControllerModel(locks, gauge_index.start_time)
+    end_block = min(gauge_index.last_block, ve_index.last_block)
+
+    lock_rows = zip(
+        ve_index["block"].tolist(),
+        ve_index["log_index"].tolist(),
+        [ve_index.providers[i] for i in ve_index["provider"]],
+        ve_index["kind"].tolist(),
+        ve_index["value"].tolist(),
+        ve_index["locktime"].tolist(),
+    )
+    row = next(lock_rows, None)
+
+    for block, log_index, timestamp, name, args in gauge_index.events:
+        if block > end_block:
+            break
+        while row is not None and row[:2] < (block, log_index):
+            locks.apply(*row[2:])
+            row = next(lock_rows, None)
+
+        model.set_time(timestamp)
+        if name == "VoteForGauge":
+            model.vote_for_gauge_weights(args["user"], args["gauge_addr"], args["weight"])
+        elif name == "NewGauge":
+            _add_types(model, args["gauge_type"])
+            model.add_gauge(args["addr"], args["gauge_type"], args["weight"])
+        elif name == "NewGaugeWeight":
+            model.change_gauge_weight(args["gauge_address"], args["weight"])
+        elif name == "NewTypeWeight":
+            _add_types(model, args["type_id"])
+            model.change_type_weight(args["type_id"], args["weight"])
+
+    return model
+
+
+def get_gauge_model(
+    gauge_controller: Contract = None, voting_escrow: Contract = None
+) -> GaugeControllerModel:
+    """Sync the local event indexes and replay them into a model."""
+    if gauge_controller is None:
+        gauge_controller = Contract(GAUGE_CONTROLLER)
+    if voting_escrow is None:
+        voting_escrow = Contract(VOTING_ESCROW)
+
+    end_block = web3.eth.blockNumber - CONFIRMATIONS
+    gauge_index = GaugeControllerIndex(gauge_controller, START_BLOCK)
+    gauge_index.sync(end_block)
+    ve_index = VotingEscrowIndex(voting_escrow, START_BLOCK)
+    ve_index.sync(end_block)
+
+    return replay(gauge_index, ve_index)
+
+
+def main(weeks: int = 4):
+    model = get_gauge_model()
+    start = web3.eth.getBlock("latest").timestamp // WEEK * WEEK
+    relative = model.relative_weights([start + i * WEEK for i in range(weeks + 1)])
+
+    print(f"{'gauge':44}" + "".join(f"{f'week +{i}':>10}" for i in range(weeks + 1)))
+    for gauge, row in sorted(zip(model.gauges, relative), key=lambda k: -k[1][0]):
+        print(f"{gauge:44}" + "".join(f"{i / 1e16:>9.2f}%" for i in row))
@@ -1,47 +1,127 @@
+"""
+Gini coefficient of veCRV balances over time.
+
+Balances of every holder are fetched from the subgraph, paginating by id.
+Snapshots at past blocks never change, so each one is saved to `.cache/`
+after the first fetch. Run with `offline=True` to only use cached snapshots,
+e.g. `brownie run stats/gini main 50 8 True`.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 import numpy as np
 import pylab
 import requests
 from brownie import web3
 
+from scripts.cache import get_cache_path, load_json, save_json
+
 START_BLOCK = 10647813 + 86400
 graph_url = "https://api.thegraph.com/subgraphs/name/pengiundev/curve-votingescrow3"
-query = {
-    "query": """query ($block: Int!, $first: Int!, $skip: Int!) {\n  userBalances(orderBy: weight, orderDirection: desc, first: $first, skip: $skip, block: {number: $block}) {\n    id\n    startTx\n    user\n    CRVLocked\n lock_start\n    unlock_time\n    weight\n    __typename\n  }\n}\n""",  # noqa
-    "variables": {"block": None, "first": 1000, "skip": 0},
-}
-
-
-def gini(x):
-    # from https://stackoverflow.com/questions/39512260/calculating-gini-coefficient-in-python-numpy
-    # (Warning: This is a concise implementation, but it is O(n**2)
-    # in time and memory, where n = len(x).  *Don't* pass in huge
-    # samples!)
-
-    # Mean absolute difference
-    mad = np.abs(np.subtract.outer(x, x)).mean()
-    # Relative mean absolute difference
-    rmad = mad / np.mean(x)
-    # Gini coefficient
-    g = 0.5 * rmad
-    return g
-
-
-def main():
-    current_block = web3.eth.blockNumber
-    blocks = np.linspace(START_BLOCK, current_block, 50)
-    ginis = []
-    for block in blocks:
-        query["variables"]["block"] = int(block)
-        while True:
-            try:
-                resp = requests.post(graph_url, json=query).json()
-                weights = [int(u["weight"]) / 1e18 for u in resp["data"]["userBalances"]]
-            except KeyError:
-                print("Error")
-                continue
-            break
-        ginis.append(gini(weights))
-        print(block, ginis[-1])
+query = """query ($block: Int!, $first: Int!, $lastId: String!) {
+  userBalances(orderBy: id, first: $first, where: {id_gt: $lastId}, block: {number: $block}) {
+    id
+    weight
+  }
+}"""
+
+# maximum number of entities the subgraph returns per query
+PAGE_SIZE = 1000
+# number of times a failed page request is retried
+MAX_RETRIES = 5
+# number of snapshots fetched concurrently
+MAX_WORKERS = 8
+# cache directory for holder snapshots, one file per block
+SNAPSHOT_PATH = "vecrv-weights"
+
+
+def gini(x) -> float:
+    """Calculate the Gini coefficient of a sample.
+
+    Uses the sorted form `sum((2i - n - 1) * x_i) / (n * sum(x))`, which is
+    O(n log n) in time and O(n) in memory.
+    """
+    x = np.sort(np.asarray(x, dtype=np.float64))
+    n = len(x)
+    total = x.sum()
+    if n == 0 or total == 0:
+        return 0.0
+
+    index = np.arange(1, n + 1)
+    return float(np.sum((2 * index - n - 1) * x) / (n * total))
+
+
+def _fetch_page(block: int, last_id: str) -> List[dict]:
+    variables = {"block": block, "first": PAGE_SIZE, "lastId": last_id}
+    for i in range(MAX_RETRIES):
+        try:
+            resp = requests.post(graph_url, json={"query": query, "variables": variables}).json()
+        except (ValueError, requests.RequestException):
+            time.sleep(2 ** i)
+            continue
+        # the subgraph rejected the query, e.g. the block is not indexed
+        if resp.get("errors"):
+            messages = "; ".join(str(err.get("message", err)) for err in resp["errors"])
+            raise ValueError(f"Unable to fetch balances at block {block}: {messages}")
+        try:
+            return resp["data"]["userBalances"]
+        except (KeyError, TypeError):
+            time.sleep(2 ** i)
+    raise ValueError(f"Unable to fetch balances at block {block}")
+
+
+def fetch_weights(block: int) -> List[str]:
+    """Fetch the veCRV weight of every holder at a block."""
+    weights = []
+    last_id = ""
+    while True:
+        page = _fetch_page(block, last_id)
+        weights += [i["weight"] for i in page]
+        if len(page) < PAGE_SIZE:
+            return weights
+        last_id = page[-1]["id"]
+
+
+def get_weights(block: int, offline: bool = False) -> np.ndarray:
+    """Get the veCRV weight of every holder at a block, using the local snapshot if available.
+
+    Raises:
+        FileNotFoundError: if `offline` is set and there is no local snapshot
+    """
+    cache_name = f"{SNAPSHOT_PATH}/{block}.json"
+    weights = load_json(cache_name)
+    if weights is None:
+        if offline:
+            raise FileNotFoundError(f"No local snapshot for block {block}")
+        weights = fetch_weights(block)
+        save_json(cache_name, weights)
+
+    return np.array([int(i) for i in weights], dtype=np.float64) / 1e18
+
+
+def cached_blocks() -> List[int]:
+    """Get the blocks that have a local snapshot."""
+    path = get_cache_path(SNAPSHOT_PATH)
+    return sorted(int(i.stem) for i in path.glob("*.json"))
+
+
+def compute_ginis(blocks: List[int], workers: int = MAX_WORKERS, offline: bool = False):
+    """Calculate the Gini coefficient at each block, fetching snapshots in parallel."""
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(lambda block: gini(get_weights(block, offline)), blocks))
+
+
+def main(snapshots: int = 50, workers: int = MAX_WORKERS, offline: bool = False):
+    if offline:
+        blocks = cached_blocks()
+    else:
+        current_block = web3.eth.blockNumber
+        blocks = [int(i) for i in np.linspace(START_BLOCK, current_block, snapshots)]
+
+    ginis = compute_ginis(blocks, workers, offline)
+    for block, value in zip(blocks, ginis):
+        print(block, value)
 
     pylab.plot(blocks, ginis)
     pylab.title("Gini coefficient")
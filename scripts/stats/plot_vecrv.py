@@ -1,17 +1,19 @@
+from datetime import datetime
+
 import numpy as np
 import pylab
-from brownie import Contract, web3
+from brownie import chain
 
-START_BLOCK = 10647813
+from scripts.stats.vecrv_supply import VotingEscrowSupply, get_lock_events
 
 
-def main():
-    vecrv = Contract("0x5f3b5DfEb7B28CDbD7FAba78963EE202a494e2A2")
-    current_block = web3.eth.blockNumber
-    blocks = np.linspace(START_BLOCK, current_block, 100)
-    powers = [vecrv.totalSupplyAt(int(block)) / 1e18 for block in blocks]
+def main(points: int = 1000):
+    events = get_lock_events()
+    supply = VotingEscrowSupply(events)
+    timestamps = np.linspace(events[0][0], chain.time(), points).astype(np.int64)
+    powers = supply.total_supply(timestamps) / 1e18
 
-    pylab.plot(blocks, powers)
-    pylab.xlabel("Block number")
+    pylab.plot([datetime.fromtimestamp(i) for i in timestamps], powers)
+    pylab.xlabel("Date")
     pylab.ylabel("Total veCRV")
     pylab.show()
@@ -0,0 +1,157 @@
+"""
+Incremental index of VotingEscrow lock events.
+
+`Deposit`, `Withdraw` and `Supply` logs are fetched with a single topic
+filter, in block ranges that grow while requests succeed and are split in
+half when the node rejects them. Each `Supply` log is merged into the lock
+change that emitted it, and the result is stored as one NumPy column file
+per field under `.cache/`. Syncing resumes from the last indexed block.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+from brownie import Contract, chain
+
+from scripts.cache import get_cache_path, load_json, save_json
+from scripts.stats.event_index import EventIndex
+
+EVENTS = ("Deposit", "Withdraw", "Supply")
+
+DEPOSIT = 0
+WITHDRAW = 1
+
+# (column name, dtype) - 128 bit amounts are split into `_hi` and `_lo` words
+COLUMNS = [
+    ("block", np.uint64),
+    ("log_index", np.uint32),
+    ("ts", np.uint64),
+    ("kind", np.uint8),
+    ("provider", np.uint32),
+    ("value_hi", np.uint64),
+    ("value_lo", np.uint64),
+    ("locktime", np.uint64),
+    ("supply_hi", np.uint64),
+    ("supply_lo", np.uint64),
+]
+
+# block, log_index, ts, kind, provider, value, locktime, supply
+Row = List[int]
+
+
+def _split(values: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    hi = np.array([i >> 64 for i in values], dtype=np.uint64)
+    lo = np.array([i & (2 ** 64 - 1) for i in values], dtype=np.uint64)
+    return hi, lo
+
+
+def _join(hi: np.ndarray, lo: np.ndarray) -> np.ndarray:
+    return np.array([int(a) << 64 | int(b) for a, b in zip(hi, lo)], dtype=object)
+
+
+class VotingEscrowIndex(EventIndex):
+    """Columnar store of VotingEscrow lock changes.
+
+    Each row is one `Deposit` or `Withdraw`, along with the locked CRV supply
+    after it from the matching `Supply` log. Providers are stored as indexes
+    into `providers`.
+
+    Args:
+        voting_escrow: `VotingEscrow` contract
+        start_block: Block to start indexing from, e.g. the deployment block
+    """
+
+    EVENTS = EVENTS
+
+    def __init__(self, voting_escrow: Contract, start_block: int = 0) -> None:
+        self.voting_escrow = voting_escrow
+        self.path = f"ve-index-{chain.id}-{voting_escrow.address}"
+        meta = load_json(
+            f"{self.path}/meta.json", {"last_block": start_block - 1, "rows": 0, "providers": []}
+        )
+        super().__init__(voting_escrow, meta["last_block"])
+        self.providers: List[str] = meta["providers"]
+        self._provider_ids = {k: i for i, k in enumerate(self.providers)}
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, dtype in COLUMNS:
+            path = get_cache_path(f"{self.path}/{name}.npy")
+            values = np.load(path) if meta["rows"] else np.zeros(0, dtype=dtype)
+            # columns are written before the metadata, so they may hold extra rows
+            self.columns[name] = values[: meta["rows"]]
+
+    def __len__(self) -> int:
+        return len(self.columns["block"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in ("value", "supply"):
+            return _join(self.columns[f"{name}_hi"], self.columns[f"{name}_lo"])
+        return self.columns[name]
+
+    def _to_rows(self, logs: List[dict]) -> List[Row]:
+        rows = []
+        for log in logs:
+            event = self._decode(log)
+            args = event.args
+            if event.event == "Supply":
+                rows[-1][-1] = args.supply
+                continue
+
+            provider = args.provider
+            if provider not in self._provider_ids:
+                self._provider_ids[provider] = len(self.providers)
+                self.providers.append(provider)
+            kind, locktime = (DEPOSIT, args.locktime) if event.event == "Deposit" else (WITHDRAW, 0)
+            rows.append(
+                [
+                    log["blockNumber"],
+                    log["logIndex"],
+                    args.ts,
+                    kind,
+                    self._provider_ids[provider],
+                    args.value,
+                    locktime,
+                    0,
+                ]
+            )
+        return rows
+
+    def _append(self, rows: List[Row]) -> None:
+        if not rows:
+            return
+        block, log_index, ts, kind, provider, value, locktime, supply = zip(*rows)
+        values = dict(
+            block=block, log_index=log_index, ts=ts, kind=kind, provider=provider, locktime=locktime
+        )
+        values["value_hi"], values["value_lo"] = _split(value)
+        values["supply_hi"], values["supply_lo"] = _split(supply)
+        for name, dtype in COLUMNS:
+            new = np.asarray(values[name], dtype=dtype)
+            self.columns[name] = np.concatenate([self.columns[name], new])
+
+    def _save(self) -> None:
+        for name, _ in COLUMNS:
+            path = get_cache_path(f"{self.path}/{name}.npy")
+            temp_path = path.with_suffix(".tmp.npy")
+            np.save(temp_path, self.columns[name])
+            temp_path.replace(path)
+        save_json(
+            f"{self.path}/meta.json",
+            {"last_block": self.last_block, "rows": len(self), "providers": self.providers},
+        )
+
+    def _process(self, logs: List[dict]) -> None:
+        # logs within a range are ordered, so a `Supply` always follows its lock change
+        self._append(self._to_rows(logs))
+
+    def lock_events(self) -> List[Tuple[int, str, int, int, int]]:
+        """Get the indexed lock changes, in the format used by `VotingEscrowSupply`."""
+        signs = np.where(self["kind"] == WITHDRAW, -1, 1).astype(object)
+        return list(
+            zip(
+                self["ts"].tolist(),
+                [self.providers[i] for i in self["provider"]],
+                (signs * self["value"]).tolist(),
+                self["locktime"].tolist(),
+                self["supply"].tolist(),
+            )
+        )
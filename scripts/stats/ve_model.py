@@ -0,0 +1,366 @@
+"""
+Exact Python model of `VotingEscrow`.
+
+The model mirrors the storage and integer math of `contracts/VotingEscrow.vy`:
+checkpoints are written to `point_history`, `user_point_history` and
+`slope_changes` exactly as the contract writes them, including the 255 week
+iteration limit, the block number extrapolation and Vyper's truncating
+division. Any condition that reverts the contract raises `Revert`, with the
+contract's revert string where it has one.
+
+The block context is set with `set_block` before each call, e.g. from the
+block number and timestamp of a replayed transaction:
+
+    model = VotingEscrowModel(deploy_tx.block_number, deploy_tx.timestamp)
+    model.set_block(tx.block_number, tx.timestamp)
+    model.create_lock(tx.sender, value, unlock_time)
+"""
+from typing import Dict, List, Tuple
+
+WEEK = 7 * 86400
+MAXTIME = 4 * 365 * 86400
+MULTIPLIER = 10 ** 18
+
+INT128_MIN = -(2 ** 127)
+INT128_MAX = 2 ** 127 - 1
+
+# (bias, slope, ts, blk)
+Point = Tuple[int, int, int, int]
+EMPTY_POINT: Point = (0, 0, 0, 0)
+
+# (amount, end)
+LockedBalance = Tuple[int, int]
+
+
+class Revert(Exception):
+    pass
+
+
+def _int128(value: int) -> int:
+    if not INT128_MIN <= value <= INT128_MAX:
+        raise Revert("int128 overflow")
+    return value
+
+
+def _div(a: int, b: int) -> int:
+    # Vyper rounds signed division towards zero
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def _sub(a: int, b: int) -> int:
+    # uint256 subtraction
+    if b > a:
+        raise Revert("uint256 underflow")
+    return a - b
+
+
+class VotingEscrowModel:
+    """State and methods of a `VotingEscrow` deployment.
+
+    Args:
+        block_number: Block the contract was deployed in
+        timestamp: Timestamp of the deployment block
+    """
+
+    def __init__(self, block_number: int, timestamp: int) -> None:
+        self.block_number = block_number
+        self.timestamp = timestamp
+
+        self.supply = 0
+        self.locked: Dict[str, LockedBalance] = {}
+        self.epoch = 0
+        self.point_history: Dict[int, Point] = {0: (0, 0, timestamp, block_number)}
+        self.user_point_history: Dict[str, Dict[int, Point]] = {}
+        self.user_point_epoch: Dict[str, int] = {}
+        self.slope_changes: Dict[int, int] = {}
+
+    def set_block(self, block_number: int, timestamp: int) -> None:
+        """Set the block that subsequent calls are executed in."""
+        self.block_number = block_number
+        self.timestamp = timestamp
+
+    def get_point(self, epoch: int) -> Point:
+        return self.point_history.get(epoch, EMPTY_POINT)
+
+    def get_user_point(self, addr: str, epoch: int) -> Point:
+        return self.user_point_history.get(addr, {}).get(epoch, EMPTY_POINT)
+
+    def get_last_user_slope(self, addr: str) -> int:
+        return self.get_user_point(addr, self.user_point_epoch.get(addr, 0))[1]
+
+    def locked__end(self, addr: str) -> int:
+        return self.locked.get(addr, (0, 0))[1]
+
+    def _checkpoint(self, addr: str, old_locked: LockedBalance, new_locked: LockedBalance) -> None:
+        timestamp, block_number = self.timestamp, self.block_number
+        u_old_slope = u_old_bias = u_new_slope = u_new_bias = 0
+        old_dslope = new_dslope = 0
+        _epoch = self.epoch
+
+        if addr is not None:
+            # Calculate slopes and biases, kept at zero when they have to
+            old_amount, old_end = old_locked
+            new_amount, new_end = new_locked
+            if old_end > timestamp and old_amount > 0:
+                u_old_slope = _div(old_amount, MAXTIME)
+                u_old_bias = _int128(u_old_slope * _int128(old_end - timestamp))
+            if new_end > timestamp and new_amount > 0:
+                u_new_slope = _div(new_amount, MAXTIME)
+                u_new_bias = _int128(u_new_slope * _int128(new_end - timestamp))
+
+            # Read values of scheduled changes in the slope
+            old_dslope = self.slope_changes.get(old_end, 0)
+            if new_end != 0:
+                if new_end == old_end:
+                    new_dslope = old_dslope
+                else:
+                    new_dslope = self.slope_changes.get(new_end, 0)
+
+        if _epoch > 0:
+            bias, slope, ts, blk = self.point_history[_epoch]
+        else:
+            bias, slope, ts, blk = 0, 0, timestamp, block_number
+        last_checkpoint = ts
+        initial_ts, initial_blk = ts, blk
+        block_slope = 0
+        if timestamp > ts:
+            block_slope = MULTIPLIER * (block_number - blk) // (timestamp - ts)
+
+        # Go over weeks to fill history and calculate what the current point is
+        t_i = last_checkpoint // WEEK * WEEK
+        for _ in range(255):
+            t_i += WEEK
+            d_slope = 0
+            if t_i > timestamp:
+                t_i = timestamp
+            else:
+                d_slope = self.slope_changes.get(t_i, 0)
+            bias = _int128(bias - _int128(slope * _int128(t_i - last_checkpoint)))
+            slope = _int128(slope + d_slope)
+            if bias < 0:
+                bias = 0
+            if slope < 0:
+                slope = 0
+            last_checkpoint = t_i
+            ts = t_i
+            blk = initial_blk + block_slope * (t_i - initial_ts) // MULTIPLIER
+            _epoch += 1
+            if t_i == timestamp:
+                blk = block_number
+                break
+            else:
+                self.point_history[_epoch] = (bias, slope, ts, blk)
+
+        self.epoch = _epoch
+
+        if addr is not None:
+            slope = _int128(slope + u_new_slope - u_old_slope)
+            bias = _int128(bias + u_new_bias - u_old_bias)
+            if slope < 0:
+                slope = 0
+            if bias < 0:
+                bias = 0
+
+        # Record the changed point into history
+        self.point_history[_epoch] = (bias, slope, ts, blk)
+
+        if addr is not None:
+            # Schedule the slope changes (slope is going down)
+            if old_end > timestamp:
+                old_dslope += u_old_slope
+                if new_end == old_end:
+                    old_dslope -= u_new_slope
+                self.slope_changes[old_end] = _int128(old_dslope)
+
+            if new_end > timestamp:
+                if new_end > old_end:
+                    new_dslope -= u_new_slope
+                    self.slope_changes[new_end] = _int128(new_dslope)
+
+            user_epoch = self.user_point_epoch.get(addr, 0) + 1
+            self.user_point_epoch[addr] = user_epoch
+            self.user_point_history.setdefault(addr, {})[user_epoch] = (
+                u_new_bias,
+                u_new_slope,
+                timestamp,
+                block_number,
+            )
+
+    def _deposit_for(
+        self, addr: str, value: int, unlock_time: int, locked_balance: LockedBalance
+    ) -> None:
+        amount, end = locked_balance
+        self.supply += value
+        amount = _int128(amount + value)
+        if unlock_time != 0:
+            end = unlock_time
+        self.locked[addr] = (amount, end)
+        self._checkpoint(addr, locked_balance, (amount, end))
+
+    def checkpoint(self) -> None:
+        self._checkpoint(None, (0, 0), (0, 0))
+
+    def deposit_for(self, addr: str, value: int) -> None:
+        amount, end = self.locked.get(addr, (0, 0))
+        if value == 0:
+            raise Revert("dev: need non-zero value")
+        if amount <= 0:
+            raise Revert("No existing lock found")
+        if end <= self.timestamp:
+            raise Revert("Cannot add to expired lock. Withdraw")
+        self._deposit_for(addr, value, 0, (amount, end))
+
+    def create_lock(self, addr: str, value: int, unlock_time: int) -> None:
+        unlock_time = unlock_time // WEEK * WEEK
+        locked_balance = self.locked.get(addr, (0, 0))
+        if value == 0:
+            raise Revert("dev: need non-zero value")
+        if locked_balance[0] != 0:
+            raise Revert("Withdraw old tokens first")
+        if unlock_time <= self.timestamp:
+            raise Revert("Can only lock until time in the future")
+        if unlock_time > self.timestamp + MAXTIME:
+            raise Revert("Voting lock can be 4 years max")
+        self._deposit_for(addr, value, unlock_time, locked_balance)
+
+    def increase_amount(self, addr: str, value: int) -> None:
+        amount, end = self.locked.get(addr, (0, 0))
+        if value == 0:
+            raise Revert("dev: need non-zero value")
+        if amount <= 0:
+            raise Revert("No existing lock found")
+        if end <= self.timestamp:
+            raise Revert("Cannot add to expired lock. Withdraw")
+        self._deposit_for(addr, value, 0, (amount, end))
+
+    def increase_unlock_time(self, addr: str, unlock_time: int) -> None:
+        amount, end = self.locked.get(addr, (0, 0))
+        unlock_time = unlock_time // WEEK * WEEK
+        if end <= self.timestamp:
+            raise Revert("Lock expired")
+        if amount <= 0:
+            raise Revert("Nothing is locked")
+        if unlock_time <= end:
+            raise Revert("Can only increase lock duration")
+        if unlock_time > self.timestamp + MAXTIME:
+            raise Revert("Voting lock can be 4 years max")
+        self._deposit_for(addr, 0, unlock_time, (amount, end))
+
+    def withdraw(self, addr: str) -> int:
+        """Withdraw an expired lock.
+
+        Returns:
+            Amount withdrawn
+        """
+        old_locked = self.locked.get(addr, (0, 0))
+        if self.timestamp < old_locked[1]:
+            raise Revert("The lock didn't expire")
+        value = old_locked[0]
+
+        self.locked[addr] = (0, 0)
+        self.supply = _sub(self.supply, value)
+        self._checkpoint(addr, old_locked, (0, 0))
+        return value
+
+    def find_block_epoch(self, block: int, max_epoch: int) -> int:
+        _min, _max = 0, max_epoch
+        for _ in range(128):
+            if _min >= _max:
+                break
+            _mid = (_min + _max + 1) // 2
+            if self.get_point(_mid)[3] <= block:
+                _min = _mid
+            else:
+                _max = _mid - 1
+        return _min
+
+    def balanceOf(self, addr: str, t: int = None) -> int:
+        if t is None:
+            t = self.timestamp
+        _epoch = self.user_point_epoch.get(addr, 0)
+        if _epoch == 0:
+            return 0
+        bias, slope, ts, _ = self.get_user_point(addr, _epoch)
+        bias -= slope * _int128(_sub(t, ts))
+        return max(bias, 0)
+
+    def balanceOfAt(self, addr: str, block: int) -> int:
+        if block > self.block_number:
+            raise Revert("block is in the future")
+
+        # Binary search
+        _min, _max = 0, self.user_point_epoch.get(addr, 0)
+        for _ in range(128):
+            if _min >= _max:
+                break
+            _mid = (_min + _max + 1) // 2
+            if self.get_user_point(addr, _mid)[3] <= block:
+                _min = _mid
+            else:
+                _max = _mid - 1
+        bias, slope, ts, _ = self.get_user_point(addr, _min)
+
+        max_epoch = self.epoch
+        _epoch = self.find_block_epoch(block, max_epoch)
+        point_0 = self.get_point(_epoch)
+        if _epoch < max_epoch:
+            point_1 = self.get_point(_epoch + 1)
+            d_block = point_1[3] - point_0[3]
+            d_t = point_1[2] - point_0[2]
+        else:
+            d_block = self.block_number - point_0[3]
+            d_t = self.timestamp - point_0[2]
+        block_time = point_0[2]
+        if d_block != 0:
+            block_time += d_t * _sub(block, point_0[3]) // d_block
+
+        bias -= slope * _int128(_sub(block_time, ts))
+        return max(bias, 0)
+
+    def supply_at(self, point: Point, t: int) -> int:
+        bias, slope, ts, _ = point
+        t_i = ts // WEEK * WEEK
+        for _ in range(255):
+            t_i += WEEK
+            d_slope = 0
+            if t_i > t:
+                t_i = t
+            else:
+                d_slope = self.slope_changes.get(t_i, 0)
+            bias -= slope * _int128(_sub(t_i, ts))
+            if t_i == t:
+                break
+            slope += d_slope
+            ts = t_i
+
+        return max(bias, 0)
+
+    def totalSupply(self, t: int = None) -> int:
+        if t is None:
+            t = self.timestamp
+        return self.supply_at(self.get_point(self.epoch), t)
+
+    def totalSupplyAt(self, block: int) -> int:
+        if block > self.block_number:
+            raise Revert("block is in the future")
+        _epoch = self.epoch
+        target_epoch = self.find_block_epoch(block, _epoch)
+
+        point = self.get_point(target_epoch)
+        dt = 0
+        if target_epoch < _epoch:
+            point_next = self.get_point(target_epoch + 1)
+            if point[3] != point_next[3]:
+                d_block = point_next[3] - point[3]
+                dt = _sub(block, point[3]) * (point_next[2] - point[2]) // d_block
+        elif point[3] != self.block_number:
+            d_block = self.block_number - point[3]
+            dt = _sub(block, point[3]) * (self.timestamp - point[2]) // d_block
+
+        return self.supply_at(point, point[2] + dt)
+
+    def user_points(self, addr: str) -> List[Point]:
+        """Get the full checkpoint history of a user, starting from epoch 1."""
+        history = self.user_point_history.get(addr, {})
+        return [history[i] for i in range(1, self.user_point_epoch.get(addr, 0) + 1)]
@@ -0,0 +1,135 @@
+"""
+Local reconstruction of veCRV balances from VotingEscrow events.
+
+Every `Deposit` and `Withdraw` sets a user's lock from that timestamp until
+their next event. A lock contributes `slope * (end - t)` while `t < end`,
+where `slope = amount // MAXTIME` - the same integer math used by
+`VotingEscrow._checkpoint`. Since locks end on week boundaries, summing
+these contributions gives exactly the value of `supply_at`, without the
+on-chain binary search or week-by-week loop.
+
+The total supply is evaluated from a table of slope changes, so each
+timestamp costs a single `searchsorted`. Values are kept as python ints in
+object arrays, as `slope * end` does not fit in 64 bits.
+"""
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+from brownie import Contract
+
+from scripts.stats.ve_index import VotingEscrowIndex
+
+VOTING_ESCROW = "0x5f3b5DfEb7B28CDbD7FAba78963EE202a494e2A2"
+START_BLOCK = 10647813
+
+WEEK = 7 * 86400
+MAXTIME = 4 * 365 * 86400
+
+# (timestamp, provider, locked amount delta, lock end, CRV locked after the change)
+LockEvent = Tuple[int, str, int, int, int]
+
+
+def to_lock_events(logs: Iterable[Tuple[str, dict]]) -> List[LockEvent]:
+    """Merge decoded VotingEscrow logs into one event per lock change.
+
+    Each `Deposit` or `Withdraw` is followed by a `Supply` event in the same
+    transaction, which gives the total CRV locked after the change.
+
+    Args:
+        logs: `(event name, event args)` for each log, in the order they were emitted
+    """
+    events = []
+    for name, args in logs:
+        if name == "Supply" and events:
+            events[-1][-1] = args["supply"]
+        elif name == "Deposit":
+            events.append([args["ts"], args["provider"], args["value"], args["locktime"], None])
+        elif name == "Withdraw":
+            events.append([args["ts"], args["provider"], -args["value"], 0, None])
+
+    return [tuple(i) for i in events]
+
+
+def get_lock_events(voting_escrow: Contract = None) -> List[LockEvent]:
+    """Get every VotingEscrow lock event, syncing the local index first."""
+    if voting_escrow is None:
+        voting_escrow = Contract(VOTING_ESCROW)
+    index = VotingEscrowIndex(voting_escrow, START_BLOCK)
+    index.sync()
+    return index.lock_events()
+
+
+class VotingEscrowSupply:
+    """veCRV balances and total supply rebuilt from lock events.
+
+    Args:
+        events: Lock events, ordered as they were emitted
+    """
+
+    def __init__(self, events: Sequence[LockEvent]) -> None:
+        # per-user lock segments: (start, slope, end)
+        self.user_segments = {}
+        locks = {}
+        for ts, provider, value, locktime, _ in events:
+            amount, end = locks.get(provider, (0, 0))
+            amount += value
+            if value < 0:
+                # `withdraw` always removes the full lock
+                amount, end = 0, 0
+            else:
+                end = locktime
+            locks[provider] = (amount, end)
+            self.user_segments.setdefault(provider, []).append((ts, amount // MAXTIME, end))
+
+        # slope change table: from `change_ts[i]` onwards, the active locks have a
+        # total slope of `slopes[i + 1]` and a total `slope * end` of `bias_ends[i + 1]`
+        changes = []
+        for segments in self.user_segments.values():
+            for i, (start, slope, end) in enumerate(segments):
+                stop = end if i + 1 == len(segments) else min(end, segments[i + 1][0])
+                if slope == 0 or stop <= start:
+                    continue
+                changes.append((start, slope, slope * end))
+                changes.append((stop, -slope, -slope * end))
+        changes.sort(key=lambda i: i[0])
+
+        self.change_ts = np.array([i[0] for i in changes], dtype=np.int64)
+        self.slopes = np.concatenate(
+            [[0], np.cumsum(np.array([i[1] for i in changes], dtype=object))]
+        )
+        self.bias_ends = np.concatenate(
+            [[0], np.cumsum(np.array([i[2] for i in changes], dtype=object))]
+        )
+
+        supply = [(i[0], i[4]) for i in events if i[4] is not None]
+        self.supply_ts = np.array([i[0] for i in supply], dtype=np.int64)
+        self.locked = np.array([0] + [i[1] for i in supply], dtype=object)
+
+    def total_supply(self, timestamps: Sequence[int]) -> np.ndarray:
+        """Get the total veCRV supply at each timestamp.
+
+        Equivalent to `VotingEscrow.totalSupply(t)` evaluated with the
+        checkpoint history as of `t`.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        idx = np.searchsorted(self.change_ts, timestamps, side="right")
+        return self.bias_ends[idx] - self.slopes[idx] * timestamps.astype(object)
+
+    def balance_of(self, user: str, timestamps: Sequence[int]) -> np.ndarray:
+        """Get the veCRV balance of a user at each timestamp."""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        segments = self.user_segments.get(user, [])
+        if not segments:
+            return np.zeros(len(timestamps), dtype=object)
+
+        starts, slopes, ends = (np.array(i, dtype=object) for i in zip(*segments))
+        idx = np.searchsorted(starts.astype(np.int64), timestamps, side="right") - 1
+        active = idx >= 0
+        idx[~active] = 0
+        bias = slopes[idx] * (ends[idx] - timestamps.astype(object))
+        return np.where(active & (bias > 0).astype(bool), bias, 0)
+
+    def locked_supply(self, timestamps: Sequence[int]) -> np.ndarray:
+        """Get the total CRV locked at each timestamp."""
+        idx = np.searchsorted(self.supply_ts, np.asarray(timestamps, dtype=np.int64), side="right")
+        return self.locked[idx]
@@ -13,6 +13,8 @@ from brownie import (
 )
 from brownie_tokens import ERC20
 
+import scripts.cache
+
 YEAR = 365 * 86400
 INITIAL_RATE = 274_815_283
 YEAR_1_SUPPLY = INITIAL_RATE * 10 ** 18 // YEAR * YEAR
@@ -31,11 +33,36 @@ def pack_values(values):
     return padded
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--gas-benchmark",
+        action="store_true",
+        help="Record gas used by each burner call and compare it to the stored baseline",
+    )
+    parser.addoption(
+        "--update-gas-baseline",
+        action="store_true",
+        help="Record gas used by each burner call and overwrite the stored baseline",
+    )
+    parser.addoption(
+        "--gas-threshold",
+        type=float,
+        default=0.02,
+        help="Maximum allowed gas increase over the baseline, as a fraction",
+    )
+
+
 @pytest.fixture(autouse=True)
 def isolation_setup(fn_isolation):
     pass
 
 
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    # scripts persist fetched data to disk, keep it out of the project cache
+    monkeypatch.setattr(scripts.cache, "CACHE_PATH", tmp_path)
+
+
 # helper functions as fixtures
 
 
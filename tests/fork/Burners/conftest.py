@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+import pytest
+
+# gas used by every burner call within each test, as recorded by `--update-gas-baseline`
+BASELINE_PATH = Path(__file__).parent.joinpath("gas_baseline.json")
+
+# `burn_many` gas budget, used to report how many coins of each type fit in one call
+BURN_GAS_LIMIT = 2000000
+
+# {test id: {"Burner.fn": gas used}}
+_results = {}
+# {"Burner.fn": gas used by the most expensive single call}
+_max_call = {}
+# "test id: Burner.fn" of each call benchmarked without a baseline
+_unbaselined = []
+_baseline = None
+
+
+def _is_enabled(config):
+    return config.getoption("gas_benchmark") or config.getoption("update_gas_baseline")
+
+
+def _load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    with BASELINE_PATH.open() as fp:
+        return json.load(fp)
+
+
+def _get_baseline():
+    global _baseline
+    if _baseline is None:
+        _baseline = _load_baseline()
+    return _baseline
+
+
+@pytest.fixture(autouse=True)
+def gas_benchmark(request, history):
+    if not _is_enabled(request.config):
+        yield
+        return
+    if not request.config.getoption("update_gas_baseline") and not BASELINE_PATH.exists():
+        pytest.fail(f"No gas baseline at {BASELINE_PATH}, record one with --update-gas-baseline")
+
+    tx_count = len(history)
+    yield
+
+    gas = {}
+    for tx in history[tx_count:]:
+        if tx.fn_name in ("burn", "execute") and tx.contract_name.endswith("Burner"):
+            key = f"{tx.contract_name}.{tx.fn_name}"
+            gas[key] = gas.get(key, 0) + tx.gas_used
+            _max_call[key] = max(_max_call.get(key, 0), tx.gas_used)
+    if not gas:
+        return
+
+    test_id = request.node.nodeid
+    _results[test_id] = gas
+    if request.config.getoption("update_gas_baseline"):
+        return
+
+    # calls without a baseline are new, they never fail but are reported in the summary
+    threshold = request.config.getoption("gas_threshold")
+    baseline = _get_baseline().get(test_id, {})
+    regressions = []
+    for key, gas_used in gas.items():
+        expected = baseline.get(key)
+        if not expected:
+            _unbaselined.append(f"{test_id}: {key}")
+        elif gas_used > expected * (1 + threshold):
+            increase = gas_used / expected - 1
+            regressions.append(f"{key}: {gas_used} gas, baseline {expected} (+{increase:.1%})")
+    if regressions:
+        pytest.fail("Gas regression\n" + "\n".join(regressions))
+
+
+def pytest_sessionfinish(session):
+    if not _results or not session.config.getoption("update_gas_baseline"):
+        return
+    baseline = _load_baseline()
+    baseline.update(_results)
+    with BASELINE_PATH.open("w") as fp:
+        json.dump(baseline, fp, indent=2, sort_keys=True)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _results:
+        return
+
+    # most expensive single call for each burner function, across every coin
+    terminalreporter.section("Burner gas")
+    terminalreporter.write_line(f"{'Call':<40}{'Max gas':>12}{'Per burn_many':>15}")
+    for key, gas_used in sorted(_max_call.items(), key=lambda k: k[1], reverse=True):
+        per_batch = BURN_GAS_LIMIT // gas_used
+        terminalreporter.write_line(f"{key:<40}{gas_used:>12,}{per_batch:>15}")
+
+    if _unbaselined:
+        terminalreporter.write_line(
+            f"\nWARNING: {len(_unbaselined)} calls have no baseline and were not checked:",
+            yellow=True,
+        )
+        for item in _unbaselined:
+            terminalreporter.write_line(f"  {item}", yellow=True)
@@ -0,0 +1,115 @@
+import copy
+
+from brownie import chain
+from brownie.exceptions import VirtualMachineError
+from brownie.test import strategy
+
+from scripts.stats.gauge_model import GaugeControllerModel
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+GAS_LIMIT = 4_000_000
+
+
+class StateMachine:
+    """
+    Compare the python `GaugeController` model against the contract.
+    """
+
+    st_account = strategy("address", length=3)
+    st_gauge = strategy("uint", max_value=2)
+    st_user_weight = strategy("uint", max_value=10000)
+    st_value = strategy("uint64", min_value=1)
+    st_lock_duration = strategy("uint8")
+    st_sleep_duration = strategy("uint", min_value=1, max_value=2 * WEEK)
+
+    def __init__(self, accounts, gauge_controller, gauges, token, voting_escrow):
+        self.accounts = accounts
+        self.gauge_controller = gauge_controller
+        self.gauges = gauges
+        self.voting_escrow = voting_escrow
+
+        self.initial_model = GaugeControllerModel(voting_escrow, gauge_controller.tx.timestamp)
+        self.model = self.initial_model
+        self._execute("add_type", accounts[0], "Liquidity", 10 ** 18)
+        self._execute("add_type", accounts[0], "Insurance", 5 * 10 ** 17)
+        for i, gauge in enumerate(gauges):
+            self._execute("add_gauge", accounts[0], gauge.address, i % 2, 10 ** 18)
+
+        for acct in accounts:
+            token.transfer(acct, 10 ** 24, {"from": accounts[0]})
+            token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+            voting_escrow.create_lock(10 ** 22, chain.time() + YEAR, {"from": acct})
+
+    def setup(self):
+        # the escrow contract is shared rather than copied
+        self.model = copy.deepcopy(self.initial_model, {id(self.voting_escrow): self.voting_escrow})
+
+    def _execute(self, fn_name, sender, *args):
+        try:
+            tx = getattr(self.gauge_controller, fn_name)(*args, {"from": sender, "gas": GAS_LIMIT})
+        except VirtualMachineError:
+            return
+        self.model.set_time(tx.timestamp)
+        if fn_name == "vote_for_gauge_weights":
+            self.model.vote_for_gauge_weights(sender.address, *args)
+        else:
+            getattr(self.model, fn_name)(*args)
+
+    def rule_vote(self, st_account, st_gauge, st_user_weight):
+        gauge = self.gauges[st_gauge].address
+        self._execute("vote_for_gauge_weights", st_account, gauge, st_user_weight)
+
+    def rule_checkpoint_gauge(self, st_gauge):
+        self._execute("checkpoint_gauge", self.accounts[0], self.gauges[st_gauge].address)
+
+    def rule_create_lock(self, st_account, st_value, st_lock_duration):
+        unlock_time = chain.time() + st_lock_duration * WEEK
+        try:
+            self.voting_escrow.create_lock(st_value, unlock_time, {"from": st_account})
+        except VirtualMachineError:
+            pass
+
+    def rule_withdraw(self, st_account):
+        try:
+            self.voting_escrow.withdraw({"from": st_account})
+        except VirtualMachineError:
+            pass
+
+    def rule_advance_time(self, st_sleep_duration):
+        chain.sleep(st_sleep_duration)
+
+    def invariant_storage(self):
+        model, gauge_controller = self.model, self.gauge_controller
+
+        assert model.time_total == gauge_controller.time_total()
+        assert model.get_total_weight() == gauge_controller.get_total_weight()
+        for i in range(model.n_gauge_types):
+            assert model.get_weights_sum_per_type(i) == gauge_controller.get_weights_sum_per_type(i)
+        for gauge in self.gauges:
+            addr = gauge.address
+            assert model.time_weight[addr] == gauge_controller.time_weight(gauge)
+            assert model.get_gauge_weight(addr) == gauge_controller.get_gauge_weight(gauge)
+        for acct in self.accounts:
+            power = model.vote_user_power.get(acct.address, 0)
+            assert power == gauge_controller.vote_user_power(acct)
+
+    def invariant_relative_weight(self):
+        timestamp = self.model.timestamp
+        for gauge in self.gauges:
+            weight = self.model.gauge_relative_weight(gauge.address, timestamp)
+            assert weight == self.gauge_controller.gauge_relative_weight(gauge, timestamp)
+
+
+def test_state_machine(
+    state_machine, accounts, gauge_controller, three_gauges, token, voting_escrow
+):
+    state_machine(
+        StateMachine,
+        accounts[:3],
+        gauge_controller,
+        three_gauges,
+        token,
+        voting_escrow,
+        settings={"max_examples": 25},
+    )
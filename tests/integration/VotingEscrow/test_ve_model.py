@@ -0,0 +1,105 @@
+import pytest
+from brownie import chain, history
+from brownie.exceptions import VirtualMachineError
+from brownie.test import strategy
+from brownie_tokens import ERC20
+
+from scripts.stats.ve_model import Revert, VotingEscrowModel
+
+WEEK = 86400 * 7
+GAS_LIMIT = 4_000_000
+
+
+class StateMachine:
+    """
+    Compare the python `VotingEscrow` model against the contract.
+    """
+
+    st_account = strategy("address", length=5)
+    st_value = strategy("uint64", min_value=1)
+    st_lock_duration = strategy("uint8")
+    st_sleep_duration = strategy("uint", min_value=1, max_value=4 * 86400 * 7)
+
+    def __init__(self, accounts, token, voting_escrow):
+        self.accounts = accounts
+        self.token = token
+        self.voting_escrow = voting_escrow
+
+        for acct in accounts:
+            token._mint_for_testing(acct, 10 ** 40)
+            token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+
+    def setup(self):
+        tx = self.voting_escrow.tx
+        self.model = VotingEscrowModel(tx.block_number, tx.timestamp)
+
+    def _execute(self, fn_name, sender, *args):
+        try:
+            tx = getattr(self.voting_escrow, fn_name)(*args, {"from": sender, "gas": GAS_LIMIT})
+        except VirtualMachineError:
+            # the reverted transaction is still mined, the model must revert at the same time
+            tx = history[-1]
+            self.model.set_block(tx.block_number, tx.timestamp)
+            with pytest.raises(Revert):
+                self._execute_model(fn_name, sender, *args)
+            return
+        self.model.set_block(tx.block_number, tx.timestamp)
+        self._execute_model(fn_name, sender, *args)
+
+    def _execute_model(self, fn_name, sender, *args):
+        if fn_name == "checkpoint":
+            self.model.checkpoint()
+        else:
+            getattr(self.model, fn_name)(sender.address, *args)
+
+    def rule_create_lock(self, st_account, st_value, st_lock_duration):
+        unlock_time = chain.time() + st_lock_duration * WEEK
+        self._execute("create_lock", st_account, st_value * 10 ** 18, unlock_time)
+
+    def rule_increase_amount(self, st_account, st_value):
+        self._execute("increase_amount", st_account, st_value * 10 ** 18)
+
+    def rule_increase_unlock_time(self, st_account, st_lock_duration):
+        unlock_time = chain.time() + st_lock_duration * WEEK
+        self._execute("increase_unlock_time", st_account, unlock_time)
+
+    def rule_withdraw(self, st_account):
+        self._execute("withdraw", st_account)
+
+    def rule_checkpoint(self, st_account):
+        self._execute("checkpoint", st_account)
+
+    def rule_advance_time(self, st_sleep_duration):
+        chain.sleep(st_sleep_duration)
+
+    def invariant_storage(self):
+        model, voting_escrow = self.model, self.voting_escrow
+
+        assert model.epoch == voting_escrow.epoch()
+        assert model.get_point(model.epoch) == voting_escrow.point_history(model.epoch)
+        for acct in self.accounts:
+            epoch = model.user_point_epoch.get(acct.address, 0)
+            assert epoch == voting_escrow.user_point_epoch(acct)
+            assert model.get_user_point(acct.address, epoch) == voting_escrow.user_point_history(
+                acct, epoch
+            )
+
+    def invariant_views(self):
+        model, voting_escrow = self.model, self.voting_escrow
+        block, timestamp = model.block_number, model.timestamp
+
+        assert model.totalSupply(timestamp) == voting_escrow.totalSupply(timestamp)
+        assert model.totalSupplyAt(block) == voting_escrow.totalSupplyAt(block)
+        for acct in self.accounts:
+            addr = acct.address
+            assert model.balanceOf(addr, timestamp) == voting_escrow.balanceOf(acct, timestamp)
+            assert model.balanceOfAt(addr, block) == voting_escrow.balanceOfAt(acct, block)
+
+
+def test_state_machine(state_machine, accounts, VotingEscrow):
+    token = ERC20("", "", 18)
+    voting_escrow = VotingEscrow.deploy(
+        token, "Voting-escrowed CRV", "veCRV", "veCRV_0.99", {"from": accounts[0]}
+    )
+
+    state_machine(StateMachine, accounts[:5], token, voting_escrow, settings={"max_examples": 25})
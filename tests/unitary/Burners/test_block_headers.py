@@ -0,0 +1,61 @@
+import pytest
+
+from scripts.burners import block_headers
+from scripts.burners.block_headers import HeaderCache, get_headers
+
+
+def _header(number):
+    return {
+        "number": number,
+        "timestamp": 1600000000 + number,
+        "transactionsRoot": number.to_bytes(32, "big"),
+        "receiptsRoot": (number * 2).to_bytes(32, "big"),
+    }
+
+
+@pytest.fixture(autouse=True)
+def fetched(monkeypatch):
+    fetched = []
+
+    def fetch_batch(numbers, w3):
+        fetched.extend(numbers)
+        return [_header(i) for i in numbers]
+
+    monkeypatch.setattr(block_headers, "_fetch_batch", fetch_batch)
+    yield fetched
+
+
+def test_headers(fetched):
+    headers = get_headers(9990, 10300, cache=HeaderCache(137))
+
+    assert [i["number"] for i in headers] == list(range(9990, 10301))
+    assert headers == [_header(i) for i in range(9990, 10301)]
+    assert sorted(fetched) == list(range(9990, 10301))
+
+
+def test_cached_on_disk(fetched):
+    get_headers(100, 200, cache=HeaderCache(137))
+    fetched.clear()
+
+    headers = get_headers(100, 200, cache=HeaderCache(137))
+
+    assert fetched == []
+    assert headers == [_header(i) for i in range(100, 201)]
+
+
+def test_only_missing_fetched(fetched):
+    get_headers(100, 200, cache=HeaderCache(137))
+    fetched.clear()
+
+    get_headers(150, 250, cache=HeaderCache(137))
+
+    assert sorted(fetched) == list(range(201, 251))
+
+
+def test_cache_per_chain(fetched):
+    get_headers(100, 200, cache=HeaderCache(137))
+    fetched.clear()
+
+    get_headers(100, 200, cache=HeaderCache(80001))
+
+    assert sorted(fetched) == list(range(100, 201))
@@ -0,0 +1,61 @@
+import pytest
+
+from scripts.burners import receipts
+from scripts.burners.receipts import get_block_receipts
+
+BLOCK = {"number": 1000, "transactions": [bytes([i]) * 32 for i in range(4)]}
+
+
+def _receipt(index):
+    return {
+        "transactionHash": "0x" + bytes([index]).hex() * 32,
+        "transactionIndex": hex(index),
+        "status": "0x1",
+        "cumulativeGasUsed": hex(21000 * (index + 1)),
+        "type": "0x2",
+    }
+
+
+@pytest.fixture
+def no_block_receipts(monkeypatch):
+    def request(method, params, w3):
+        raise ValueError({"code": -32601, "message": "method not found"})
+
+    def concurrent_batches(method, params, w3):
+        assert method == "eth_getTransactionReceipt"
+        return [_receipt(int(i[0][2:4], 16)) for i in params]
+
+    monkeypatch.setattr(receipts, "request", request)
+    monkeypatch.setattr(receipts, "supports_batching", lambda w3: True)
+    monkeypatch.setattr(receipts, "concurrent_batches", concurrent_batches)
+
+
+def test_block_receipts(monkeypatch):
+    monkeypatch.setattr(
+        receipts, "request", lambda method, params, w3: [_receipt(i) for i in (2, 0, 1, 3)]
+    )
+
+    result = get_block_receipts(BLOCK)
+
+    assert [i["transactionIndex"] for i in result] == [0, 1, 2, 3]
+    assert result[1]["cumulativeGasUsed"] == 42000
+    assert result[1]["status"] == 1
+    assert result[1]["type"] == 2
+
+
+def test_fallback(no_block_receipts):
+    result = get_block_receipts(BLOCK)
+
+    assert [i["transactionIndex"] for i in result] == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("block_receipts", (True, False))
+def test_exclude(monkeypatch, no_block_receipts, block_receipts):
+    if block_receipts:
+        monkeypatch.setattr(
+            receipts, "request", lambda method, params, w3: [_receipt(i) for i in range(4)]
+        )
+
+    result = get_block_receipts(BLOCK, exclude=[BLOCK["transactions"][3]])
+
+    assert [i["transactionIndex"] for i in result] == [0, 1, 2]
@@ -0,0 +1,73 @@
+import pytest
+
+from scripts.burners.checkpoints import CHECKPOINT_ID_INTERVAL, CheckpointIndex
+
+# each checkpoint covers 100 child blocks, starting from block 0
+CHECKPOINT_SIZE = 100
+
+
+class RootChain:
+    address = "0x86E4Dc95c7FBdBf52e33D563BbDB00823894C287"
+
+    def __init__(self, count):
+        self.count = count
+
+    def currentHeaderBlock(self):
+        return self.count * CHECKPOINT_ID_INTERVAL
+
+
+class Index(CheckpointIndex):
+    fetched = []
+
+    def _fetch(self, header_ids):
+        self.fetched.extend(header_ids)
+        return [
+            (
+                (i // CHECKPOINT_ID_INTERVAL - 1) * CHECKPOINT_SIZE,
+                i // CHECKPOINT_ID_INTERVAL * CHECKPOINT_SIZE - 1,
+            )
+            for i in header_ids
+        ]
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    Index.fetched = []
+
+
+@pytest.mark.parametrize("block,header_id", [(0, 10000), (99, 10000), (100, 20000), (4321, 440000)])
+def test_find(block, header_id):
+    index = Index(RootChain(50))
+
+    start, end, result = index.find(block)
+
+    assert result == header_id
+    assert start <= block <= end
+
+
+def test_not_checkpointed():
+    index = Index(RootChain(50))
+
+    assert index.find(5000) is None
+
+
+def test_synced_from_disk():
+    Index(RootChain(50)).sync()
+    Index.fetched = []
+
+    index = Index(RootChain(50))
+    assert len(index) == 50
+    index.find(1234)
+
+    assert Index.fetched == []
+
+
+def test_incremental_sync():
+    root_chain = RootChain(50)
+    index = Index(root_chain)
+    index.sync()
+    Index.fetched = []
+
+    root_chain.count = 60
+    assert index.find(5500) == (5500, 5599, 560000)
+    assert Index.fetched == [i * CHECKPOINT_ID_INTERVAL for i in range(51, 61)]
@@ -0,0 +1,51 @@
+import pytest
+
+from scripts.burners.checkpoints import CheckpointWatcher
+
+
+@pytest.fixture(scope="module")
+def root_chain(RootChainMock, alice):
+    contract = RootChainMock.deploy({"from": alice})
+    contract.submit_checkpoint("0x" + "11" * 32, 0, 99, {"from": alice})
+    yield contract
+
+
+@pytest.fixture
+def checkpointed():
+    yield []
+
+
+@pytest.fixture
+def watcher(root_chain, checkpointed):
+    pending = {"0xaa": 50, "0xbb": 150, "0xcc": 250}
+    yield CheckpointWatcher(root_chain, pending, checkpointed.append)
+
+
+def test_mock_root_chain(root_chain, alice):
+    root_chain.submit_checkpoint("0x" + "22" * 32, 100, 199, {"from": alice})
+
+    assert root_chain.currentHeaderBlock() == 20000
+    assert root_chain.getLastChildBlock() == 199
+    assert root_chain.headerBlocks(10000)[1:3] == (0, 99)
+
+
+def test_poll(watcher, checkpointed):
+    assert watcher.poll() == ["0xaa"]
+    assert checkpointed == [["0xaa"]]
+    assert watcher.pending == {"0xbb": 150, "0xcc": 250}
+
+
+def test_poll_fires_once(watcher, checkpointed):
+    watcher.poll()
+    assert watcher.poll() == []
+
+    assert checkpointed == [["0xaa"]]
+
+
+def test_new_checkpoint(root_chain, alice, watcher, checkpointed):
+    watcher.poll()
+    root_chain.submit_checkpoint("0x" + "22" * 32, 100, 299, {"from": alice})
+
+    assert watcher.poll() == ["0xbb", "0xcc"]
+    assert checkpointed == [["0xaa"], ["0xbb", "0xcc"]]
+    assert watcher.pending == {}
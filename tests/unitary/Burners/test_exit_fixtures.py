@@ -0,0 +1,163 @@
+import copy
+
+import pytest
+import rlp
+from eth_utils import keccak
+from hexbytes import HexBytes
+from trie import HexaryTrie
+
+from scripts.burners.exit_fixtures import (
+    get_fixture_path,
+    load_exit_fixture,
+    make_synthetic_fixture,
+    measure_proof,
+    verify_exit_fixture,
+)
+from scripts.burners.exit_polygon import TEST_TXS
+
+# the checks below are written against the Ethereum trie spec and the
+# `RootChainManager` exit payload reader, without any of the proof builder code
+
+
+def _block_leaf(number, timestamp, transactions_root, receipts_root):
+    return keccak(
+        number.to_bytes(32, "big")
+        + timestamp.to_bytes(32, "big")
+        + HexBytes(transactions_root)
+        + HexBytes(receipts_root)
+    )
+
+
+def _naive_root(leaves):
+    nodes = leaves + [bytes(32)] * (2 ** (len(leaves) - 1).bit_length() - len(leaves))
+    while len(nodes) > 1:
+        nodes = [keccak(nodes[i] + nodes[i + 1]) for i in range(0, len(nodes), 2)]
+    return nodes[0]
+
+
+def _receipt_bytes(receipt):
+    # legacy receipts are an RLP list, typed receipts are `type || rlp(list)` (EIP-2718)
+    encoded = rlp.encode(
+        [
+            receipt["status"],
+            receipt["cumulativeGasUsed"],
+            HexBytes(receipt["logsBloom"]),
+            [
+                [HexBytes(i["address"]), [HexBytes(t) for t in i["topics"]], HexBytes(i["data"])]
+                for i in receipt["logs"]
+            ],
+        ]
+    )
+    if receipt["type"]:
+        return bytes([receipt["type"]]) + encoded
+    return encoded
+
+
+def _receipts_root(receipts):
+    receipts_trie = HexaryTrie({})
+    for receipt in receipts:
+        receipts_trie[rlp.encode(receipt["transactionIndex"])] = _receipt_bytes(receipt)
+    return receipts_trie.root_hash
+
+
+def _check_payload(fixture, calldata):
+    # decode the payload the same way as `ExitPayloadReader`
+    payload = rlp.decode(calldata)
+    block = fixture["block"]
+    assert int.from_bytes(payload[0], "big") == fixture["header_block_id"]
+    assert int.from_bytes(payload[2], "big") == block["number"]
+
+    index = block["number"] - fixture["start"]
+    node = _block_leaf(block["number"], block["timestamp"], payload[4], payload[5])
+    block_proof = payload[1]
+    for i in range(0, len(block_proof), 32):
+        sibling = block_proof[i : i + 32]
+        node = keccak(node + sibling) if index % 2 == 0 else keccak(sibling + node)
+        index //= 2
+    assert node == HexBytes(fixture["checkpoint_root"])
+
+    receipt = payload[6]
+    if receipt[0] >= 0xC0:
+        assert rlp.decode(receipt)
+    else:
+        assert rlp.decode(receipt[1:])
+    path = payload[8][1:]
+    assert path == rlp.encode(fixture["burn_tx_index"])
+    proof = rlp.decode(payload[7])
+    assert HexaryTrie.get_from_proof(HexBytes(block["receiptsRoot"]), path, proof) == receipt
+
+
+@pytest.fixture(scope="module")
+def fixture():
+    yield make_synthetic_fixture(300)
+
+
+@pytest.mark.parametrize("burn_tx_id,exit_tx_id", TEST_TXS, ids=lambda i: i[:10])
+def test_recorded_exit(burn_tx_id, exit_tx_id):
+    fixture_path = get_fixture_path(burn_tx_id)
+    if not fixture_path.exists():
+        pytest.skip("Exit fixture is not recorded, see `record_tester_fixtures`")
+
+    fixture = load_exit_fixture(fixture_path)
+    assert fixture["exit_calldata"] is not None
+    assert fixture["receipts"]
+    assert len(fixture["headers"]) > 1
+
+    # compares against the calldata of the historical exit
+    calldata = verify_exit_fixture(fixture)
+    _check_payload(fixture, calldata)
+
+
+@pytest.mark.parametrize("block_count", [1, 2, 255, 256, 257])
+def test_synthetic_exit(block_count):
+    fixture = make_synthetic_fixture(block_count, seed=block_count)
+    calldata = verify_exit_fixture(fixture)
+
+    _check_payload(fixture, calldata)
+
+
+@pytest.mark.parametrize("block_count", [1, 2, 255, 256, 257])
+def test_synthetic_roots(block_count):
+    fixture = make_synthetic_fixture(block_count, seed=block_count)
+    leaves = [
+        _block_leaf(fixture["start"] + i, *header) for i, header in enumerate(fixture["headers"])
+    ]
+
+    assert _naive_root(leaves) == HexBytes(fixture["checkpoint_root"])
+    assert _receipts_root(fixture["receipts"]) == HexBytes(fixture["block"]["receiptsRoot"])
+
+
+def test_calldata_matches(fixture):
+    calldata = verify_exit_fixture(fixture)
+    fixture = dict(fixture, exit_calldata=calldata.hex())
+
+    assert verify_exit_fixture(fixture) == calldata
+
+
+def test_tampered_header(fixture):
+    fixture = copy.deepcopy(fixture)
+    fixture["headers"][42][0] += 1
+
+    with pytest.raises(AssertionError, match="Block tree root"):
+        verify_exit_fixture(fixture)
+
+
+def test_tampered_receipt(fixture):
+    fixture = copy.deepcopy(fixture)
+    fixture["receipts"][3]["cumulativeGasUsed"] += 1
+
+    with pytest.raises(AssertionError, match="Receipts trie"):
+        verify_exit_fixture(fixture)
+
+
+def test_tampered_calldata(fixture):
+    fixture = dict(fixture, exit_calldata="0x1234")
+
+    with pytest.raises(AssertionError, match="Calldata"):
+        verify_exit_fixture(fixture)
+
+
+def test_proof_memory():
+    result = measure_proof(make_synthetic_fixture(4096))
+
+    assert result["memory"] < 8 * 2 ** 20
@@ -0,0 +1,56 @@
+import pytest
+from eth_utils import keccak
+
+from scripts.burners.exit_polygon import MerkleTree
+
+
+def _leaves(count):
+    return [keccak(i.to_bytes(32, "big")) for i in range(count)]
+
+
+def _naive_root(leaves):
+    nodes = leaves + [bytes(32)] * (2 ** (len(leaves) - 1).bit_length() - len(leaves))
+    while len(nodes) > 1:
+        nodes = [keccak(nodes[i] + nodes[i + 1]) for i in range(0, len(nodes), 2)]
+    return nodes[0]
+
+
+def _verify(leaf, index, proof):
+    node = leaf
+    for sibling in proof:
+        node = keccak(node + sibling) if index % 2 == 0 else keccak(sibling + node)
+        index //= 2
+    return node
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13, 64, 100])
+def test_root(count):
+    leaves = _leaves(count)
+
+    assert MerkleTree(leaves).root == _naive_root(leaves)
+
+
+@pytest.mark.parametrize("count", [1, 3, 8, 13, 100])
+def test_proofs(count):
+    leaves = _leaves(count)
+    tree = MerkleTree(leaves)
+
+    for i, leaf in enumerate(leaves):
+        proof = tree.get_proof(i)
+        assert len(proof) == (count - 1).bit_length()
+        assert _verify(leaf, i, proof) == tree.root
+
+
+def test_index():
+    leaves = _leaves(10)
+    tree = MerkleTree(leaves)
+
+    for i, leaf in enumerate(leaves):
+        assert tree.index(leaf) == i
+
+
+def test_index_out_of_range():
+    tree = MerkleTree(_leaves(5))
+
+    with pytest.raises(AssertionError):
+        tree.get_proof(5)
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from scripts.burners import claim_and_burn_fees as burn
+from scripts.burners.prices import PriceCache, PriceProvider
+
+POOL_LIST = {"0x0000000000000000000000000000000000000001": ["0xaa", "0xbb"]}
+
+
+class BlockingProvider(PriceProvider):
+    def __init__(self, prices):
+        self.prices = prices
+        self.release = threading.Event()
+
+    def fetch(self, coins):
+        self.release.wait()
+        return {i: self.prices[i] for i in coins if i in self.prices}
+
+
+@pytest.fixture(autouse=True)
+def admin_balances(monkeypatch):
+    balances = {pool: [2, 3] for pool in POOL_LIST}
+    monkeypatch.setattr(burn, "get_admin_balances", lambda pool_list: dict(balances))
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = BlockingProvider({"0xaa": 10, "0xbb": 100})
+    price_cache = PriceCache([provider])
+    monkeypatch.setattr(burn, "_price_cache", price_cache)
+    yield provider
+
+    # let the refresh finish while the cache is still redirected
+    provider.release.set()
+    price_cache.wait()
+
+
+def test_waits_for_first_fetch(provider):
+    threading.Timer(0.2, provider.release.set).start()
+
+    assert burn._get_admin_balances(POOL_LIST) == {pool: [20, 300] for pool in POOL_LIST}
+
+
+def test_first_fetch_timeout(monkeypatch, provider):
+    monkeypatch.setattr(burn, "PRICE_TIMEOUT", 0.1)
+
+    with pytest.raises(TimeoutError):
+        burn._get_admin_balances(POOL_LIST)
+
+
+def test_stale_prices_not_awaited(provider):
+    provider.release.set()
+    burn._get_admin_balances(POOL_LIST)
+
+    provider.release.clear()
+    provider.prices = {"0xaa": 20, "0xbb": 200}
+    burn._price_cache.ttl = -1
+
+    assert burn._get_admin_balances(POOL_LIST) == {pool: [20, 300] for pool in POOL_LIST}
+
+
+def test_unpriced_coin_warns(capsys, provider):
+    provider.prices = {"0xaa": 10}
+    provider.release.set()
+
+    assert burn._get_admin_balances(POOL_LIST) == {pool: [20, 30] for pool in POOL_LIST}
+    assert "No price for 0xbb" in capsys.readouterr().out
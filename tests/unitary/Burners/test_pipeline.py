@@ -0,0 +1,100 @@
+import pytest
+from brownie.network.gas.strategies import LinearScalingStrategy
+
+from scripts.burners import pipeline as pipeline_module
+from scripts.burners.pipeline import MAX_REPLACEMENTS, REPLACEMENT_BUMP, Pipeline
+
+GAS_PRICE = 10 ** 10
+
+
+class Sender:
+    """Wraps a contract method, failing the first `errors` sends with the given messages."""
+
+    def __init__(self, fn, errors=(), forward_on_error=False):
+        self.fn = fn
+        self.errors = list(errors)
+        self.forward_on_error = forward_on_error
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(dict(args[-1]))
+        if self.errors:
+            error = self.errors.pop(0)
+            if error is None:
+                # the transaction never reaches the node
+                return
+            if self.forward_on_error:
+                self.fn(*args)
+            raise ValueError(error)
+        return self.fn(*args)
+
+
+def test_nonce_assignment(alice, bob, token):
+    start = alice.nonce
+    pipeline = Pipeline(alice, GAS_PRICE)
+
+    nonces = [pipeline.submit(token.transfer, bob, i + 1) for i in range(3)]
+    receipts = pipeline.wait()
+
+    assert nonces == [start, start + 1, start + 2]
+    assert [i.nonce for i in receipts] == nonces
+    assert [i.status for i in receipts] == [1, 1, 1]
+    assert token.balanceOf(bob) == 6
+
+
+def test_already_known(alice, bob, token):
+    sender = Sender(token.transfer, ["already known"], forward_on_error=True)
+    pipeline = Pipeline(alice, GAS_PRICE)
+
+    nonce = pipeline.submit(sender, bob, 1)
+    receipts = pipeline.wait()
+
+    assert len(sender.calls) == 1
+    assert receipts[0].nonce == nonce
+    assert token.balanceOf(bob) == 1
+
+
+def test_replacement_with_strategy(alice, bob, token):
+    sender = Sender(token.transfer, ["replacement transaction underpriced"] * 2)
+    strategy = LinearScalingStrategy(GAS_PRICE, GAS_PRICE * 10)
+    pipeline = Pipeline(alice, strategy)
+
+    pipeline.submit(sender, bob, 1)
+    receipts = pipeline.wait()
+
+    prices = [i["gas_price"] for i in sender.calls]
+    assert prices[0] is strategy
+    assert prices[1] == int(GAS_PRICE * REPLACEMENT_BUMP)
+    assert prices[2] == int(prices[1] * REPLACEMENT_BUMP)
+    assert receipts[0].gas_price == prices[2]
+
+
+def test_replacement_bounded(alice, bob, token):
+    sender = Sender(token.transfer, ["replacement transaction underpriced"] * 100)
+    pipeline = Pipeline(alice, GAS_PRICE)
+
+    with pytest.raises(ValueError, match="underpriced"):
+        pipeline.submit(sender, bob, 1)
+    assert len(sender.calls) == MAX_REPLACEMENTS + 1
+
+
+def test_other_errors_raised(alice, bob, token):
+    sender = Sender(token.transfer, ["insufficient funds for gas * price + value"])
+    pipeline = Pipeline(alice, GAS_PRICE)
+
+    with pytest.raises(ValueError, match="insufficient funds"):
+        pipeline.submit(sender, bob, 1)
+    assert len(sender.calls) == 1
+
+
+def test_dropped_resubmitted(monkeypatch, alice, bob, token):
+    monkeypatch.setattr(pipeline_module, "RESUBMIT_TIMEOUT", 0)
+    sender = Sender(token.transfer, [None])
+    pipeline = Pipeline(alice, GAS_PRICE)
+
+    nonce = pipeline.submit(sender, bob, 1)
+    receipts = pipeline.wait()
+
+    assert [i["nonce"] for i in sender.calls] == [nonce, nonce]
+    assert receipts[0].nonce == nonce
+    assert token.balanceOf(bob) == 1
@@ -0,0 +1,68 @@
+import threading
+
+from scripts.burners.prices import PriceCache, PriceProvider, StubProvider
+
+
+class FailingProvider(PriceProvider):
+    def fetch(self, coins):
+        raise ConnectionError
+
+
+class BlockingProvider(PriceProvider):
+    def __init__(self, prices):
+        self.prices = prices
+        self.release = threading.Event()
+
+    def fetch(self, coins):
+        self.release.wait()
+        return {i: self.prices[i] for i in coins if i in self.prices}
+
+
+def get_prices(cache, coins):
+    cache.refresh(coins)
+    cache.wait()
+    return cache.get_prices(coins)
+
+
+def test_providers_tried_in_order():
+    cache = PriceCache([StubProvider({"0xaa": 2}, default=None), StubProvider(default=3)])
+
+    assert get_prices(cache, ["0xAA", "0xbb"]) == {"0xaa": 2, "0xbb": 3}
+
+
+def test_failing_provider_falls_through():
+    cache = PriceCache([FailingProvider(), StubProvider({"0xaa": 2})])
+
+    assert get_prices(cache, ["0xaa"]) == {"0xaa": 2}
+
+
+def test_unpriced_coins_omitted():
+    cache = PriceCache([StubProvider({"0xaa": 2}, default=None)])
+
+    assert get_prices(cache, ["0xaa", "0xbb"]) == {"0xaa": 2}
+
+
+def test_snapshot_persists():
+    get_prices(PriceCache([StubProvider({"0xaa": 2})]), ["0xaa"])
+    cache = PriceCache([FailingProvider()])
+
+    assert get_prices(cache, ["0xaa"]) == {"0xaa": 2}
+
+
+def test_stale_prices_refreshed():
+    get_prices(PriceCache([StubProvider({"0xaa": 2})]), ["0xaa"])
+    cache = PriceCache([StubProvider({"0xaa": 5})], ttl=-1)
+
+    assert get_prices(cache, ["0xaa"]) == {"0xaa": 5}
+
+
+def test_lookup_does_not_wait():
+    get_prices(PriceCache([StubProvider({"0xaa": 2})]), ["0xaa"])
+    provider = BlockingProvider({"0xaa": 5, "0xbb": 3})
+    cache = PriceCache([provider], ttl=-1)
+
+    assert cache.get_prices(["0xaa", "0xbb"]) == {"0xaa": 2}
+
+    provider.release.set()
+    cache.wait()
+    assert cache.get_prices(["0xaa", "0xbb"]) == {"0xaa": 5, "0xbb": 3}
@@ -0,0 +1,42 @@
+import pytest
+
+from scripts.burners.settlement import SUSD_CURRENCY_KEY, get_secs_left, wait_for_settlement
+
+
+@pytest.fixture(scope="module")
+def exchanger(ExchangerMock, alice):
+    yield ExchangerMock.deploy({"from": alice})
+
+
+def test_no_pending_exchanges(exchanger, alice, bob):
+    assert get_secs_left(exchanger, [alice, bob]) == 0
+    wait_for_settlement(exchanger, [alice, bob], timeout=0)
+
+
+def test_secs_left_is_max_of_accounts(exchanger, alice, bob):
+    exchanger.set_waiting_period(alice, SUSD_CURRENCY_KEY, 60, {"from": alice})
+    exchanger.set_waiting_period(bob, SUSD_CURRENCY_KEY, 180, {"from": alice})
+
+    assert 170 < get_secs_left(exchanger, [alice, bob]) <= 180
+
+
+def test_ignores_other_currency_keys(exchanger, alice):
+    exchanger.set_waiting_period(alice, "0x" + "11" * 32, 180, {"from": alice})
+
+    assert get_secs_left(exchanger, [alice]) == 0
+
+
+def test_timeout(exchanger, alice):
+    exchanger.set_waiting_period(alice, SUSD_CURRENCY_KEY, 180, {"from": alice})
+
+    with pytest.raises(TimeoutError):
+        wait_for_settlement(exchanger, [alice], timeout=0)
+
+
+def test_returns_once_settled(chain, exchanger, alice, bob):
+    exchanger.set_waiting_period(alice, SUSD_CURRENCY_KEY, 180, {"from": alice})
+    exchanger.set_waiting_period(bob, SUSD_CURRENCY_KEY, 60, {"from": alice})
+    chain.sleep(181)
+    chain.mine()
+
+    wait_for_settlement(exchanger, [alice, bob], timeout=0)
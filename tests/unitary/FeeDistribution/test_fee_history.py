@@ -0,0 +1,138 @@
+import brownie
+import pytest
+from brownie import web3
+
+from scripts.stats import fee_history
+from scripts.stats.fee_history import FeeHistory, find_blocks
+
+DAY = 86400
+WEEK = 7 * DAY
+
+pool_mock = """
+# @version 0.2.7
+
+get_virtual_price: public(uint256)
+
+@external
+def set_virtual_price(_value: uint256):
+    self.get_virtual_price = _value
+"""
+
+
+class History(FeeHistory):
+    fetched = []
+
+    def _fetch(self, timestamps):
+        self.fetched.extend(timestamps)
+        return [
+            (self.distributor.tokens_per_week(i), self.distributor.ve_supply(i), 10 ** 18)
+            for i in timestamps
+        ]
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    History.fetched = []
+
+
+@pytest.fixture(scope="module")
+def distributor(accounts, chain, fee_distributor, voting_escrow, token, coin_a):
+    token.approve(voting_escrow, 2 ** 256 - 1, {"from": accounts[0]})
+    voting_escrow.create_lock(10 ** 21, chain.time() + WEEK * 52, {"from": accounts[0]})
+    coin_a._mint_for_testing(accounts[1], 10 ** 21)
+
+    yield fee_distributor()
+
+
+@pytest.fixture(scope="module")
+def virtual_price_pool(accounts):
+    yield brownie.compile_source(pool_mock).Vyper.deploy({"from": accounts[0]})
+
+
+def first_block_at(timestamp, start):
+    return next(
+        i
+        for i in range(start, web3.eth.blockNumber + 1)
+        if web3.eth.getBlock(i).timestamp >= timestamp
+    )
+
+
+def distribute(chain, distributor, coin_a, accounts, days):
+    for i in range(days):
+        coin_a.transfer(distributor, 10 ** 18, {"from": accounts[1]})
+        distributor.checkpoint_token()
+        distributor.checkpoint_total_supply()
+        chain.sleep(DAY)
+        chain.mine()
+
+
+def test_sync(accounts, chain, distributor, coin_a):
+    distribute(chain, distributor, coin_a, accounts, 21)
+    history = History(distributor, None)
+
+    assert history.sync() > 0
+    assert history.timestamps[0] == distributor.start_time()
+    assert history.timestamps[-1] + WEEK <= distributor.last_token_time()
+    for t, (tokens, ve_supply, _) in zip(history.timestamps, history.weeks):
+        assert tokens == distributor.tokens_per_week(t)
+        assert ve_supply == distributor.ve_supply(t)
+
+
+def test_incremental_sync(accounts, chain, distributor, coin_a):
+    distribute(chain, distributor, coin_a, accounts, 8)
+    History(distributor, None).sync()
+    count = len(History.fetched)
+
+    distribute(chain, distributor, coin_a, accounts, 14)
+    history = History(distributor, None)
+    assert len(history) == count
+
+    History.fetched = []
+    assert history.sync() == len(History.fetched) == 2
+    assert history.timestamps[-2:] == History.fetched
+
+
+def test_no_new_weeks(accounts, chain, distributor, coin_a):
+    distribute(chain, distributor, coin_a, accounts, 8)
+    history = History(distributor, None)
+    history.sync()
+
+    History.fetched = []
+    assert history.sync() == 0
+    assert History.fetched == []
+
+
+def test_find_blocks(chain):
+    start = web3.eth.blockNumber
+    for i in range(12):
+        chain.sleep(100 + i * 37)
+        chain.mine()
+    timestamps = [web3.eth.getBlock(i).timestamp for i in range(start + 1, start + 13)]
+
+    # exact block timestamps, and times between two blocks
+    targets = timestamps + [i - 1 for i in timestamps]
+    assert find_blocks(targets) == [first_block_at(i, start) for i in targets]
+
+
+def test_virtual_prices(monkeypatch, accounts, chain, fee_distributor, coin_a, virtual_price_pool):
+    # there is no multicall on the development chain
+    monkeypatch.setattr(fee_history, "batch_call", lambda calls: [fn(*args) for fn, args in calls])
+    coin_a._mint_for_testing(accounts[1], 10 ** 21)
+
+    # start distributing in the week after the pool is deployed
+    chain.sleep(WEEK - chain.time() % WEEK + 1)
+    start = web3.eth.blockNumber
+    distributor = fee_distributor()
+    values = []
+    for i in range(22):
+        tx = virtual_price_pool.set_virtual_price(10 ** 18 + i * 10 ** 15, {"from": accounts[0]})
+        values.append((tx.block_number, 10 ** 18 + i * 10 ** 15))
+        distribute(chain, distributor, coin_a, accounts, 1)
+
+    history = FeeHistory(distributor, virtual_price_pool)
+    assert history.sync() > 1
+    for t, (tokens, _, virtual_price) in zip(history.timestamps, history.weeks):
+        block = first_block_at(t, start)
+        assert tokens == distributor.tokens_per_week(t)
+        # the first week may start before the virtual price is first set
+        assert virtual_price == ([0] + [v for b, v in values if b <= block])[-1]
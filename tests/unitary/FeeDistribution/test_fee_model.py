@@ -0,0 +1,133 @@
+import pytest
+
+from scripts.stats.fee_model import FeeDistributorModel
+from scripts.stats.ve_index import VotingEscrowIndex
+from scripts.stats.vecrv_supply import VotingEscrowSupply
+
+DAY = 86400
+WEEK = 7 * DAY
+YEAR = 365 * DAY
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fee_model_setup(accounts, token, voting_escrow, coin_a):
+    for acct in accounts[:3]:
+        token.transfer(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+    coin_a._mint_for_testing(accounts[4], 10 ** 22)
+
+
+@pytest.fixture
+def checkpoints():
+    # (timestamp, token balance) of each `checkpoint_token`, or (timestamp, None)
+    # for each `checkpoint_total_supply`
+    yield []
+
+
+@pytest.fixture
+def distributor(accounts, chain, fee_distributor, voting_escrow, coin_a, checkpoints):
+    voting_escrow.create_lock(10 ** 22, chain.time() + YEAR, {"from": accounts[0]})
+    distributor = fee_distributor(chain.time() - 2 * WEEK)
+
+    def distribute(days):
+        for i in range(days):
+            coin_a.transfer(distributor, 10 ** 18 + i, {"from": accounts[4]})
+            tx = distributor.checkpoint_token()
+            checkpoints.append((tx.timestamp, coin_a.balanceOf(distributor)))
+            tx = distributor.checkpoint_total_supply()
+            checkpoints.append((tx.timestamp, None))
+            chain.sleep(DAY)
+
+    distribute(4)
+    voting_escrow.create_lock(3 * 10 ** 21, chain.time() + 5 * WEEK, {"from": accounts[1]})
+    distribute(10)
+    voting_escrow.increase_amount(10 ** 22, {"from": accounts[0]})
+    voting_escrow.create_lock(5 * 10 ** 22, chain.time() + 3 * YEAR, {"from": accounts[2]})
+    distribute(5)
+    chain.sleep(5 * WEEK)
+    voting_escrow.withdraw({"from": accounts[1]})
+    voting_escrow.increase_unlock_time(chain.time() + 2 * YEAR, {"from": accounts[0]})
+    distribute(9)
+
+    yield distributor
+
+
+@pytest.fixture
+def model(distributor, voting_escrow, checkpoints):
+    index = VotingEscrowIndex(voting_escrow, voting_escrow.tx.block_number)
+    index.sync(confirmations=0)
+    model = FeeDistributorModel(
+        VotingEscrowSupply(index.lock_events()), distributor.start_time(), distributor.tx.timestamp
+    )
+    for timestamp, token_balance in checkpoints:
+        model.set_time(timestamp)
+        if token_balance is None:
+            model.checkpoint_total_supply()
+        else:
+            model.checkpoint_token(token_balance)
+
+    yield model
+
+
+def claim_all(distributor, coin_a, acct):
+    balance = coin_a.balanceOf(acct)
+    for i in range(3):
+        distributor.claim({"from": acct})
+    return coin_a.balanceOf(acct) - balance
+
+
+def test_checkpoints(distributor, model):
+    assert model.last_token_time == distributor.last_token_time()
+    assert model.time_cursor == distributor.time_cursor()
+    assert model.token_last_balance == distributor.token_last_balance()
+
+    for week in range(model.start_time, model.time_cursor + WEEK, WEEK):
+        assert model.tokens_per_week.get(week, 0) == distributor.tokens_per_week(week)
+        assert model.ve_supply.get(week, 0) == distributor.ve_supply(week)
+
+
+def test_ve_for_at(accounts, chain, distributor, model):
+    for t in range(model.start_time, chain.time(), DAY + 1234):
+        for acct in accounts[:4]:
+            assert model.ve_for_at(acct.address, t) == distributor.ve_for_at(acct, t)
+
+
+def test_claimable(accounts, coin_a, distributor, model):
+    users = [i.address for i in accounts[:4]]
+    amounts, dust = model.claimable(users)
+
+    weeks = model.claim_weeks().tolist()
+    assert dust == sum(distributor.tokens_per_week(i) for i in weeks) - sum(amounts)
+    for acct, amount in zip(accounts[:4], amounts):
+        assert claim_all(distributor, coin_a, acct) == amount
+
+
+def test_claim(accounts, coin_a, distributor, model):
+    for acct in (accounts[0], accounts[2]):
+        balance = coin_a.balanceOf(acct)
+        tx = distributor.claim({"from": acct})
+        model.set_time(tx.timestamp)
+
+        assert model.claim([acct.address]).tolist() == [coin_a.balanceOf(acct) - balance]
+        assert model.token_last_balance == distributor.token_last_balance()
+        assert model.time_cursor == distributor.time_cursor()
+
+
+def test_claimable_after_claim(accounts, chain, coin_a, distributor, model):
+    for acct in (accounts[0], accounts[2]):
+        tx = distributor.claim({"from": acct})
+        model.set_time(tx.timestamp)
+        model.claim([acct.address])
+    chain.sleep(WEEK)
+
+    tx = distributor.checkpoint_token()
+    model.set_time(tx.timestamp)
+    model.checkpoint_token(coin_a.balanceOf(distributor))
+    tx = distributor.checkpoint_total_supply()
+    model.set_time(tx.timestamp)
+    model.checkpoint_total_supply()
+
+    cursors = [distributor.time_cursor_of(i) for i in accounts[:3]]
+    amounts, _ = model.claimable([i.address for i in accounts[:3]], cursors)
+    for acct, amount in zip(accounts[:3], amounts):
+        assert claim_all(distributor, coin_a, acct) == amount
@@ -0,0 +1,128 @@
+import brownie
+import pytest
+
+from scripts.stats.gauge_index import GaugeControllerIndex
+from scripts.stats.gauge_model import Revert, replay
+from scripts.stats.ve_index import VotingEscrowIndex
+
+WEEK = 7 * 86400
+YEAR = 365 * 86400
+
+TYPE_WEIGHTS = [5 * 10 ** 17, 2 * 10 ** 18]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def gauge_model_setup(accounts, gauge_controller, three_gauges, token, voting_escrow):
+    # added without a weight, so no event is emitted
+    gauge_controller.add_type(b"Insurance", {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[0], 0, 10 ** 18, {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[1], 1, {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[2], 0, {"from": accounts[0]})
+    gauge_controller.change_type_weight(1, TYPE_WEIGHTS[1], {"from": accounts[0]})
+
+    for acct in accounts[:3]:
+        token.transfer(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+
+
+@pytest.fixture
+def scenario(accounts, chain, gauge_controller, three_gauges, voting_escrow):
+    voting_escrow.create_lock(10 ** 22, chain.time() + YEAR, {"from": accounts[0]})
+    voting_escrow.create_lock(3 * 10 ** 21, chain.time() + 10 * WEEK, {"from": accounts[1]})
+    gauge_controller.vote_for_gauge_weights(three_gauges[0], 6000, {"from": accounts[0]})
+    gauge_controller.vote_for_gauge_weights(three_gauges[1], 4000, {"from": accounts[0]})
+    gauge_controller.vote_for_gauge_weights(three_gauges[1], 10000, {"from": accounts[1]})
+    chain.sleep(2 * WEEK)
+    voting_escrow.increase_amount(10 ** 22, {"from": accounts[0]})
+    gauge_controller.vote_for_gauge_weights(three_gauges[0], 2000, {"from": accounts[0]})
+    gauge_controller.vote_for_gauge_weights(three_gauges[2], 4000, {"from": accounts[0]})
+    voting_escrow.create_lock(5 * 10 ** 22, chain.time() + 3 * YEAR, {"from": accounts[2]})
+    gauge_controller.vote_for_gauge_weights(three_gauges[2], 7500, {"from": accounts[2]})
+    chain.sleep(WEEK + 4321)
+    gauge_controller.change_gauge_weight(three_gauges[1], 10 ** 22, {"from": accounts[0]})
+
+
+@pytest.fixture
+def model(gauge_controller, voting_escrow, scenario):
+    gauge_index = GaugeControllerIndex(gauge_controller, gauge_controller.tx.block_number)
+    gauge_index.sync(confirmations=0)
+    ve_index = VotingEscrowIndex(voting_escrow, voting_escrow.tx.block_number)
+    ve_index.sync(confirmations=0)
+
+    yield replay(gauge_index, ve_index)
+
+
+def assert_storage(model, gauge_controller, accounts):
+    assert model.n_gauge_types == gauge_controller.n_gauge_types()
+    assert model.gauges == [gauge_controller.gauges(i) for i in range(gauge_controller.n_gauges())]
+    assert model.time_total == gauge_controller.time_total()
+    for t, value in model.points_total.items():
+        assert value == gauge_controller.points_total(t)
+
+    for gauge_type in range(model.n_gauge_types):
+        assert model.time_sum.get(gauge_type, 0) == gauge_controller.time_sum(gauge_type)
+        assert model.time_type_weight.get(gauge_type, 0) == gauge_controller.time_type_weight(
+            gauge_type
+        )
+        for t, point in model.points_sum.get(gauge_type, {}).items():
+            assert point == gauge_controller.points_sum(gauge_type, t)
+        for t, value in model.points_type_weight.get(gauge_type, {}).items():
+            assert value == gauge_controller.points_type_weight(gauge_type, t)
+
+    for gauge in model.gauges:
+        assert model.time_weight[gauge] == gauge_controller.time_weight(gauge)
+        for t, point in model.points_weight.get(gauge, {}).items():
+            assert point == gauge_controller.points_weight(gauge, t)
+        for acct in accounts[:3]:
+            user = acct.address
+            voted = model.vote_user_slopes.get(user, {}).get(gauge, (0, 0, 0))
+            assert voted == gauge_controller.vote_user_slopes(user, gauge)
+            last_vote = model.last_user_vote.get(user, {}).get(gauge, 0)
+            assert last_vote == gauge_controller.last_user_vote(user, gauge)
+
+    for acct in accounts[:3]:
+        assert model.vote_user_power.get(acct.address, 0) == gauge_controller.vote_user_power(acct)
+
+
+def test_replay(accounts, gauge_controller, model):
+    assert_storage(model, gauge_controller, accounts)
+
+
+def test_relative_weights(accounts, chain, gauge_controller, three_gauges, model):
+    now = chain[-1].timestamp // WEEK * WEEK
+    weeks = [now + i * WEEK for i in range(-3, 15)]
+    weights = model.relative_weights(weeks)
+
+    for i, week in enumerate(weeks):
+        if week > now:
+            chain.sleep(week - chain.time() + 1)
+        for gauge in three_gauges:
+            gauge_controller.checkpoint_gauge(gauge, {"from": accounts[0]})
+        for gauge, row in zip(model.gauges, weights):
+            assert row[i] == gauge_controller.gauge_relative_weight(gauge, week)
+
+
+def test_vote_after_replay(accounts, chain, gauge_controller, three_gauges, voting_escrow, model):
+    model.voting_escrow = voting_escrow
+    chain.sleep(2 * WEEK)
+
+    tx = gauge_controller.vote_for_gauge_weights(three_gauges[1], 0, {"from": accounts[0]})
+    model.set_time(tx.timestamp)
+    model.vote_for_gauge_weights(accounts[0].address, three_gauges[1].address, 0)
+    tx = gauge_controller.vote_for_gauge_weights(three_gauges[0], 6000, {"from": accounts[0]})
+    model.set_time(tx.timestamp)
+    model.vote_for_gauge_weights(accounts[0].address, three_gauges[0].address, 6000)
+
+    assert_storage(model, gauge_controller, accounts)
+
+
+def test_revert(accounts, chain, gauge_controller, three_gauges, voting_escrow, model):
+    model.voting_escrow = voting_escrow
+    model.set_time(chain.time())
+
+    with pytest.raises(Revert, match="Used too much power"):
+        model.vote_for_gauge_weights(accounts[0].address, three_gauges[1].address, 10000)
+    with brownie.reverts("Used too much power"):
+        gauge_controller.vote_for_gauge_weights(three_gauges[1], 10000, {"from": accounts[0]})
+
+    assert_storage(model, gauge_controller, accounts)
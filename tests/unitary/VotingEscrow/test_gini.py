@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from scripts.stats import gini as gini_module
+from scripts.stats.gini import cached_blocks, compute_ginis, get_weights, gini
+
+
+def reference_gini(x):
+    x = np.asarray(x, dtype=np.float64)
+    return np.abs(np.subtract.outer(x, x)).mean() / np.mean(x) / 2
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference(seed):
+    x = np.random.default_rng(seed).pareto(1.5, 500)
+
+    assert gini(x) == pytest.approx(reference_gini(x))
+
+
+def test_unsorted_input():
+    assert gini([3, 1, 2]) == gini([1, 2, 3]) == pytest.approx(reference_gini([1, 2, 3]))
+
+
+@pytest.mark.parametrize("x", [[], [0, 0, 0], [5, 5, 5]])
+def test_equal_or_empty(x):
+    assert gini(x) == 0
+
+
+def test_paginated_fetch(monkeypatch):
+    holders = [(f"{i:06}", str(i * 10 ** 18)) for i in range(2500)]
+
+    def fetch_page(block, last_id):
+        page = [{"id": k, "weight": v} for k, v in holders if k > last_id]
+        return page[: gini_module.PAGE_SIZE]
+
+    monkeypatch.setattr(gini_module, "_fetch_page", fetch_page)
+
+    weights = get_weights(1234)
+    assert len(weights) == 2500
+    assert weights.sum() == sum(range(2500))
+    assert cached_blocks() == [1234]
+
+
+def test_query_errors(monkeypatch):
+    class Response:
+        def json(self):
+            return {"data": None, "errors": [{"message": "block not indexed"}]}
+
+    monkeypatch.setattr(gini_module.requests, "post", lambda *args, **kwargs: Response())
+
+    with pytest.raises(ValueError, match="block not indexed"):
+        get_weights(1234)
+
+
+def test_offline(monkeypatch):
+    monkeypatch.setattr(gini_module, "fetch_weights", lambda block: [str(block), "1"])
+    expected = compute_ginis([1, 2, 3])
+
+    monkeypatch.delattr(gini_module, "fetch_weights")
+    assert compute_ginis([1, 2, 3], offline=True) == expected
+    with pytest.raises(FileNotFoundError):
+        get_weights(4, offline=True)
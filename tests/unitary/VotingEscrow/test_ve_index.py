@@ -0,0 +1,96 @@
+import pytest
+from brownie import history
+
+from scripts.stats.ve_index import DEPOSIT, WITHDRAW, VotingEscrowIndex
+from scripts.stats.vecrv_supply import to_lock_events
+
+WEEK = 86400 * 7
+
+
+class SplitIndex(VotingEscrowIndex):
+    # rejects any request covering more than 2 blocks
+    requests = []
+
+    def _get_logs(self, start, end):
+        self.requests.append((start, end))
+        if end - start > 1:
+            raise ValueError("query returned more than 10000 results")
+        return super()._get_logs(start, end)
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    SplitIndex.requests = []
+
+
+@pytest.fixture(scope="module")
+def start_block(accounts, chain, token, voting_escrow):
+    start_block = chain.height
+    for acct in accounts[:3]:
+        token.transfer(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+
+    voting_escrow.create_lock(10 ** 21, chain.time() + 2 * WEEK, {"from": accounts[0]})
+    voting_escrow.create_lock(3 * 10 ** 20, chain.time() + 52 * WEEK, {"from": accounts[1]})
+    voting_escrow.increase_amount(10 ** 18, {"from": accounts[1]})
+    chain.sleep(3 * WEEK)
+    voting_escrow.withdraw({"from": accounts[0]})
+    voting_escrow.deposit_for(accounts[1], 10 ** 18, {"from": accounts[2]})
+
+    yield start_block
+
+
+def expected_events(start_block):
+    return to_lock_events(
+        (event.name, event)
+        for tx in history
+        if tx.block_number > start_block
+        for event in tx.events
+    )
+
+
+def test_sync(voting_escrow, start_block):
+    index = VotingEscrowIndex(voting_escrow, start_block)
+
+    assert index.sync(confirmations=0) == 5
+    assert index.lock_events() == expected_events(start_block)
+    assert list(index["kind"]) == [DEPOSIT, DEPOSIT, DEPOSIT, WITHDRAW, DEPOSIT]
+    assert index["supply"][-1] == voting_escrow.supply()
+
+
+def test_providers(accounts, voting_escrow, start_block):
+    index = VotingEscrowIndex(voting_escrow, start_block)
+    index.sync(confirmations=0)
+
+    assert index.providers == accounts[:2]
+    assert list(index["provider"]) == [0, 1, 1, 0, 1]
+
+
+def test_resume(accounts, chain, voting_escrow, start_block):
+    VotingEscrowIndex(voting_escrow, start_block).sync(confirmations=0)
+
+    voting_escrow.create_lock(10 ** 19, chain.time() + 4 * WEEK, {"from": accounts[2]})
+    index = VotingEscrowIndex(voting_escrow, start_block)
+    assert len(index) == 5
+    assert index.last_block == chain.height - 1
+
+    assert index.sync(confirmations=0) == 1
+    assert index.lock_events() == expected_events(start_block)
+    assert index.providers == accounts[:3]
+
+
+def test_confirmations(chain, voting_escrow, start_block):
+    index = VotingEscrowIndex(voting_escrow, start_block)
+    index.sync(confirmations=2)
+
+    assert index.last_block == chain.height - 2
+    assert len(index) == 3
+
+
+def test_split_range(chain, voting_escrow, start_block):
+    index = SplitIndex(voting_escrow, start_block)
+    index.sync(confirmations=0)
+
+    assert index.lock_events() == expected_events(start_block)
+    assert index.last_block == chain.height
+    assert max(end - start for start, end in SplitIndex.requests) > 1
@@ -0,0 +1,99 @@
+import brownie
+import pytest
+
+from scripts.stats.ve_model import Revert, VotingEscrowModel
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, token, voting_escrow):
+    for acct in accounts[:4]:
+        token.transfer(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+
+
+@pytest.fixture
+def model(voting_escrow):
+    yield VotingEscrowModel(voting_escrow.tx.block_number, voting_escrow.tx.timestamp)
+
+
+@pytest.fixture
+def execute(voting_escrow, model):
+    def _execute(fn_name, sender, *args):
+        tx = getattr(voting_escrow, fn_name)(*args, {"from": sender})
+        model.set_block(tx.block_number, tx.timestamp)
+        if fn_name == "checkpoint":
+            model.checkpoint()
+        elif fn_name == "deposit_for":
+            model.deposit_for(*args)
+        else:
+            getattr(model, fn_name)(sender.address, *args)
+        return tx
+
+    yield _execute
+
+
+@pytest.fixture
+def scenario(accounts, chain, execute):
+    start_block = chain.height
+
+    execute("create_lock", accounts[0], 10 ** 21, chain.time() + YEAR)
+    execute("create_lock", accounts[1], 3 * 10 ** 20, chain.time() + 3 * WEEK)
+    chain.sleep(WEEK + 1234)
+    execute("increase_amount", accounts[1], 10 ** 20)
+    execute("create_lock", accounts[2], 7 * 10 ** 22, chain.time() + 4 * YEAR)
+    chain.sleep(3 * WEEK)
+    execute("increase_unlock_time", accounts[0], chain.time() + 2 * YEAR)
+    execute("withdraw", accounts[1])
+    execute("deposit_for", accounts[3], accounts[2], 10 ** 18)
+    chain.sleep(10 * WEEK + 42)
+    execute("checkpoint", accounts[3])
+    execute("create_lock", accounts[1], 5 * 10 ** 19, chain.time() + 10 * WEEK)
+
+    yield start_block
+
+
+def test_storage(accounts, voting_escrow, model, scenario):
+    assert model.epoch == voting_escrow.epoch()
+    assert model.supply == voting_escrow.supply()
+    for epoch in range(model.epoch + 1):
+        assert model.get_point(epoch) == voting_escrow.point_history(epoch)
+
+    for acct in accounts[:4]:
+        assert model.locked.get(acct.address, (0, 0)) == voting_escrow.locked(acct)
+        assert model.user_point_epoch.get(acct.address, 0) == voting_escrow.user_point_epoch(acct)
+        for epoch, point in enumerate(model.user_points(acct.address), start=1):
+            assert point == voting_escrow.user_point_history(acct, epoch)
+
+    for t in model.slope_changes:
+        assert model.slope_changes[t] == voting_escrow.slope_changes(t)
+
+
+def test_historic_views(accounts, chain, voting_escrow, model, scenario):
+    model.set_block(chain[-1].number, chain[-1].timestamp)
+
+    for block in range(scenario, chain.height + 1):
+        assert model.totalSupplyAt(block) == voting_escrow.totalSupplyAt(block)
+        for acct in accounts[:4]:
+            assert model.balanceOfAt(acct.address, block) == voting_escrow.balanceOfAt(acct, block)
+
+
+def test_future_views(accounts, chain, voting_escrow, model, scenario):
+    now = chain[-1].timestamp
+    model.set_block(chain[-1].number, now)
+
+    for t in [now + i * 86400 for i in range(0, 4 * 365, 29)] + [(now // WEEK + 3) * WEEK]:
+        assert model.totalSupply(t) == voting_escrow.totalSupply(t)
+        for acct in accounts[:4]:
+            assert model.balanceOf(acct.address, t) == voting_escrow.balanceOf(acct, t)
+
+
+def test_revert(accounts, chain, voting_escrow, model, execute):
+    execute("create_lock", accounts[0], 10 ** 21, chain.time() + YEAR)
+
+    with pytest.raises(Revert, match="Withdraw old tokens first"):
+        model.create_lock(accounts[0].address, 10 ** 18, chain.time() + YEAR)
+    with brownie.reverts("Withdraw old tokens first"):
+        voting_escrow.create_lock(10 ** 18, chain.time() + YEAR, {"from": accounts[0]})
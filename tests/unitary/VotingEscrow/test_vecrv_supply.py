@@ -0,0 +1,92 @@
+import pytest
+from brownie import history
+
+from scripts.stats.vecrv_supply import VotingEscrowSupply, to_lock_events
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, token, voting_escrow):
+    for acct in accounts[:4]:
+        token.transfer(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+
+
+@pytest.fixture(scope="module")
+def snapshots(accounts, chain, voting_escrow):
+    snapshots = []
+
+    def snapshot():
+        timestamp = chain[-1].timestamp
+        balances = [voting_escrow.balanceOf(i, timestamp) for i in accounts[:4]]
+        snapshots.append((timestamp, voting_escrow.totalSupply(timestamp), balances))
+
+    voting_escrow.create_lock(10 ** 21, chain.time() + YEAR, {"from": accounts[0]})
+    voting_escrow.create_lock(3 * 10 ** 20, chain.time() + 3 * WEEK, {"from": accounts[1]})
+    snapshot()
+
+    chain.sleep(WEEK + 1234)
+    voting_escrow.increase_amount(10 ** 20, {"from": accounts[1]})
+    voting_escrow.create_lock(7 * 10 ** 22, chain.time() + 4 * YEAR, {"from": accounts[2]})
+    snapshot()
+
+    chain.sleep(3 * WEEK)
+    voting_escrow.increase_unlock_time(chain.time() + 2 * YEAR, {"from": accounts[0]})
+    voting_escrow.checkpoint({"from": accounts[3]})
+    snapshot()
+
+    voting_escrow.withdraw({"from": accounts[1]})
+    voting_escrow.create_lock(5 * 10 ** 19, chain.time() + 10 * WEEK, {"from": accounts[3]})
+    snapshot()
+
+    chain.sleep(5 * WEEK + 42)
+    voting_escrow.increase_amount(10 ** 18, {"from": accounts[2]})
+    snapshot()
+
+    yield snapshots
+
+
+@pytest.fixture(scope="module")
+def supply(snapshots):
+    events = to_lock_events((event.name, event) for tx in history for event in tx.events)
+    yield VotingEscrowSupply(events)
+
+
+def test_total_supply(snapshots, supply):
+    timestamps = [i[0] for i in snapshots]
+
+    assert list(supply.total_supply(timestamps)) == [i[1] for i in snapshots]
+
+
+def test_balances(accounts, snapshots, supply):
+    timestamps = [i[0] for i in snapshots]
+
+    for idx, acct in enumerate(accounts[:4]):
+        assert list(supply.balance_of(acct, timestamps)) == [i[2][idx] for i in snapshots]
+
+
+def test_future_supply(accounts, chain, voting_escrow, snapshots, supply):
+    now = chain[-1].timestamp
+    timestamps = [now + i * 86400 for i in range(0, 4 * 365, 13)]
+    timestamps += [(now // WEEK + i) * WEEK for i in range(1, 110)]
+
+    expected = [voting_escrow.totalSupply(i) for i in timestamps]
+    assert list(supply.total_supply(timestamps)) == expected
+
+    for acct in accounts[:4]:
+        expected = [voting_escrow.balanceOf(acct, i) for i in timestamps]
+        assert list(supply.balance_of(acct, timestamps)) == expected
+
+
+def test_before_first_lock(accounts, snapshots, supply):
+    timestamp = snapshots[0][0] - 1
+
+    assert supply.total_supply([timestamp])[0] == 0
+    assert supply.balance_of(accounts[0], [timestamp])[0] == 0
+    assert supply.balance_of(accounts[5], [timestamp])[0] == 0
+
+
+def test_locked_supply(chain, voting_escrow, snapshots, supply):
+    assert supply.locked_supply([chain[-1].timestamp])[0] == voting_escrow.supply()